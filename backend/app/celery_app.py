@@ -1,7 +1,14 @@
 """
 Celery application configuration for AdjustFlow
+
+Queues:
+- io:   short, I/O-bound work (file reads, network calls) - high concurrency
+- cpu:  CPU-heavy work (PDF rendering, image processing) - one process per core
+- bulk: long-running batch jobs (imports, backfills, archives, dedupe scans) - low concurrency
+Each queue gets its own worker service in docker-compose with its own concurrency.
 """
 from celery import Celery
+from kombu import Queue
 from app.core.config import settings
 
 # Create Celery instance
@@ -9,9 +16,25 @@ celery_app = Celery(
     "adjustflow",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=[]  # Tasks will be added here as they're created
+    include=[
+        "app.tasks.documents",
+        "app.tasks.imports",
+        "app.tasks.archives",
+        "app.tasks.dedupe",
+        "app.tasks.sync",
+    ]
 )
 
+# Retry policy shared by tasks that touch the database, files or the network:
+# exponential backoff (1s, 2s, 4s, ... capped at 5 minutes) with jitter
+RETRY_POLICY = {
+    "autoretry_for": (OSError, ConnectionError),
+    "retry_backoff": True,
+    "retry_backoff_max": 300,
+    "retry_jitter": True,
+    "retry_kwargs": {"max_retries": 5},
+}
+
 # Celery configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -22,13 +45,42 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Queues and routing
+    task_queues=(
+        Queue("io"),
+        Queue("cpu"),
+        Queue("bulk"),
+    ),
+    task_default_queue="io",
+    task_routes={
+        "app.tasks.documents.*": {"queue": "cpu"},
+        "app.tasks.imports.*": {"queue": "bulk"},
+        "app.tasks.archives.*": {"queue": "bulk"},
+        "app.tasks.dedupe.*": {"queue": "bulk"},
+    },
+    # Reliability: ack after the task finishes so a crashed worker's task is redelivered,
+    # and don't let one worker hoard long tasks
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    result_expires=24 * 60 * 60,  # Keep results for polling for a day
+    # Fail fast when publishing from a request if the broker is down
+    task_publish_retry_policy={
+        "max_retries": 3,
+        "interval_start": 0,
+        "interval_step": 0.5,
+        "interval_max": 2,
+    },
 )
 
-# Optional: Add periodic tasks here when needed
-# celery_app.conf.beat_schedule = {
-#     'example-task': {
-#         'task': 'app.tasks.example_task',
-#         'schedule': 3600.0,  # Run every hour
-#     },
-# }
-
+# Periodic tasks (run with celery beat)
+celery_app.conf.beat_schedule = {
+    "prune-sync-tombstones": {
+        "task": "app.tasks.sync.prune_sync_tombstones",
+        "schedule": 24 * 60 * 60,  # Daily
+    },
+    "prune-document-archives": {
+        "task": "app.tasks.archives.prune_document_archives",
+        "schedule": 24 * 60 * 60,  # Daily
+    },
+}
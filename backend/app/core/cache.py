@@ -0,0 +1,313 @@
+"""
+Two-tier cache for rarely changing data (company settings, field definitions,
+task types, document categories, roles)
+
+- Tier 1: a per-process LRU (CACHE_LOCAL_MAX_ENTRIES entries), no network hop
+- Tier 2: Redis, shared by every API worker and Celery process
+
+Entries carry tags ("task_types", "contact_fields"). invalidate(*tags) deletes the
+tagged Redis entries and publishes the tags on a pub/sub channel; a listener
+thread in each process drops its local copies when the message arrives. Local
+entries also expire after CACHE_LOCAL_TTL_SECONDS, which bounds staleness if a
+message is lost (the listener clears the local tier whenever it reconnects).
+
+A load that races an invalidation (read from the database, then invalidated
+before it was stored) would put stale data back. Each tag has a generation
+counter, bumped on invalidation; a loaded value is only stored if the
+generations of its tags are unchanged.
+
+Values must be JSON-serializable (dicts/lists from model_dump(), not ORM
+objects). They round-trip through orjson in both tiers, so datetimes come back
+as ISO strings whichever tier served them; response models parse them back.
+Returned values are shared between requests and must not be mutated.
+
+Redis being unavailable only costs the shared tier and cross-process
+invalidation: the local tier keeps working with its short TTL.
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+_MISSING = object()
+
+class TwoTierCache:
+    """Per-process LRU in front of Redis, with tag-based invalidation across processes"""
+
+    def __init__(
+        self,
+        namespace: str = "cache",
+        max_entries: int = settings.CACHE_LOCAL_MAX_ENTRIES,
+        local_ttl: int = settings.CACHE_LOCAL_TTL_SECONDS,
+        default_ttl: int = settings.CACHE_DEFAULT_TTL_SECONDS,
+    ):
+        self.namespace = namespace
+        self.channel = f"{namespace}:invalidate"
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.default_ttl = default_ttl
+        # key -> (expires_at, tags, value)
+        self._local: "OrderedDict[str, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}  # Local tag generations
+        self._lock = threading.Lock()
+        self._listener_pid: Optional[int] = None
+        self._stats = dict.fromkeys(
+            ("local_hits", "redis_hits", "misses", "sets", "stale_loads", "invalidations", "evictions", "redis_errors"), 0
+        )
+
+    # Redis keys
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.namespace}:gen:{tag}"
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        self._stats["redis_errors"] += 1
+        print(f"Warning: cache {action} failed: {error}")
+
+    # Local tier
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return entry[2]
+
+    def _set_local(self, key: str, value: Any, ttl: int, tags: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + min(ttl, self.local_ttl), tags, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _drop_local(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in [key for key, (_, entry_tags, _) in self._local.items() if tags.intersection(entry_tags)]:
+                del self._local[key]
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    # Cross-process invalidation
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            # Per process: a listener thread doesn't survive a fork
+            self._listener_pid = pid
+        threading.Thread(target=self._listen, name=f"{self.namespace}-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                # Own connection without a read timeout: the subscription idles between messages
+                client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=2,
+                    socket_keepalive=True,
+                    health_check_interval=30,
+                )
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                self.clear_local()
+                backoff = 1
+                for message in pubsub.listen():
+                    self._drop_local(orjson.loads(message["data"]))
+            except (redis.RedisError, OSError, ValueError) as e:
+                print(f"Warning: cache invalidation listener disconnected: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    # Public API
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key from either tier, or default"""
+        self._ensure_listener()
+        value = self._get_local(key)
+        if value is not _MISSING:
+            self._stats["local_hits"] += 1
+            return value
+        try:
+            pipe = get_redis().pipeline()
+            pipe.get(self._key(key))
+            pipe.ttl(self._key(key))
+            raw, ttl = pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("read", e)
+            raw = None
+        if raw is None:
+            self._stats["misses"] += 1
+            return default
+        self._stats["redis_hits"] += 1
+        entry = orjson.loads(raw)
+        self._set_local(key, entry["value"], ttl if ttl and ttl > 0 else self.default_ttl, tuple(entry["tags"]))
+        return entry["value"]
+
+    def _local_generations(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def generations(self, tags: Sequence[str]) -> Tuple[Tuple[int, ...], Optional[List[Optional[str]]]]:
+        """(local, shared) generations of tags; pass them to set() to detect a racing invalidation"""
+        local = self._local_generations(tags)
+        if not tags:
+            return local, []
+        try:
+            shared = get_redis().mget([self._generation_key(tag) for tag in tags])
+        except redis.RedisError as e:
+            self._redis_failed("read", e)
+            shared = None
+        return local, shared
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Sequence[str] = (),
+        generations: Optional[Tuple[Tuple[int, ...], Optional[List[Optional[str]]]]] = None,
+    ) -> Any:
+        """Store value under key in both tiers and return its cached (JSON round-tripped) form.
+
+        With generations (taken before the value was loaded), the value is not stored
+        if any of its tags was invalidated in the meantime.
+        """
+        self._ensure_listener()
+        ttl = ttl or self.default_ttl
+        tags = tuple(tags)
+        payload = orjson.dumps({"value": value, "tags": tags}, option=_ORJSON_OPTIONS)
+        value = orjson.loads(payload)["value"]
+        local_before, shared_before = generations if generations is not None else (None, None)
+
+        if local_before is not None and self._local_generations(tags) != local_before:
+            self._stats["stale_loads"] += 1
+            return value
+        try:
+            if shared_before and get_redis().mget([self._generation_key(tag) for tag in tags]) != shared_before:
+                self._stats["stale_loads"] += 1
+                return value
+            pipe = get_redis().pipeline()
+            pipe.set(self._key(key), payload, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+                pipe.expire(self._tag_key(tag), max(ttl, self.default_ttl))
+            pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("write", e)
+        self._set_local(key, value, ttl, tags)
+        self._stats["sets"] += 1
+        return value
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: Optional[int] = None, tags: Sequence[str] = ()) -> Any:
+        """Cached value for key, calling loader() and caching its result on a miss"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generations = self.generations(tuple(tags))
+        return self.set(key, loader(), ttl, tags, generations)
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry with one of the tags, in this process, in Redis and (via
+        pub/sub) in every other process. Call after committing the change."""
+        if not tags:
+            return
+        self._stats["invalidations"] += 1
+        self._drop_local(tags)
+        try:
+            client = get_redis()
+            pipe = client.pipeline()
+            for tag in tags:
+                pipe.smembers(self._tag_key(tag))
+            keys = {key for members in pipe.execute() for key in members}
+            pipe = client.pipeline()
+            for tag in tags:
+                pipe.incr(self._generation_key(tag))
+                pipe.expire(self._generation_key(tag), self.default_ttl * 2)
+                pipe.delete(self._tag_key(tag))
+            if keys:
+                pipe.delete(*[self._key(key) for key in keys])
+            pipe.publish(self.channel, orjson.dumps(list(tags)))
+            pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("invalidation", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process since it started"""
+        with self._lock:
+            local_entries = len(self._local)
+        lookups = self._stats["local_hits"] + self._stats["redis_hits"] + self._stats["misses"]
+        hits = self._stats["local_hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "local_entries": local_entries,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "pid": os.getpid(),
+        }
+
+cache = TwoTierCache()
+
+def _cache_key(template: str, func: Callable, args: tuple, kwargs: dict) -> str:
+    bound = inspect.signature(func).bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return template.format(**bound.arguments)
+
+def cached(key: str, tags: Sequence[str] = (), ttl: Optional[int] = None):
+    """Cache a function's result in the shared cache.
+
+    key is a str.format template over the function's arguments, e.g.
+    "contact_fields:{include_inactive}"; arguments not named in it (db,
+    current_user) don't vary the entry. Works on sync and async functions, so it
+    can wrap FastAPI dependencies and route handlers; dependencies are still
+    resolved (authentication still runs) before a cached result is returned.
+    Only cache handlers whose result doesn't depend on the caller beyond the key.
+    """
+    def decorator(func: Callable):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = _cache_key(key, func, args, kwargs)
+                value = cache.get(cache_key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                generations = cache.generations(tuple(tags))
+                return cache.set(cache_key, await func(*args, **kwargs), ttl, tags, generations)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = _cache_key(key, func, args, kwargs)
+            return cache.get_or_set(cache_key, lambda: func(*args, **kwargs), ttl, tags)
+        return wrapper
+    return decorator
+
+def invalidate(*tags: str) -> None:
+    """Invalidate tags in the shared cache (see TwoTierCache.invalidate)"""
+    cache.invalidate(*tags)
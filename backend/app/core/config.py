@@ -27,6 +27,25 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
     UPLOAD_DIR: str = "uploads"
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".png", ".jpg", ".jpeg", ".doc", ".docx", ".xls", ".xlsx"]
+    MAX_MULTIPART_FILE_SIZE: int = 5 * 1024 * 1024 * 1024  # 5GB
+    MULTIPART_PART_SIZE: int = 8 * 1024 * 1024  # 8MB (S3 minimum is 5MB)
+    MULTIPART_URL_EXPIRES: int = 60 * 60  # 1 hour
+    
+    # File Storage ("local" or "s3")
+    STORAGE_BACKEND: str = "local"
+    S3_BUCKET: str = "adjustflow"
+    S3_ENDPOINT_URL: Optional[str] = None  # e.g. http://minio:9000 for MinIO
+    S3_PUBLIC_ENDPOINT_URL: Optional[str] = None  # Endpoint used in presigned URLs handed to browsers
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_PRESIGN_EXPIRES: int = 300  # 5 minutes
+    ARCHIVE_CACHE_TTL_HOURS: int = 24  # Prebuilt contact archives (archives/*.zip) are deleted after this
+    
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller bodies are sent as-is
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4  # 0-11; higher levels cost far more CPU for little gain on JSON
     
     # Email Settings
     SMTP_HOST: Optional[str] = None
@@ -39,10 +58,22 @@ class Settings(BaseSettings):
     APP_NAME: str = "AdjustFlow"
     APP_URL: str = "http://localhost:3000"
     SUPPORT_EMAIL: str = "support@adjustflow.com"
+    DEFAULT_PHONE_COUNTRY_CODE: str = "1"  # Country of phone numbers entered without +country code
     
     # Celery (for background tasks)
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    JOB_TTL_SECONDS: int = 24 * 60 * 60  # How long job owners / idempotency keys are kept
+    
+    # Caching (app/core/cache.py)
+    CACHE_DEFAULT_TTL_SECONDS: int = 300  # Shared (Redis) tier; upper bound on staleness if an invalidation is missed
+    CACHE_LOCAL_TTL_SECONDS: int = 30  # Per-process tier; bounds staleness if an invalidation message is lost
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    CONTACT_FACETS_CACHE_TTL_SECONDS: int = 300
+    
+    # Mobile delta sync
+    SYNC_OVERLAP_SECONDS: int = 60  # Re-scan window before the watermark for transactions that committed late
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30  # Clients that haven't synced for longer get a full resync
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,181 @@
+"""
+Conditional and byte-range file responses
+
+Starlette's FileResponse always sends the whole file with an mtime-based ETag.
+file_response() adds what PDF viewers and media players need:
+- ETag from the stored content hash, Last-Modified from the upload time
+- If-None-Match / If-Modified-Since -> 304 Not Modified
+- Range: bytes=... (single range) -> 206 Partial Content, honouring If-Range
+- Unsatisfiable ranges -> 416 with Content-Range: bytes */size
+Multi-range requests are answered with the full file, which RFC 9110 allows.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def make_etag(content_hash: str) -> str:
+    return f'"{content_hash}"'
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return formatdate(value.timestamp(), usegmt=True)
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match / If-Range list"""
+    if header.strip() == "*":
+        return True
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return any(strip(candidate) == strip(etag) for candidate in header.split(","))
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        return etag_matches(if_none_match, etag)
+    since = _parse_http_date(request.headers.get("if-modified-since"))
+    if since and last_modified:
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+    return False
+
+def _range_applies(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-Range: only honour Range when the client's copy is still current"""
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    value = if_range.strip()
+    if value.startswith("W/"):
+        # Weak validators can't be used with If-Range
+        return False
+    if value.startswith('"'):
+        return value == etag
+    since = _parse_http_date(if_range)
+    if since and last_modified:
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+    return False
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single "bytes=start-end" range into inclusive offsets.
+
+    Returns None for headers that should be ignored (unknown units, bad syntax, multiple ranges),
+    raises ValueError for ranges that can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        # Syntactically invalid ranges are ignored, not rejected
+        return None
+    if start is None:
+        # Suffix range: last N bytes
+        if end is None or end <= 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - end, 0), size - 1
+    if end is None:
+        end = size - 1
+    if start < 0 or start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+def _iter_file_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def content_disposition(disposition: str, filename: Optional[str]) -> str:
+    if not filename:
+        return disposition
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+def file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    content_hash: str,
+    last_modified: Optional[datetime] = None,
+    filename: Optional[str] = None,
+    disposition: str = "attachment",
+) -> Response:
+    """Serve a file with ETag/Last-Modified validation and single byte-range support"""
+    etag = make_etag(content_hash)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # Documents are per-user: browsers may keep them but must revalidate
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": content_disposition(disposition, filename),
+    }
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if _not_modified(request, etag, last_modified):
+        headers.pop("Content-Disposition")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = os.path.getsize(path)
+    range_header = request.headers.get("range")
+    if range_header and _range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"}
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            if request.method == "HEAD":
+                return Response(status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers, media_type=media_type)
+            return StreamingResponse(
+                _iter_file_range(path, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                headers=headers,
+                media_type=media_type
+            )
+
+    return FileResponse(path=str(path), media_type=media_type, headers=headers, method=request.method)
@@ -0,0 +1,78 @@
+"""
+Normalization of contact lookup keys
+
+Phones are stored as users type them ("(555) 010-1234", "555.010.1234 x12",
+"+1 555 010 1234"), policy/claim numbers with arbitrary separators and case, and
+emails with arbitrary case. The normalized forms below are kept in indexed
+columns on Contact so a lookup (or the per-owner email uniqueness check) is an
+equality match whatever format either side used.
+"""
+import re
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.config import settings
+
+_EXTENSION = re.compile(r"\s*(?:ext\.?|extension|x|#)\s*\d+\s*$", re.IGNORECASE)
+_NON_DIGITS = re.compile(r"\D")
+_NON_ALNUM = re.compile(r"[^0-9A-Za-z]")
+
+def normalize_phone(value: Optional[str], country_code: Optional[str] = None) -> Optional[str]:
+    """E.164 form of a phone number ("+15550101234"), or None if it can't be one.
+
+    Numbers written with + or 00 keep their country code; anything else is a
+    national number in country_code (settings.DEFAULT_PHONE_COUNTRY_CODE).
+    Extensions are dropped.
+    """
+    if not value:
+        return None
+    country_code = country_code or settings.DEFAULT_PHONE_COUNTRY_CODE
+    value = _EXTENSION.sub("", value.strip())
+    international = value.startswith(("+", "00"))
+    digits = _NON_DIGITS.sub("", value)
+
+    if international:
+        digits = digits[2:] if value.startswith("00") else digits
+    elif country_code == "1":
+        # NANP: 10 digits, optionally with the leading 1
+        if len(digits) == 11 and digits.startswith("1"):
+            digits = digits[1:]
+        if len(digits) != 10:
+            return None
+        digits = "1" + digits
+    else:
+        # Drop the national trunk prefix (0 in most of the world)
+        digits = country_code + digits.lstrip("0")
+
+    if not 8 <= len(digits) <= 15 or digits.startswith("0"):
+        return None
+    return "+" + digits
+
+def normalize_reference(value: Optional[str]) -> Optional[str]:
+    """Policy/claim number key: letters and digits only, upper-cased"""
+    if not value:
+        return None
+    return _NON_ALNUM.sub("", value).upper() or None
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    """Email key for duplicate detection: trimmed and lower-cased"""
+    if not value:
+        return None
+    return value.strip().lower() or None
+
+# Contact field -> (normalized column, normalizer)
+DERIVED_KEYS = {
+    "email": ("email_normalized", normalize_email),
+    "main_phone": ("main_phone_e164", normalize_phone),
+    "mobile_phone": ("mobile_phone_e164", normalize_phone),
+    "policy_number": ("policy_number_key", normalize_reference),
+    "claim_number": ("claim_number_key", normalize_reference),
+}
+
+def derived_keys(values: Mapping[str, Any]) -> Dict[str, Optional[str]]:
+    """Normalized columns for the raw fields present in values (for Core inserts,
+    which bypass Contact's validators)"""
+    return {
+        column: normalize(values[field])
+        for field, (column, normalize) in DERIVED_KEYS.items()
+        if field in values
+    }
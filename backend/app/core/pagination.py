@@ -0,0 +1,65 @@
+"""
+Helpers for count-free keyset pagination
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string"""
+    payload = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in values.items()
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, datetime_keys: tuple = ()) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor, parsing the given datetime keys"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, dict):
+            raise ValueError("cursor payload must be an object")
+        for key in datetime_keys:
+            if values.get(key) is not None:
+                values[key] = datetime.fromisoformat(values[key])
+        return values
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def estimate_row_count(db: Session, query) -> Optional[int]:
+    """Approximate the number of rows a query returns using the planner's estimate.
+
+    Runs EXPLAIN instead of COUNT(*), so the cost doesn't grow with the table.
+    Returns None when the estimate is unavailable (e.g. non-PostgreSQL databases).
+    """
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+
+    statement = query.order_by(None).statement if hasattr(query, "statement") else query
+    compiled = statement.compile(dialect=dialect)
+    try:
+        # Savepoint so a failed EXPLAIN doesn't abort the request's transaction
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + compiled.string,
+                compiled.params
+            ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        print(f"Warning: Could not estimate row count: {e}")
+        return None
@@ -0,0 +1,170 @@
+"""
+Compiled permission engine for AccessProfile permissions.
+
+AccessProfile.permissions is free-form JSON. Walking that JSON on every request
+is wasteful, so each profile is compiled once into an immutable set of granted
+permission keys and cached per profile version (updated_at / created_at).
+
+JSON shape -> permission keys:
+    {"contacts": {"view": true, "edit": false}}    -> contacts.view
+    {"contacts": {"scope": "own"}}                 -> contacts.scope, contacts.scope.own
+    {"tabs": ["documents", "tasks"]}               -> tabs, tabs.documents, tabs.tasks
+    {"boards": {"*": true}}                        -> everything under boards.
+Explicit false values are recorded as denials and win over wildcards.
+"""
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+WILDCARD = "*"
+_FALSY_STRINGS = {"", "none", "false", "no", "off"}
+
+
+class CompiledPermissions:
+    """Immutable, pre-flattened view of a permissions JSON blob"""
+
+    __slots__ = ("granted", "denied", "wildcards", "grant_all")
+
+    def __init__(
+        self,
+        granted: FrozenSet[str],
+        denied: FrozenSet[str],
+        wildcards: FrozenSet[str],
+        grant_all: bool = False,
+    ):
+        object.__setattr__(self, "granted", granted)
+        object.__setattr__(self, "denied", denied)
+        object.__setattr__(self, "wildcards", wildcards)
+        object.__setattr__(self, "grant_all", grant_all)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("CompiledPermissions is immutable")
+
+    def has(self, permission: str) -> bool:
+        """Check a single dotted permission key"""
+        if permission in self.granted:
+            return True
+        if permission in self.denied:
+            return False
+        if self.grant_all:
+            return True
+        if not self.wildcards:
+            return False
+        # Walk parent prefixes: "contacts.records.edit" -> "contacts.records", "contacts"
+        prefix = permission
+        while "." in prefix:
+            prefix = prefix.rsplit(".", 1)[0]
+            if prefix in self.wildcards:
+                return True
+        return False
+
+    def has_all(self, permissions: Iterable[str]) -> bool:
+        return all(self.has(p) for p in permissions)
+
+    def has_any(self, permissions: Iterable[str]) -> bool:
+        return any(self.has(p) for p in permissions)
+
+
+EMPTY_PERMISSIONS = CompiledPermissions(frozenset(), frozenset(), frozenset())
+
+
+def compile_permissions(permissions: Optional[Dict[str, Any]]) -> CompiledPermissions:
+    """Flatten a permissions JSON blob into a CompiledPermissions object"""
+    if not permissions or not isinstance(permissions, dict):
+        return EMPTY_PERMISSIONS
+
+    granted = set()
+    denied = set()
+    wildcards = set()
+    grant_all = False
+
+    def walk(prefix: str, value: Any) -> None:
+        nonlocal grant_all
+        if isinstance(value, dict):
+            for key, child in value.items():
+                key = str(key).strip()
+                if not key:
+                    continue
+                if key == WILDCARD:
+                    if _is_truthy(child):
+                        if prefix:
+                            wildcards.add(prefix)
+                        else:
+                            grant_all = True
+                    continue
+                walk(f"{prefix}.{key}" if prefix else key, child)
+        elif isinstance(value, (list, tuple, set)):
+            items = [str(item).strip() for item in value if str(item).strip()]
+            if not items:
+                return
+            granted.add(prefix)
+            for item in items:
+                if item == WILDCARD:
+                    wildcards.add(prefix)
+                else:
+                    granted.add(f"{prefix}.{item}")
+        elif isinstance(value, str):
+            if value.strip().lower() in _FALSY_STRINGS:
+                denied.add(prefix)
+                return
+            granted.add(prefix)
+            granted.add(f"{prefix}.{value.strip()}")
+        elif _is_truthy(value):
+            granted.add(prefix)
+        else:
+            denied.add(prefix)
+
+    walk("", permissions)
+    granted.discard("")
+    denied.difference_update(granted)
+
+    return CompiledPermissions(
+        granted=frozenset(granted),
+        denied=frozenset(denied),
+        wildcards=frozenset(wildcards),
+        grant_all=grant_all,
+    )
+
+
+def _is_truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in _FALSY_STRINGS
+    return bool(value)
+
+
+def profile_version(updated_at: Optional[datetime], created_at: Optional[datetime]) -> Optional[str]:
+    """Version stamp for a profile row; changes every time the profile is updated"""
+    stamp = updated_at or created_at
+    return stamp.isoformat() if stamp else None
+
+
+# Per-process cache: profile_id -> (version, compiled permissions)
+_cache: Dict[int, Tuple[Optional[str], CompiledPermissions]] = {}
+_cache_lock = Lock()
+
+
+def get_cached_permissions(profile_id: int, version: Optional[str]) -> Optional[CompiledPermissions]:
+    """Return cached permissions for a profile if the cached version is current"""
+    entry = _cache.get(profile_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def store_permissions(profile_id: int, version: Optional[str], permissions: Optional[Dict[str, Any]]) -> CompiledPermissions:
+    """Compile and cache the permissions for a profile version"""
+    compiled = compile_permissions(permissions)
+    with _cache_lock:
+        _cache[profile_id] = (version, compiled)
+    return compiled
+
+
+def invalidate_profile(profile_id: int) -> None:
+    """Drop a profile from the cache (called when a profile is updated or deleted)"""
+    with _cache_lock:
+        _cache.pop(profile_id, None)
+
+
+def clear_permission_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
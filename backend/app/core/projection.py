@@ -0,0 +1,102 @@
+"""
+Column projections for hot list endpoints
+
+Listing endpoints used to load full ORM entities, copy their attributes into
+dicts or Pydantic models by hand, then let FastAPI validate the result against
+the response model and encode it with the stdlib json module. For thousands of
+rows that is mostly overhead: identity-map bookkeeping, attribute
+instrumentation, and two passes of validation/encoding.
+
+A Projection selects only the columns a summary needs as plain row tuples,
+derives computed fields in Python and the rows are encoded in one pass by
+orjson. The route keeps its response_model for the OpenAPI schema; returning a
+Response directly skips the redundant validation, so the projection's output
+keys must match the schema.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.responses import ORJSONResponse
+
+Computed = Callable[[Mapping[str, Any]], Any]
+
+class Projection:
+    """Named columns to select plus fields computed from them.
+
+    hidden names columns that are only inputs to computed fields and are
+    dropped from the output; requires lists the columns each computed field
+    reads, so only() can narrow the SELECT for sparse fieldsets.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        computed: Optional[Dict[str, Computed]] = None,
+        hidden: Sequence[str] = (),
+        requires: Optional[Dict[str, Sequence[str]]] = None,
+    ):
+        self.columns = columns
+        self.computed = computed or {}
+        self.hidden = tuple(hidden)
+        self.requires = requires or {}
+        self.keys = tuple(columns)
+
+    @property
+    def fields(self) -> List[str]:
+        """Output field names"""
+        return [name for name in (*self.keys, *self.computed) if name not in self.hidden]
+
+    def only(self, fields: Iterable[str]) -> "Projection":
+        """Projection narrowed to the given output fields ("id" is always kept)"""
+        wanted = set(fields)
+        unknown = wanted - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if "id" in self.fields:
+            wanted.add("id")
+        needed = set(wanted)
+        for name in wanted:
+            needed.update(self.requires.get(name, ()))
+        return Projection(
+            columns={name: column for name, column in self.columns.items() if name in needed},
+            computed={name: compute for name, compute in self.computed.items() if name in wanted},
+            hidden=[name for name in self.keys if name in needed and name not in wanted],
+            requires=self.requires,
+        )
+
+    def select(self) -> Select:
+        return select(*(column.label(name) for name, column in self.columns.items()))
+
+    def serialize(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        keys = self.keys
+        computed = tuple(self.computed.items())
+        hidden = self.hidden
+        result = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            for name, compute in computed:
+                item[name] = compute(item)
+            for name in hidden:
+                del item[name]
+            result.append(item)
+        return result
+
+    def fetch(self, db: Session, statement: Select) -> List[Dict[str, Any]]:
+        return self.serialize(db.execute(statement))
+
+def sparse(projection: Projection, fields: Optional[str]) -> Projection:
+    """Apply a ?fields=a,b,c sparse fieldset, rejecting unknown names with 400"""
+    if not fields:
+        return projection
+    try:
+        return projection.only(part.strip() for part in fields.split(",") if part.strip())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def json_response(content: Any, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Encode already-serialized content with orjson, bypassing response_model validation"""
+    return ORJSONResponse(content=content, status_code=status_code)
@@ -0,0 +1,22 @@
+"""
+Shared Redis connection for the API and Celery workers
+"""
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+
+def get_redis() -> redis.Redis:
+    """Get the process-wide Redis client (created lazily, connection pooled)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    return _client
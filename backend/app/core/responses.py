@@ -0,0 +1,17 @@
+"""
+Default JSON response class
+
+FastAPI's JSONResponse encodes with the stdlib json module, which dominates CPU
+time for large listing payloads. ORJSONResponse is installed as the app's
+default_response_class, so every route (response_model or not) is encoded by
+orjson. Output matches what Pydantic produces: UTC datetimes get a "Z" suffix
+and non-string dict keys are allowed.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+class ORJSONResponse(_ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
@@ -0,0 +1,366 @@
+"""
+Pluggable file storage
+
+Files are addressed by a storage key (e.g. "3f2c....pdf", "thumbnails/12.png").
+Two backends are available:
+- LocalStorage: files under UPLOAD_DIR (the original behaviour)
+- S3Storage: any S3-compatible service (AWS S3, MinIO); boto3 is imported lazily
+
+S3 supports presigned URLs, so downloads can be redirected straight to the
+object store instead of streaming bytes through the API workers. Both backends
+support multipart uploads; S3 parts can be uploaded directly with presigned URLs.
+
+Use get_storage() for the configured backend, or get_storage(name) for a
+specific one (e.g. the backend a document was stored in).
+"""
+import hashlib
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from app.core.config import settings
+
+LOCAL = "local"
+S3 = "s3"
+
+class StorageError(Exception):
+    """Raised when a storage operation fails or a key is invalid"""
+
+class StorageBackend:
+    """Interface shared by storage backends"""
+
+    name = ""
+    supports_presigned_urls = False
+
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def save_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Open an object for reading (caller closes)"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def list(self, prefix: str) -> Iterator[Tuple[str, datetime]]:
+        """(key, last modified in UTC) of the objects whose key starts with prefix"""
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path on local disk, if the backend stores files locally"""
+        return None
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        """Yield a local file path for tools that need one (PyMuPDF, Pillow)"""
+        path = self.local_path(key)
+        if path is not None:
+            yield path
+            return
+        suffix = Path(key).suffix
+        with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+            with self.open(key) as source:
+                shutil.copyfileobj(source, tmp, 1024 * 1024)
+            tmp.flush()
+            yield Path(tmp.name)
+
+    def presigned_url(
+        self,
+        key: str,
+        filename: Optional[str] = None,
+        disposition: str = "attachment",
+        content_type: Optional[str] = None,
+    ) -> Optional[str]:
+        """Short-lived direct download URL, or None when the backend can't issue one"""
+        return None
+
+    # Multipart uploads
+    def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        """Store one part and return its ETag"""
+        raise NotImplementedError
+
+    def presigned_part_url(self, key: str, upload_id: str, part_number: int) -> Optional[str]:
+        """URL the client can PUT a part to directly, or None to upload through the API"""
+        return None
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict]) -> None:
+        """Assemble parts ({"part_number", "etag"}) in part_number order"""
+        raise NotImplementedError
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """Files on the local filesystem under a root directory"""
+
+    name = LOCAL
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.multipart_root = self.root / ".multipart"
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise StorageError(f"Invalid storage key: {key}")
+        return path
+
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def save_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+        tmp_path.replace(path)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise StorageError(f"File not found: {key}")
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def list(self, prefix: str) -> Iterator[Tuple[str, datetime]]:
+        directory = self._path(prefix.rsplit("/", 1)[0]) if "/" in prefix else self.root
+        if not directory.is_dir():
+            return
+        for path in directory.rglob("*"):
+            key = path.relative_to(self.root).as_posix()
+            # Skip in-progress writes (dotted temp files) and multipart parts
+            if path.is_file() and key.startswith(prefix) and not path.name.startswith(".") and not key.startswith(".multipart/"):
+                yield key, datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self._path(key)
+
+    def _part_dir(self, upload_id: str) -> Path:
+        if not upload_id.isalnum():
+            raise StorageError("Invalid upload id")
+        return self.multipart_root / upload_id
+
+    def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        self._path(key)  # validate key
+        upload_id = uuid.uuid4().hex
+        self._part_dir(upload_id).mkdir(parents=True, exist_ok=True)
+        return upload_id
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        part_dir = self._part_dir(upload_id)
+        if not part_dir.is_dir():
+            raise StorageError("Unknown upload")
+        (part_dir / f"{part_number:05d}").write_bytes(data)
+        return hashlib.md5(data).hexdigest()
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict]) -> None:
+        part_dir = self._part_dir(upload_id)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{upload_id}.tmp")
+        with open(tmp_path, "wb") as out:
+            for part in sorted(parts, key=lambda p: p["part_number"]):
+                part_path = part_dir / f"{part['part_number']:05d}"
+                if not part_path.is_file():
+                    tmp_path.unlink(missing_ok=True)
+                    raise StorageError(f"Missing part {part['part_number']}")
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, out, 1024 * 1024)
+        tmp_path.replace(path)
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        shutil.rmtree(self._part_dir(upload_id), ignore_errors=True)
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO)"""
+
+    name = S3
+    supports_presigned_urls = True
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        region: Optional[str] = None,
+        presign_expires: int = 300,
+    ):
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError:
+            raise StorageError("boto3 is required for the S3 storage backend (pip install boto3)")
+
+        self.bucket = bucket
+        self.presign_expires = presign_expires
+        client_kwargs = dict(
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            region_name=region,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_kwargs)
+        # Presigned URLs must use a host the browser can reach (e.g. localhost:9000 instead of minio:9000)
+        self.presign_client = (
+            boto3.client("s3", endpoint_url=public_endpoint_url, **client_kwargs)
+            if public_endpoint_url and public_endpoint_url != endpoint_url
+            else self.client
+        )
+        self._ensure_bucket()
+
+    def _ensure_bucket(self) -> None:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError:
+            self.client.create_bucket(Bucket=self.bucket)
+
+    def _extra_args(self, content_type: Optional[str]) -> dict:
+        return {"ContentType": content_type} if content_type else {}
+
+    def save(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **self._extra_args(content_type))
+
+    def save_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> None:
+        # upload_fileobj switches to multipart for large files on its own
+        self.client.upload_fileobj(stream, self.bucket, key, ExtraArgs=self._extra_args(content_type))
+
+    def open(self, key: str) -> BinaryIO:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except ClientError as e:
+            raise StorageError(f"Could not open {key}: {e}")
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list(self, prefix: str) -> Iterator[Tuple[str, datetime]]:
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"], item["LastModified"]
+
+    def presigned_url(
+        self,
+        key: str,
+        filename: Optional[str] = None,
+        disposition: str = "attachment",
+        content_type: Optional[str] = None,
+    ) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f"{disposition}; filename*=utf-8''{quote(filename)}"
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.presign_client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.presign_expires)
+
+    def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        response = self.client.create_multipart_upload(Bucket=self.bucket, Key=key, **self._extra_args(content_type))
+        return response["UploadId"]
+
+    def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+        )
+        return response["ETag"]
+
+    def presigned_part_url(self, key: str, upload_id: str, part_number: int) -> Optional[str]:
+        return self.presign_client.generate_presigned_url(
+            "upload_part",
+            Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": part_number},
+            ExpiresIn=settings.MULTIPART_URL_EXPIRES,
+        )
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict]) -> None:
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda p: p["part_number"])
+                ]
+            },
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+
+_backends: Dict[str, StorageBackend] = {}
+_backends_lock = Lock()
+
+def _create_backend(name: str) -> StorageBackend:
+    if name == LOCAL:
+        return LocalStorage(settings.UPLOAD_DIR)
+    if name == S3:
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            region=settings.S3_REGION,
+            presign_expires=settings.S3_PRESIGN_EXPIRES,
+        )
+    raise StorageError(f"Unknown storage backend: {name}")
+
+def get_storage(name: Optional[str] = None) -> StorageBackend:
+    """Get a storage backend by name (defaults to STORAGE_BACKEND), created once per process"""
+    name = name or settings.STORAGE_BACKEND
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = _backends[name] = _create_backend(name)
+    return backend
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON, Table
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON, Table, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred, validates
+from sqlalchemy.sql import func, literal_column
 import datetime
 
+from app.core.normalize import DERIVED_KEYS
 from app.database import Base
 
 # Association table for many-to-many relationship between tasks and contacts
@@ -13,6 +15,45 @@ task_contact_association = Table(
     Column('contact_id', Integer, ForeignKey('contacts.id'), primary_key=True)
 )
 
+# Edge tables mirroring the JSON id arrays on Contact/Activity, so reverse lookups
+# ("contacts assigned to me", "activities mentioning X") are index scans. The JSON
+# columns stay the source of truth; app.services.contact_edges keeps these in sync.
+contact_assignees = Table(
+    'contact_assignees',
+    Base.metadata,
+    Column('contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, index=True)
+)
+
+contact_subcontractors = Table(
+    'contact_subcontractors',
+    Base.metadata,
+    Column('contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True),
+    Column('subcontractor_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True, index=True)
+)
+
+contact_relations = Table(
+    'contact_relations',
+    Base.metadata,
+    Column('contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True),
+    Column('related_contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True, index=True)
+)
+
+activity_mentions = Table(
+    'activity_mentions',
+    Base.metadata,
+    Column('activity_id', Integer, ForeignKey('activities.id', ondelete='CASCADE'), primary_key=True),
+    Column('contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True, index=True)
+)
+
+# Normalized Contact.tags (one row per contact and tag) for tag filters and facet counts
+contact_tags = Table(
+    'contact_tags',
+    Base.metadata,
+    Column('contact_id', Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag', String, primary_key=True, index=True)
+)
+
 class Role(Base):
     """High-level role categories (Sales, Admin, Field, Subcontractor)"""
     __tablename__ = "roles"
@@ -60,6 +101,8 @@ class Company(Base):
     email = Column(String)
     website = Column(String)
     logo_url = Column(String)
+    logo_key = Column(String)  # Storage key of the uploaded logo
+    logo_storage_backend = Column(String)
     primary_color = Column(String)  # Hex color code
     secondary_color = Column(String)  # Hex color code
     status = Column(String, default="active")  # active, inactive
@@ -115,8 +158,17 @@ class Project(Base):
     owner = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project")
 
+def row_changed_at(updated_at, created_at):
+    """When a row last changed, for the delta sync feed (updated_at stays NULL until
+    the first update); must match the ix_*_sync indexes"""
+    return func.coalesce(updated_at, created_at)
+
 class Contact(Base):
     __tablename__ = "contacts"
+    # Wide columns are deferred in two load groups ("detail", "claim") so listings and
+    # joins (board cards, task contacts) skip them; detail views undefer both groups
+    # with app.services.contact_detail.contact_detail_options(). The "lookup" group holds
+    # normalized keys that are only ever filtered on, never returned.
     
     id = Column(Integer, primary_key=True, index=True)
     # Basic Information
@@ -140,30 +192,38 @@ class Contact(Base):
     status = Column(String)  # e.g., Pre-Inspection, Active, etc.
     sales_rep_id = Column(Integer, ForeignKey("users.id"))  # Assigned sales rep
     lead_source = Column(String)
-    assigned_to_ids = Column(JSON)  # Array of user IDs for team assignment
-    subcontractor_ids = Column(JSON)  # Array of contact IDs for subcontractors
-    related_contact_ids = Column(JSON)  # Array of contact IDs for related contacts
-    description = Column(Text)
-    notes = Column(Text)  # Keep for backward compatibility
-    tags = Column(JSON)  # Array of tag strings
+    # JSON columns store None as SQL NULL (not JSON 'null'), so upserts can coalesce over them
+    assigned_to_ids = deferred(Column(JSON(none_as_null=True)), group="detail")  # Array of user IDs for team assignment
+    subcontractor_ids = deferred(Column(JSON(none_as_null=True)), group="detail")  # Array of contact IDs for subcontractors
+    related_contact_ids = deferred(Column(JSON(none_as_null=True)), group="detail")  # Array of contact IDs for related contacts
+    description = deferred(Column(Text), group="detail")
+    notes = deferred(Column(Text), group="detail")  # Keep for backward compatibility
+    tags = deferred(Column(JSON(none_as_null=True)), group="detail")  # Array of tag strings
     customer_type = Column(String)
     texting_opt_out = Column(Boolean, default=False)
     # Insurance/Claim Specific Fields (optional for industry-agnostic use)
-    date_of_loss = Column(DateTime(timezone=True))
-    roof_type = Column(String)
-    insurance_carrier = Column(String)
-    date_of_filing = Column(DateTime(timezone=True))
-    due_time = Column(DateTime(timezone=True))
-    code_upgrade = Column(String)
-    policy_number = Column(String)
-    claim_number = Column(String)
-    deductible = Column(Float)
-    desk_adjuster_name = Column(String)
-    desk_adjuster_phone = Column(String)
+    date_of_loss = deferred(Column(DateTime(timezone=True)), group="claim")
+    roof_type = deferred(Column(String), group="claim")
+    insurance_carrier = deferred(Column(String), group="claim")
+    date_of_filing = deferred(Column(DateTime(timezone=True)), group="claim")
+    due_time = deferred(Column(DateTime(timezone=True)), group="claim")
+    code_upgrade = deferred(Column(String), group="claim")
+    policy_number = deferred(Column(String), group="claim")
+    claim_number = deferred(Column(String), group="claim")
+    deductible = deferred(Column(Float), group="claim")
+    desk_adjuster_name = deferred(Column(String), group="claim")
+    desk_adjuster_phone = deferred(Column(String), group="claim")
     # Custom fields stored as JSON
-    custom_fields = Column(JSON)  # JSON object with field_key -> value mappings
+    custom_fields = deferred(Column(JSON(none_as_null=True)), group="detail")  # JSON object with field_key -> value mappings
+    # Normalized lookup keys (app.core.normalize), maintained by _normalize_lookup_keys;
+    # email_normalized is unique per owner (uq_contacts_owner_email)
+    email_normalized = deferred(Column(String), group="lookup")
+    main_phone_e164 = deferred(Column(String, index=True), group="lookup")
+    mobile_phone_e164 = deferred(Column(String, index=True), group="lookup")
+    policy_number_key = deferred(Column(String, index=True), group="lookup")
+    claim_number_key = deferred(Column(String, index=True), group="lookup")
     # Metadata
-    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -175,9 +235,44 @@ class Contact(Base):
     documents = relationship("Document", back_populates="contact", cascade="all, delete-orphan")
     board_cards = relationship("BoardCard", back_populates="contact")
     
+    __table_args__ = (
+        # Arbiter for INSERT ... ON CONFLICT in app.services.contact_upsert
+        Index(
+            "uq_contacts_owner_email",
+            "created_by_id",
+            "email_normalized",
+            unique=True,
+            postgresql_where=text("email_normalized IS NOT NULL"),
+            sqlite_where=text("email_normalized IS NOT NULL"),
+        ),
+        # Delta sync feed order per owner, see app.services.delta_sync
+        Index("ix_contacts_sync", created_by_id, row_changed_at(updated_at, created_at), id),
+    )
+    
     @property
     def full_name(self):
         return self.display_name or f"{self.first_name} {self.last_name}".strip()
+    
+    @validates(*DERIVED_KEYS)
+    def _normalize_lookup_keys(self, key, value):
+        column, normalize = DERIVED_KEYS[key]
+        setattr(self, column, normalize(value))
+        return value
+
+def task_calendar_bounds(due_date, due_time_start, due_time_end):
+    """Start/end expressions of a task on the calendar.
+
+    Timed tasks span due_time_start..due_time_end; otherwise the task is a point at
+    due_date. GREATEST guards against end < start so tstzrange never raises.
+    """
+    start = func.coalesce(due_time_start, due_date)
+    end = func.greatest(func.coalesce(due_time_end, due_time_start, due_date), start)
+    return start, end
+
+def task_calendar_range(due_date, due_time_start, due_time_end):
+    """tstzrange expression of a task's calendar span (must match ix_tasks_calendar_span)"""
+    start, end = task_calendar_bounds(due_date, due_time_start, due_time_end)
+    return func.tstzrange(start, end, literal_column("'[]'"))
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -199,6 +294,22 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True))
     
+    # GiST index over the task's calendar span, used by the calendar range query
+    __table_args__ = (
+        Index(
+            "ix_tasks_calendar_span",
+            task_calendar_range(due_date, due_time_start, due_time_end),
+            postgresql_using="gist",
+            postgresql_where=task_calendar_bounds(due_date, due_time_start, due_time_end)[0].isnot(None)
+        ),
+        # Keyset pagination indexes matching the list ordering (due_date nullslast, created_at desc, id desc)
+        Index("ix_tasks_creator_list_order", created_by_id, due_date.asc().nullslast(), created_at.desc(), id.desc()),
+        Index("ix_tasks_assignee_list_order", assigned_to_id, due_date.asc().nullslast(), created_at.desc(), id.desc()),
+        # Delta sync feed order for tasks the user created or is assigned
+        Index("ix_tasks_sync_creator", created_by_id, row_changed_at(updated_at, created_at), id),
+        Index("ix_tasks_sync_assignee", assigned_to_id, row_changed_at(updated_at, created_at), id),
+    )
+    
     # Relationships
     assigned_to = relationship("User", foreign_keys=[assigned_to_id], back_populates="assigned_tasks")
     created_by = relationship("User", foreign_keys=[created_by_id], back_populates="created_tasks")
@@ -219,6 +330,10 @@ class Activity(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_activities_sync", contact_id, row_changed_at(updated_at, created_at)),
+    )
+    
     # Relationships
     contact = relationship("Contact", back_populates="activities")
     created_by = relationship("User", back_populates="created_activities")
@@ -259,9 +374,19 @@ class Document(Base):
     original_filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     file_size = Column(Integer)  # Size in bytes
+    content_hash = Column(String(64))  # SHA-256 of the file, used as the download ETag
+    storage_backend = Column(String, default="local")  # Backend holding the file (see app/core/storage.py); key is filename
     file_type = Column(String)  # MIME type
     mime_type = Column(String)
     pages = Column(Integer)  # For PDFs
+    page_width = Column(Float)  # First page size in points
+    page_height = Column(Float)
+    text_length = Column(Integer)  # Characters in the embedded text layer
+    text_content = deferred(Column(Text))  # Embedded text layer, only loaded on demand
+    metadata_status = Column(String, default="pending", index=True)  # pending, complete, unsupported, failed
+    metadata_extracted_at = Column(DateTime(timezone=True))
+    renditions = Column(JSON)  # Image renditions: {"thumbnail": {"width", "height", "size"}, ..., "original": {...}}
+    search_vector = deferred(Column(TSVECTOR))  # Weighted filename/description/text, see services/document_search.py
     category_id = Column(Integer, ForeignKey("document_categories.id"))
     contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
     description = Column(Text)
@@ -270,6 +395,11 @@ class Document(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_documents_search_vector", search_vector, postgresql_using="gin"),
+        Index("ix_documents_sync", contact_id, row_changed_at(updated_at, created_at)),
+    )
+    
     # Relationships
     contact = relationship("Contact", back_populates="documents")
     category = relationship("DocumentCategory", back_populates="documents")
@@ -339,7 +469,44 @@ class BoardCard(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_board_cards_sync", board_column_id, row_changed_at(updated_at, created_at)),
+    )
+    
     # Relationships
     column = relationship("BoardColumn", back_populates="cards")
     contact = relationship("Contact")
-    created_by = relationship("User")
\ No newline at end of file
+    created_by = relationship("User")
+
+class ContactDuplicateCandidate(Base):
+    """A pair of the same owner's contacts that the dedupe scan scored as likely duplicates"""
+    __tablename__ = "contact_duplicate_candidates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)  # Older contact of the pair
+    duplicate_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)  # 0..1
+    reasons = Column(JSON)  # Matched signals, e.g. ["email", "phone", "name"]
+    status = Column(String, nullable=False, default="open")  # open, dismissed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("uq_contact_duplicate_candidates_pair", contact_id, duplicate_id, unique=True),
+        Index("ix_contact_duplicate_candidates_review", owner_id, status, score.desc()),
+    )
+
+class SyncTombstone(Base):
+    """A record deleted (or no longer visible) for a user, reported by the delta sync feed"""
+    __tablename__ = "sync_tombstones"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String, nullable=False)  # contacts, tasks, activities, documents, board_cards
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_sync_tombstones_feed", owner_id, deleted_at, id),
+    )
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
 from app.database import get_db
-from app.models import Activity, Contact, User
+from app.models import Activity, Contact, User, activity_mentions
 from app.routers.auth import get_current_user
+from app.services.contact_edges import delete_activity_mentions, sync_activity_mentions
+from app.services.delta_sync import record_deletions
 from app.schemas.activity_schemas import (
     ActivityCreate,
     ActivityUpdate,
@@ -72,6 +74,57 @@ async def list_contact_activities(
     
     return result
 
+@router.get("/mentioning/{contact_id}", response_model=List[ActivityResponse])
+async def list_activities_mentioning(
+    contact_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List activities (on any of the user's contacts) that @mention a contact"""
+    contact = db.query(Contact).filter(
+        Contact.id == contact_id,
+        Contact.created_by_id == current_user.id
+    ).first()
+    
+    if not contact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    activities = (
+        db.query(Activity)
+        .join(activity_mentions, activity_mentions.c.activity_id == Activity.id)
+        .join(Contact, Contact.id == Activity.contact_id)
+        .filter(
+            activity_mentions.c.contact_id == contact_id,
+            Contact.created_by_id == current_user.id
+        )
+        .options(joinedload(Activity.created_by))
+        .order_by(Activity.created_at.desc())
+        .all()
+    )
+    
+    result = []
+    for activity in activities:
+        creator = activity.created_by
+        creator_name = creator.full_name if creator and creator.full_name else creator.username if creator else None
+        
+        result.append({
+            "id": activity.id,
+            "activity_type": activity.activity_type,
+            "content": activity.content,
+            "subject": activity.subject,
+            "contact_id": activity.contact_id,
+            "created_by_id": activity.created_by_id,
+            "created_by_name": creator_name,
+            "related_contact_ids": activity.related_contact_ids or [],
+            "created_at": activity.created_at,
+            "updated_at": activity.updated_at
+        })
+    
+    return result
+
 @router.post("/contact/{contact_id}", response_model=ActivityResponse)
 async def create_activity(
     contact_id: int,
@@ -102,6 +155,8 @@ async def create_activity(
     )
     
     db.add(activity)
+    db.flush()
+    sync_activity_mentions(db, activity)
     db.commit()
     db.refresh(activity)
     
@@ -186,6 +241,9 @@ async def update_activity(
     for field, value in update_data.items():
         setattr(activity, field, value)
     
+    if "related_contact_ids" in update_data:
+        sync_activity_mentions(db, activity)
+    
     db.commit()
     db.refresh(activity)
     
@@ -230,6 +288,8 @@ async def delete_activity(
             detail="You can only delete your own activities"
         )
     
+    delete_activity_mentions(db, activity.id)
+    record_deletions(db, "activities", [(activity.id, current_user.id)])
     db.delete(activity)
     db.commit()
     
@@ -3,9 +3,16 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.database import get_db
-from app.models import User
+from app.models import User, AccessProfile
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password, create_access_token, decode_token
+from app.core.permissions import (
+    CompiledPermissions,
+    EMPTY_PERMISSIONS,
+    get_cached_permissions,
+    profile_version,
+    store_permissions,
+)
 from app.schemas import UserCreate, UserLogin, Token, UserOut
 
 router = APIRouter()
@@ -107,6 +114,51 @@ def get_current_user(authorization: Optional[str] = Header(default=None), db: Se
 
     return user
 
+def get_user_permissions(user: User, db: Session) -> CompiledPermissions:
+    """Get the compiled permissions for a user's access profile.
+
+    Only the profile's version timestamps are read on a cache hit; the JSON blob
+    is fetched and compiled only when the profile changed.
+    """
+    if not user.access_profile_id:
+        return EMPTY_PERMISSIONS
+
+    row = db.query(AccessProfile.updated_at, AccessProfile.created_at).filter(
+        AccessProfile.id == user.access_profile_id
+    ).first()
+    if not row:
+        return EMPTY_PERMISSIONS
+
+    version = profile_version(row.updated_at, row.created_at)
+    compiled = get_cached_permissions(user.access_profile_id, version)
+    if compiled is None:
+        permissions = db.query(AccessProfile.permissions).filter(
+            AccessProfile.id == user.access_profile_id
+        ).scalar()
+        compiled = store_permissions(user.access_profile_id, version, permissions)
+    return compiled
+
+def require_permission(*permissions: str):
+    """Dependency factory: require every listed permission (superusers always pass)
+
+    Usage: current_user: User = Depends(require_permission("contacts.edit"))
+    """
+    def dependency(
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ) -> User:
+        if current_user.is_superuser:
+            return current_user
+        compiled = get_user_permissions(current_user, db)
+        if not compiled.has_all(permissions):
+            raise HTTPException(
+                status_code=403,
+                detail="Insufficient permissions"
+            )
+        return current_user
+
+    return dependency
+
 @router.get("/me", response_model=UserOut)
 async def get_me(current_user: User = Depends(get_current_user)):
     """Get current user info"""
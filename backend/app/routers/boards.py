@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 from sqlalchemy import and_
 
 from app.database import get_db
 from app.models import Board, BoardColumn, BoardCard, Contact, User, Task, Document, task_contact_association
 from app.routers.auth import get_current_user
+from app.core.projection import json_response, sparse
+from app.services.list_projections import BOARD, attach_board_columns
+from app.services.delta_sync import board_card_owners, record_deletions, record_deletions_from
 from datetime import datetime, timezone
 from sqlalchemy import func
 from app.schemas.board_schemas import (
@@ -26,46 +29,21 @@ router = APIRouter(tags=["boards"])
 
 @router.get("/", response_model=List[BoardResponse])
 async def list_boards(
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all boards for the current user"""
-    boards = (
-        db.query(Board)
-        .filter(Board.created_by_id == current_user.id)
-        .options(joinedload(Board.columns))
+    """List all boards for the current user (fields: comma-separated sparse fieldset)"""
+    projection = sparse(BOARD, fields)
+    boards = projection.fetch(
+        db,
+        projection.select()
+        .where(Board.created_by_id == current_user.id)
         .order_by(Board.created_at.desc())
-        .all()
     )
+    attach_board_columns(db, boards)
     
-    result = []
-    for board in boards:
-        columns = [
-            BoardColumnResponse(
-                id=col.id,
-                board_id=col.board_id,
-                name=col.name,
-                position=col.position,
-                color=col.color,
-                wip_limit=col.wip_limit,
-                created_at=col.created_at,
-                updated_at=col.updated_at
-            )
-            for col in sorted(board.columns, key=lambda x: x.position)
-        ]
-        
-        result.append(BoardResponse(
-            id=board.id,
-            name=board.name,
-            description=board.description,
-            color=board.color,
-            created_by_id=board.created_by_id,
-            columns=columns,
-            created_at=board.created_at,
-            updated_at=board.updated_at
-        ))
-    
-    return result
+    return json_response(boards)
 
 @router.post("/", response_model=BoardResponse)
 async def create_board(
@@ -317,6 +295,7 @@ async def delete_board(
             detail="Board not found"
         )
     
+    record_deletions_from(db, "board_cards", board_card_owners().where(Board.id == board.id))
     db.delete(board)
     db.commit()
     
@@ -435,6 +414,7 @@ async def delete_column(
             detail="Column not found"
         )
     
+    record_deletions_from(db, "board_cards", board_card_owners().where(BoardColumn.id == column.id))
     db.delete(column)
     db.commit()
     
@@ -639,6 +619,7 @@ async def delete_card(
             detail="Card not found"
         )
     
+    record_deletions(db, "board_cards", [(card.id, current_user.id)])
     db.delete(card)
     db.commit()
     
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import hashlib
+
+import orjson
+
+from app.database import get_db
+from app.models import Board, Company, ContactFieldDefinition, DocumentCategory, TaskType, User
+from app.routers.auth import get_current_user
+from app.routers.company import CompanyResponse
+from app.core.file_responses import etag_matches
+from app.core.projection import json_response
+from app.schemas import UserOut
+from app.schemas.board_schemas import BoardResponse
+from app.schemas.contact_field_schemas import ContactFieldDefinitionResponse
+from app.schemas.document_schemas import DocumentCategoryResponse
+from app.schemas.task_type_schemas import TaskTypeResponse
+from app.services.list_projections import BOARD, attach_board_columns
+from app.services.reference_data import get_reference_data
+
+router = APIRouter(tags=["bootstrap"])
+
+# Revalidate on every load: unchanged data costs a 304 without a body
+CACHE_CONTROL = "private, no-cache"
+
+class BootstrapResponse(BaseModel):
+    """Everything the frontend loads on start, in one request"""
+    me: UserOut
+    boards: List[BoardResponse]
+    # Reference data, shared by all users
+    reference_version: str
+    company: Optional[CompanyResponse] = None
+    contact_fields: List[ContactFieldDefinitionResponse]
+    task_types: List[TaskTypeResponse]
+    document_categories: List[DocumentCategoryResponse]
+    users: List[UserOut]
+
+def _build_reference_data(db: Session) -> Dict[str, Any]:
+    company = db.query(Company).first()
+    if not company:
+        # Same default as GET /company
+        company = Company(name="My Company")
+        db.add(company)
+        db.commit()
+        db.refresh(company)
+    
+    fields = (
+        db.query(ContactFieldDefinition)
+        .filter(ContactFieldDefinition.is_active == True)
+        .order_by(ContactFieldDefinition.section.asc(), ContactFieldDefinition.display_order.asc())
+        .all()
+    )
+    task_types = db.query(TaskType).order_by(TaskType.name.asc()).all()
+    categories = db.query(DocumentCategory).order_by(DocumentCategory.name.asc()).all()
+    users = db.query(User).filter(User.is_active == True).order_by(User.username.asc()).all()
+    
+    return {
+        "company": CompanyResponse.model_validate(company).model_dump(),
+        "contact_fields": [ContactFieldDefinitionResponse.model_validate(field).model_dump() for field in fields],
+        "task_types": [TaskTypeResponse.model_validate(task_type).model_dump() for task_type in task_types],
+        "document_categories": [DocumentCategoryResponse.model_validate(category).model_dump() for category in categories],
+        "users": [UserOut.model_validate(user).model_dump() for user in users],
+    }
+
+@router.get("/", response_model=BootstrapResponse)
+async def bootstrap(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Current user, their boards and the reference data (company, contact fields, task types,
+    document categories, user directory) in one response; If-None-Match gets a 304 when unchanged"""
+    version, reference = get_reference_data(db, _build_reference_data)
+    
+    boards = BOARD.fetch(
+        db,
+        BOARD.select()
+        .where(Board.created_by_id == current_user.id)
+        .order_by(Board.created_at.desc())
+    )
+    attach_board_columns(db, boards)
+    personal = {"me": UserOut.model_validate(current_user).model_dump(), "boards": boards}
+    
+    # The reference part is identified by its version, the small per-user part by its content
+    digest = hashlib.sha1(orjson.dumps(personal, option=orjson.OPT_NON_STR_KEYS)).hexdigest()[:16]
+    etag = f'W/"{version}-{digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response = json_response({**personal, "reference_version": version, **reference})
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Any, Dict
+
+from app.models import User
+from app.routers.auth import get_current_user
+from app.core.cache import cache
+
+router = APIRouter(tags=["cache"])
+
+@router.get("/stats")
+async def cache_stats(
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Hit/miss counters of the reference data cache in the process serving this request"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Only admins can view cache stats")
+    return cache.stats()
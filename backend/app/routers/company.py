@@ -1,12 +1,19 @@
 from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi.responses import FileResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
+from pathlib import Path
+import mimetypes
+import uuid
 
 from app.database import get_db
 from app.models import Company, User
 from app.routers.auth import get_current_user
+from app.core.cache import cached, invalidate
+from app.core.config import settings
+from app.core.storage import get_storage
 
 router = APIRouter(tags=["company"])
 
@@ -59,12 +66,9 @@ class CompanyUpdate(BaseModel):
     secondary_color: Optional[str] = None
     status: Optional[str] = None
 
-@router.get("/", response_model=CompanyResponse)
-async def get_company(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get company information"""
+@cached("company", tags=("company",))
+def company_settings(db: Session = Depends(get_db)) -> dict:
+    """Company information as CompanyResponse data (cached dependency)"""
     # For now, return the first company or create a default one
     company = db.query(Company).first()
     if not company:
@@ -73,6 +77,14 @@ async def get_company(
         db.add(company)
         db.commit()
         db.refresh(company)
+    return CompanyResponse.model_validate(company).model_dump()
+
+@router.get("/", response_model=CompanyResponse)
+async def get_company(
+    company: dict = Depends(company_settings),
+    current_user: User = Depends(get_current_user)
+):
+    """Get company information"""
     return company
 
 @router.put("/", response_model=CompanyResponse)
@@ -96,9 +108,13 @@ async def update_company(
         setattr(company, key, value)
     
     db.commit()
+    invalidate("company")
     db.refresh(company)
     return company
 
+LOGO_EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp"]
+MAX_LOGO_SIZE = 5 * 1024 * 1024  # 5MB
+
 @router.post("/logo")
 async def upload_logo(
     file: UploadFile = File(...),
@@ -109,17 +125,66 @@ async def upload_logo(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Only admins can upload logos")
     
-    # For now, just return a placeholder URL
-    # In production, you'd upload to S3 or similar storage
-    logo_url = f"/uploads/logos/{file.filename}"
+    file_ext = Path(file.filename or "").suffix.lower()
+    if file_ext not in LOGO_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(LOGO_EXTENSIONS)}"
+        )
+    contents = await file.read()
+    if len(contents) > MAX_LOGO_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {MAX_LOGO_SIZE / 1024 / 1024}MB"
+        )
+    
+    storage = get_storage()
+    logo_key = f"logos/{uuid.uuid4()}{file_ext}"
+    storage.save(logo_key, contents, file.content_type)
+    # Versioned URL so browsers pick up a new logo immediately
+    logo_url = f"{settings.API_V1_STR}/company/logo?v={Path(logo_key).stem}"
     
     company = db.query(Company).first()
     if not company:
-        company = Company(name="My Company", logo_url=logo_url)
+        company = Company(name="My Company")
         db.add(company)
-    else:
-        company.logo_url = logo_url
     
+    previous = (company.logo_storage_backend, company.logo_key)
+    company.logo_url = logo_url
+    company.logo_key = logo_key
+    company.logo_storage_backend = storage.name
     db.commit()
+    invalidate("company")
+    
+    # Remove the replaced logo
+    if previous[1]:
+        try:
+            get_storage(previous[0]).delete(previous[1])
+        except Exception as e:
+            print(f"Warning: Failed to delete previous logo: {e}")
+    
     return {"logo_url": logo_url}
 
+@router.get("/logo")
+async def get_logo(db: Session = Depends(get_db)):
+    """Serve the company logo (public, so it can be shown on the login page)"""
+    company = db.query(Company).first()
+    if not company or not company.logo_key:
+        raise HTTPException(status_code=404, detail="Logo not found")
+    
+    storage = get_storage(company.logo_storage_backend)
+    media_type = mimetypes.guess_type(company.logo_key)[0] or "application/octet-stream"
+    if storage.supports_presigned_urls:
+        return RedirectResponse(
+            storage.presigned_url(company.logo_key, content_type=media_type),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+    
+    logo_path = storage.local_path(company.logo_key)
+    if not logo_path.exists():
+        raise HTTPException(status_code=404, detail="Logo not found")
+    return FileResponse(
+        path=str(logo_path),
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
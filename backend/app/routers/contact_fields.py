@@ -5,6 +5,7 @@ from typing import List
 from app.database import get_db
 from app.models import ContactFieldDefinition, User
 from app.routers.auth import get_current_user
+from app.core.cache import cached, invalidate
 from app.schemas.contact_field_schemas import (
     ContactFieldDefinitionCreate,
     ContactFieldDefinitionUpdate,
@@ -161,6 +162,7 @@ ROOFING_TEMPLATE = [
 ]
 
 @router.get("/", response_model=List[ContactFieldDefinitionResponse])
+@cached("contact_fields:{include_inactive}", tags=("contact_fields",))
 async def list_field_definitions(
     include_inactive: bool = False,
     db: Session = Depends(get_db),
@@ -176,7 +178,7 @@ async def list_field_definitions(
         query = query.filter(ContactFieldDefinition.is_active == True)
     
     fields = query.all()
-    return fields
+    return [ContactFieldDefinitionResponse.model_validate(field).model_dump() for field in fields]
 
 @router.post("/", response_model=ContactFieldDefinitionResponse)
 async def create_field_definition(
@@ -203,6 +205,7 @@ async def create_field_definition(
     
     db.add(field)
     db.commit()
+    invalidate("contact_fields")
     db.refresh(field)
     
     return field
@@ -250,6 +253,7 @@ async def update_field_definition(
         setattr(field, key, value)
     
     db.commit()
+    invalidate("contact_fields")
     db.refresh(field)
     
     return field
@@ -273,6 +277,7 @@ async def delete_field_definition(
     
     db.delete(field)
     db.commit()
+    invalidate("contact_fields")
     
     return {"message": "Field definition deleted successfully"}
 
@@ -318,6 +323,7 @@ async def apply_template(
             created_fields.append(field)
     
     db.commit()
+    invalidate("contact_fields")
     
     # Refresh all created and updated fields
     for field in created_fields:
@@ -1,21 +1,40 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import asc, desc
+from fastapi import APIRouter, HTTPException, Depends, Query, status, UploadFile, File, Header
+from sqlalchemy.orm import Session
+from sqlalchemy import asc, desc, exists
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-import csv
-import io
-from pydantic import BaseModel, ValidationError
+import uuid
 
 from app.database import get_db
-from app.models import Contact, User, BoardCard, Document, Activity, task_contact_association
+from app.models import Contact, ContactDuplicateCandidate, User, BoardCard, Document, Activity, task_contact_association, contact_assignees, contact_subcontractors, contact_relations, contact_tags
 from app.routers.auth import get_current_user
 import os
 from app.schemas.contact_schemas import (
     ContactCreate,
     ContactUpdate,
     ContactResponse,
-    ContactSummary
+    ContactSummary,
+    ContactDetailResponse,
+    ContactFacets,
+    ContactMergeRequest,
+    ContactMergeResponse,
+    DuplicateCandidateResponse,
+    ImportResponse
 )
+from app.schemas.job_schemas import JobAccepted
+from app.services.list_projections import CONTACT_SUMMARY, contact_summary_select
+from app.services.contact_detail import ContactDetailService, contact_detail_options, parse_include, refresh_contact
+from app.services.contact_edges import EDGE_FIELDS, delete_contact_edges, sync_contact_edges
+from app.services.contact_facets import get_contact_facets, invalidate_contact_facets
+from app.services.contact_lookup import lookup_condition
+from app.services.contact_dedupe import CANDIDATE_DISMISSED, CANDIDATE_OPEN, merge_contacts
+from app.services.contact_upsert import DUPLICATE, ON_DUPLICATE_ERROR, find_by_email, upsert_contacts
+from app.services.contact_import import import_contacts_csv
+from app.services.delta_sync import record_contact_deletions
+from app.tasks import enqueue
+from app.tasks.imports import IMPORT_DIR, import_contacts as import_contacts_task
+from app.tasks.dedupe import scan_contact_duplicates
+from app.core.projection import json_response, sparse
 
 router = APIRouter(tags=["contacts"])
 
@@ -24,16 +43,42 @@ async def list_contacts(
     search: Optional[str] = None,
     sort_by: Optional[str] = None,
     sort_order: Optional[str] = "asc",
+    fields: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    status_filter: Optional[str] = None,
+    contact_type: Optional[str] = None,
+    lead_source: Optional[str] = None,
+    sales_rep_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all contacts for the current user"""
-    query = db.query(Contact).filter(Contact.created_by_id == current_user.id)
+    """List all contacts for the current user (fields: comma-separated sparse fieldset).
+
+    Repeat tag to require several tags; the other filters match the facet values
+    returned by /contacts/facets.
+    """
+    projection = sparse(CONTACT_SUMMARY, fields)
+    query = contact_summary_select(projection).where(Contact.created_by_id == current_user.id)
+    
+    # Facet filters
+    for tag_value in tag or []:
+        query = query.where(exists().where(
+            contact_tags.c.contact_id == Contact.id,
+            contact_tags.c.tag == tag_value.strip()
+        ))
+    if status_filter:
+        query = query.where(Contact.status == status_filter)
+    if contact_type:
+        query = query.where(Contact.contact_type == contact_type)
+    if lead_source:
+        query = query.where(Contact.lead_source == lead_source)
+    if sales_rep_id is not None:
+        query = query.where(Contact.sales_rep_id == sales_rep_id)
     
     # Search functionality
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             (Contact.first_name.ilike(search_term)) |
             (Contact.last_name.ilike(search_term)) |
             (Contact.display_name.ilike(search_term)) |
@@ -62,88 +107,170 @@ async def list_contacts(
         # Default sorting
         query = query.order_by(Contact.last_name.asc(), Contact.first_name.asc())
     
-    # Eager load sales_rep relationship
-    contacts = query.options(
-        joinedload(Contact.sales_rep)
-    ).all()
-    
-    result = []
-    for contact in contacts:
-        # Get sales rep name if assigned
-        sales_rep_name = None
-        if contact.sales_rep_id and contact.sales_rep:
-            sales_rep_name = f"{contact.sales_rep.first_name} {contact.sales_rep.last_name}".strip()
-        
-        # Build address string
-        address_parts = []
-        if contact.address_line_1:
-            address_parts.append(contact.address_line_1)
-        if contact.address_line_2:
-            address_parts.append(contact.address_line_2)
-        if contact.city:
-            address_parts.append(contact.city)
-        if contact.state:
-            address_parts.append(contact.state)
-        if contact.postal_code:
-            address_parts.append(contact.postal_code)
-        
-        address_info = ", ".join(address_parts) if address_parts else None
-        
-        # Add phone to address info if available
-        if address_info and contact.main_phone:
-            address_info += f" P: {contact.main_phone}"
-        elif address_info and contact.mobile_phone:
-            address_info += f" M: {contact.mobile_phone}"
-        elif not address_info and contact.main_phone:
-            address_info = f"P: {contact.main_phone}"
-        elif not address_info and contact.mobile_phone:
-            address_info = f"M: {contact.mobile_phone}"
-        
-        contact_dict = {
-            "id": contact.id,
-            "first_name": contact.first_name,
-            "last_name": contact.last_name,
-            "display_name": contact.display_name,
-            "email": contact.email,
-            "main_phone": contact.main_phone,
-            "mobile_phone": contact.mobile_phone,
-            "company": contact.company,
-            "contact_type": contact.contact_type,
-            "status": contact.status,
-            "sales_rep_id": contact.sales_rep_id,
-            "sales_rep_name": sales_rep_name,
-            "address_line_1": contact.address_line_1,
-            "address_line_2": contact.address_line_2,
-            "city": contact.city,
-            "state": contact.state,
-            "postal_code": contact.postal_code,
-            "address_info": address_info,
-            "full_name": contact.full_name
+    # Plain row tuples (sales rep name joined in) serialized straight to JSON
+    return json_response(projection.fetch(db, query))
+
+@router.get("/assigned-to-me", response_model=List[ContactSummary])
+async def list_contacts_assigned_to_me(
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List contacts the current user is assigned to"""
+    projection = sparse(CONTACT_SUMMARY, fields)
+    query = (
+        contact_summary_select(projection)
+        .join(contact_assignees, contact_assignees.c.contact_id == Contact.id)
+        .where(contact_assignees.c.user_id == current_user.id)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+    )
+    return json_response(projection.fetch(db, query))
+
+@router.get("/facets", response_model=ContactFacets)
+async def get_contact_facet_counts(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Contact counts per tag, status, type, lead source and sales rep for the sidebar filters"""
+    return json_response(get_contact_facets(db, current_user.id))
+
+@router.get("/lookup", response_model=List[ContactSummary])
+async def lookup_contacts(
+    q: str = Query(..., min_length=3, max_length=100),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Find contacts by phone number, policy number or claim number in any format"""
+    projection = sparse(CONTACT_SUMMARY, fields)
+    condition = lookup_condition(q)
+    if condition is None:
+        return json_response([])
+    
+    query = (
+        contact_summary_select(projection)
+        .where(Contact.created_by_id == current_user.id, condition)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+    )
+    return json_response(projection.fetch(db, query))
+
+@router.get("/duplicates", response_model=List[DuplicateCandidateResponse])
+async def list_duplicate_candidates(
+    min_score: float = Query(0.0, ge=0, le=1),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Open duplicate candidates from the latest scan, most likely first"""
+    candidates = (
+        db.query(ContactDuplicateCandidate)
+        .filter(
+            ContactDuplicateCandidate.owner_id == current_user.id,
+            ContactDuplicateCandidate.status == CANDIDATE_OPEN,
+            ContactDuplicateCandidate.score >= min_score
+        )
+        .order_by(ContactDuplicateCandidate.score.desc(), ContactDuplicateCandidate.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    contact_ids = {contact_id for c in candidates for contact_id in (c.contact_id, c.duplicate_id)}
+    summaries = {
+        summary["id"]: summary
+        for summary in CONTACT_SUMMARY.fetch(db, contact_summary_select().where(Contact.id.in_(contact_ids)))
+    } if contact_ids else {}
+    
+    return json_response([
+        {
+            "id": c.id,
+            "score": c.score,
+            "reasons": c.reasons or [],
+            "status": c.status,
+            "contact": summaries[c.contact_id],
+            "duplicate": summaries[c.duplicate_id],
+            "created_at": c.created_at,
         }
-        result.append(contact_dict)
+        for c in candidates
+    ])
+
+@router.post("/duplicates/scan", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def scan_duplicate_contacts(
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a duplicate scan of the current user's contacts; poll /api/v1/jobs/{job_id}"""
+    try:
+        job_id = enqueue(
+            scan_contact_duplicates,
+            args=(current_user.id,),
+            owner_id=current_user.id,
+            # One scan per user at a time: repeat clicks return the running job
+            idempotency_key=str(current_user.id)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not queue duplicate scan: {str(e)}"
+        )
+    
+    return JobAccepted(job_id=job_id, status="queued")
+
+@router.post("/duplicates/{candidate_id}/dismiss")
+async def dismiss_duplicate_candidate(
+    candidate_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark a candidate pair as not duplicates so later scans don't suggest it again"""
+    candidate = db.query(ContactDuplicateCandidate).filter(
+        ContactDuplicateCandidate.id == candidate_id,
+        ContactDuplicateCandidate.owner_id == current_user.id
+    ).first()
     
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Duplicate candidate not found or access denied"
+        )
+    
+    candidate.status = CANDIDATE_DISMISSED
+    db.commit()
+    return {"message": "Duplicate candidate dismissed"}
+
+@router.post("/merge", response_model=ContactMergeResponse)
+async def merge_duplicate_contacts(
+    merge_data: ContactMergeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Merge duplicate contacts into a primary contact and delete the duplicates"""
+    try:
+        result = merge_contacts(db, current_user.id, merge_data.primary_id, merge_data.duplicate_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    invalidate_contact_facets(current_user.id)
     return result
 
 @router.post("/", response_model=ContactResponse)
 async def create_contact(
     contact_data: ContactCreate,
+    on_duplicate: str = Query(ON_DUPLICATE_ERROR, pattern="^(error|skip|update)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new contact"""
-    # Check if contact with same email already exists for this user
-    if contact_data.email:
-        existing_contact = db.query(Contact).filter(
-            Contact.email == contact_data.email,
-            Contact.created_by_id == current_user.id
-        ).first()
-        
-        if existing_contact:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A contact with this email already exists"
-            )
-    
+    """Create a new contact.
+
+    on_duplicate decides what happens when the user already has a contact with
+    this email: error (400), skip (return the existing contact unchanged) or
+    update (fill the existing contact with the submitted fields).
+    """
     # Validate sales_rep_id if provided
     if contact_data.sales_rep_id:
         sales_rep = db.query(User).get(contact_data.sales_rep_id)
@@ -154,50 +281,65 @@ async def create_contact(
             )
     
     # Create contact with all fields
-    contact = Contact(
-        first_name=contact_data.first_name,
-        last_name=contact_data.last_name,
-        display_name=contact_data.display_name,
-        company=contact_data.company,
-        email=contact_data.email,
-        website=contact_data.website,
-        main_phone=contact_data.main_phone,
-        mobile_phone=contact_data.mobile_phone,
-        address_line_1=contact_data.address_line_1,
-        address_line_2=contact_data.address_line_2,
-        city=contact_data.city,
-        state=contact_data.state,
-        postal_code=contact_data.postal_code,
-        contact_type=contact_data.contact_type,
-        status=contact_data.status,
-        sales_rep_id=contact_data.sales_rep_id,
-        lead_source=contact_data.lead_source,
-        assigned_to_ids=contact_data.assigned_to_ids or [],
-        subcontractor_ids=contact_data.subcontractor_ids or [],
-        related_contact_ids=contact_data.related_contact_ids or [],
-        description=contact_data.description,
-        notes=contact_data.notes,
-        tags=contact_data.tags or [],
-        customer_type=contact_data.customer_type,
-        texting_opt_out=contact_data.texting_opt_out or False,
-        date_of_loss=contact_data.date_of_loss,
-        roof_type=contact_data.roof_type,
-        insurance_carrier=contact_data.insurance_carrier,
-        date_of_filing=contact_data.date_of_filing,
-        due_time=contact_data.due_time,
-        code_upgrade=contact_data.code_upgrade,
-        policy_number=contact_data.policy_number,
-        claim_number=contact_data.claim_number,
-        deductible=contact_data.deductible,
-        desk_adjuster_name=contact_data.desk_adjuster_name,
-        desk_adjuster_phone=contact_data.desk_adjuster_phone,
-        custom_fields=contact_data.custom_fields,
-        created_by_id=current_user.id
-    )
+    values = {
+        "first_name": contact_data.first_name,
+        "last_name": contact_data.last_name,
+        "display_name": contact_data.display_name,
+        "company": contact_data.company,
+        "email": contact_data.email,
+        "website": contact_data.website,
+        "main_phone": contact_data.main_phone,
+        "mobile_phone": contact_data.mobile_phone,
+        "address_line_1": contact_data.address_line_1,
+        "address_line_2": contact_data.address_line_2,
+        "city": contact_data.city,
+        "state": contact_data.state,
+        "postal_code": contact_data.postal_code,
+        "contact_type": contact_data.contact_type,
+        "status": contact_data.status,
+        "sales_rep_id": contact_data.sales_rep_id,
+        "lead_source": contact_data.lead_source,
+        "assigned_to_ids": contact_data.assigned_to_ids or [],
+        "subcontractor_ids": contact_data.subcontractor_ids or [],
+        "related_contact_ids": contact_data.related_contact_ids or [],
+        "description": contact_data.description,
+        "notes": contact_data.notes,
+        "tags": contact_data.tags or [],
+        "customer_type": contact_data.customer_type,
+        "texting_opt_out": contact_data.texting_opt_out or False,
+        "date_of_loss": contact_data.date_of_loss,
+        "roof_type": contact_data.roof_type,
+        "insurance_carrier": contact_data.insurance_carrier,
+        "date_of_filing": contact_data.date_of_filing,
+        "due_time": contact_data.due_time,
+        "code_upgrade": contact_data.code_upgrade,
+        "policy_number": contact_data.policy_number,
+        "claim_number": contact_data.claim_number,
+        "deductible": contact_data.deductible,
+        "desk_adjuster_name": contact_data.desk_adjuster_name,
+        "desk_adjuster_phone": contact_data.desk_adjuster_phone,
+        "custom_fields": contact_data.custom_fields,
+        "created_by_id": current_user.id
+    }
     
-    db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    # The per-owner email unique index decides duplicates atomically
+    [(contact_id, action)] = upsert_contacts(
+        db, [values], on_duplicate, update_columns=contact_data.dict(exclude_unset=True)
+    )
+    if action == DUPLICATE:
+        db.rollback()
+        if on_duplicate == ON_DUPLICATE_ERROR:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A contact with this email already exists"
+            )
+        contact = find_by_email(db, current_user.id, contact_data.email)
+    else:
+        contact = db.query(Contact).options(*contact_detail_options()).filter(Contact.id == contact_id).one()
+        sync_contact_edges(db, contact)
+        db.commit()
+        invalidate_contact_facets(current_user.id)
+        refresh_contact(db, contact)
     
     # Build response with all fields
     return ContactResponse(
@@ -252,7 +394,7 @@ async def get_contact(
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific contact by ID"""
-    contact = db.query(Contact).filter(
+    contact = db.query(Contact).options(*contact_detail_options()).filter(
         Contact.id == contact_id,
         Contact.created_by_id == current_user.id
     ).first()
@@ -309,6 +451,77 @@ async def get_contact(
         full_name=contact.full_name
     )
 
+@router.get("/{contact_id}/detail", response_model=ContactDetailResponse)
+async def get_contact_detail(
+    contact_id: int,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a contact with its activities, documents, tasks and board placements in one request.
+    
+    include: comma-separated sections (activities, documents, tasks, board_cards); defaults to all.
+    Tab counts are always returned.
+    """
+    try:
+        sections = parse_include(include)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    detail = ContactDetailService(db).get_detail(contact_id, current_user.id, sections)
+    if not detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    return detail
+
+def _referencing_contacts(db: Session, contact_id: int, user_id: int, edges, target_column: str, fields: Optional[str]):
+    """Contacts of the user whose edge table rows point at contact_id"""
+    contact_exists = db.query(Contact.id).filter(
+        Contact.id == contact_id,
+        Contact.created_by_id == user_id
+    ).first()
+    
+    if not contact_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    projection = sparse(CONTACT_SUMMARY, fields)
+    query = (
+        contact_summary_select(projection)
+        .join(edges, edges.c.contact_id == Contact.id)
+        .where(edges.c[target_column] == contact_id, Contact.created_by_id == user_id)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+    )
+    return json_response(projection.fetch(db, query))
+
+@router.get("/{contact_id}/subcontracted-on", response_model=List[ContactSummary])
+async def list_subcontracted_on(
+    contact_id: int,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List contacts (claims/jobs) that have this contact as a subcontractor"""
+    return _referencing_contacts(db, contact_id, current_user.id, contact_subcontractors, "subcontractor_id", fields)
+
+@router.get("/{contact_id}/related-by", response_model=List[ContactSummary])
+async def list_related_by(
+    contact_id: int,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List contacts that list this contact as related"""
+    return _referencing_contacts(db, contact_id, current_user.id, contact_relations, "related_contact_id", fields)
+
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     contact_id: int,
@@ -317,7 +530,7 @@ async def update_contact(
     current_user: User = Depends(get_current_user)
 ):
     """Update a contact"""
-    contact = db.query(Contact).filter(
+    contact = db.query(Contact).options(*contact_detail_options()).filter(
         Contact.id == contact_id,
         Contact.created_by_id == current_user.id
     ).first()
@@ -328,20 +541,6 @@ async def update_contact(
             detail="Contact not found or access denied"
         )
     
-    # Check if new email conflicts with existing contacts
-    if contact_data.email and contact_data.email != contact.email:
-        existing_contact = db.query(Contact).filter(
-            Contact.email == contact_data.email,
-            Contact.created_by_id == current_user.id,
-            Contact.id != contact_id
-        ).first()
-        
-        if existing_contact:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A contact with this email already exists"
-            )
-    
     # Validate sales_rep_id if provided
     if contact_data.sales_rep_id is not None:
         sales_rep = db.query(User).get(contact_data.sales_rep_id)
@@ -356,8 +555,22 @@ async def update_contact(
     for field, value in update_data.items():
         setattr(contact, field, value)
     
+    # An email taken by another of the user's contacts trips uq_contacts_owner_email
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A contact with this email already exists"
+        )
+    
+    if any(field in update_data for field in EDGE_FIELDS):
+        sync_contact_edges(db, contact)
+    
     db.commit()
-    db.refresh(contact)
+    invalidate_contact_facets(current_user.id)
+    refresh_contact(db, contact)
     
     # Build response with all fields
     return ContactResponse(
@@ -413,7 +626,7 @@ async def duplicate_contact(
 ):
     """Duplicate a contact"""
     # Get the original contact
-    original_contact = db.query(Contact).filter(
+    original_contact = db.query(Contact).options(*contact_detail_options()).filter(
         Contact.id == contact_id,
         Contact.created_by_id == current_user.id
     ).first()
@@ -467,8 +680,11 @@ async def duplicate_contact(
     )
     
     db.add(new_contact)
+    db.flush()
+    sync_contact_edges(db, new_contact)
     db.commit()
-    db.refresh(new_contact)
+    invalidate_contact_facets(current_user.id)
+    refresh_contact(db, new_contact)
     
     # Build response
     return ContactResponse(
@@ -538,7 +754,13 @@ async def delete_contact(
     try:
         from sqlalchemy import delete as sql_delete
         
-        # 1. Delete all documents associated with this contact (and their files)
+        # Tombstones for the sync feed, while the dependent rows can still be found
+        record_contact_deletions(db, [contact_id])
+        
+        # 1. Delete assignment/subcontractor/relation/tag/mention edges (before the activities go)
+        delete_contact_edges(db, contact_id)
+        
+        # 2. Delete all documents associated with this contact (and their files)
         documents = db.query(Document).filter(Document.contact_id == contact_id).all()
         for document in documents:
             # Delete file from filesystem
@@ -553,17 +775,17 @@ async def delete_contact(
             sql_delete(Document).where(Document.contact_id == contact_id)
         )
         
-        # 2. Delete all activities associated with this contact
+        # 3. Delete all activities associated with this contact
         db.execute(
             sql_delete(Activity).where(Activity.contact_id == contact_id)
         )
         
-        # 3. Delete all board cards associated with this contact
+        # 4. Delete all board cards associated with this contact
         db.execute(
             sql_delete(BoardCard).where(BoardCard.contact_id == contact_id)
         )
         
-        # 4. Delete task-contact associations (many-to-many relationship)
+        # 5. Delete task-contact associations (many-to-many relationship)
         db.execute(
             sql_delete(task_contact_association).where(
                 task_contact_association.c.contact_id == contact_id
@@ -573,12 +795,13 @@ async def delete_contact(
         # Flush to ensure all related records are deleted
         db.flush()
         
-        # 5. Now delete the contact itself
+        # 6. Now delete the contact itself
         db.execute(
             sql_delete(Contact).where(Contact.id == contact_id)
         )
         
         db.commit()
+        invalidate_contact_facets(current_user.id)
         
         return {"message": "Contact deleted successfully"}
     except Exception as e:
@@ -594,28 +817,56 @@ async def delete_contact(
             detail=f"Failed to delete contact: {str(e)}"
         )
 
-class ImportResult(BaseModel):
-    """Result of importing a single contact"""
-    row_number: int
-    success: bool
-    contact_id: Optional[int] = None
-    display_name: Optional[str] = None
-    error: Optional[str] = None
-
-class ImportResponse(BaseModel):
-    """Response for CSV import"""
-    total_rows: int
-    successful: int
-    failed: int
-    results: List[ImportResult]
-
 @router.post("/import", response_model=ImportResponse)
 async def import_contacts(
     file: UploadFile = File(...),
+    on_duplicate: str = Query(ON_DUPLICATE_ERROR, pattern="^(error|skip|update)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Import contacts from a CSV file"""
+    """Import contacts from a CSV file (on_duplicate: error, skip or update rows whose email exists)"""
+    content_str = await _read_import_csv(file)
+    
+    try:
+        return import_contacts_csv(db, content_str, current_user.id, on_duplicate)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save imported contacts: {str(e)}"
+        )
+
+@router.post("/import/async", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def import_contacts_async(
+    file: UploadFile = File(...),
+    on_duplicate: str = Query(ON_DUPLICATE_ERROR, pattern="^(error|skip|update)$"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a CSV contact import; poll /api/v1/jobs/{job_id} for the result"""
+    content_str = await _read_import_csv(file)
+    
+    # Stage the file on the shared uploads volume instead of pushing it through the broker
+    IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+    staged_path = IMPORT_DIR / f"{uuid.uuid4()}.csv"
+    staged_path.write_text(content_str, encoding="utf-8")
+    
+    try:
+        job_id = enqueue(
+            import_contacts_task,
+            args=(str(staged_path), current_user.id, on_duplicate),
+            owner_id=current_user.id,
+            idempotency_key=f"{current_user.id}:{idempotency_key}" if idempotency_key else None
+        )
+    except Exception as e:
+        staged_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not queue import: {str(e)}"
+        )
+    
+    return JobAccepted(job_id=job_id, status="queued")
+
+async def _read_import_csv(file: UploadFile) -> str:
     # Validate file type
     if not file.filename.endswith('.csv'):
         raise HTTPException(
@@ -627,176 +878,10 @@ async def import_contacts(
     try:
         contents = await file.read()
         # Decode CSV content
-        content_str = contents.decode('utf-8-sig')  # Handle BOM if present
-        csv_reader = csv.DictReader(io.StringIO(content_str))
+        return contents.decode('utf-8-sig')  # Handle BOM if present
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to read CSV file: {str(e)}"
         )
-    
-    # Column mapping - map common CSV column names to our fields
-    column_mapping = {
-        # Name fields
-        'first_name': ['first_name', 'first name', 'firstname', 'fname'],
-        'last_name': ['last_name', 'last name', 'lastname', 'lname'],
-        'display_name': ['display_name', 'display name', 'full_name', 'full name', 'name'],
-        # Contact info
-        'email': ['email', 'e-mail', 'email address'],
-        'company': ['company', 'organization', 'org'],
-        'website': ['website', 'url', 'web'],
-        # Phone
-        'main_phone': ['phone', 'main_phone', 'main phone', 'telephone', 'tel', 'primary phone'],
-        'mobile_phone': ['mobile', 'mobile_phone', 'mobile phone', 'cell', 'cell phone'],
-        # Address
-        'address_line_1': ['address', 'address_line_1', 'address line 1', 'street', 'street address'],
-        'address_line_2': ['address_line_2', 'address line 2', 'address2', 'suite', 'apt'],
-        'city': ['city'],
-        'state': ['state', 'province'],
-        'postal_code': ['postal_code', 'postal code', 'zip', 'zipcode', 'zip code'],
-        # Other fields
-        'contact_type': ['type', 'contact_type', 'contact type'],
-        'status': ['status'],
-        'notes': ['notes', 'note', 'description', 'comments'],
-        'tags': ['tags', 'tag'],
-    }
-    
-    # Normalize column names (lowercase, strip spaces)
-    def normalize_column_name(col_name: str) -> str:
-        return col_name.lower().strip()
-    
-    # Find mapping for a column name
-    def find_field_for_column(col_name: str) -> Optional[str]:
-        normalized = normalize_column_name(col_name)
-        for field, possible_names in column_mapping.items():
-            if normalized in [normalize_column_name(n) for n in possible_names]:
-                return field
-        return None
-    
-    results: List[ImportResult] = []
-    successful = 0
-    failed = 0
-    row_number = 0
-    
-    # Process each row
-    for row in csv_reader:
-        row_number += 1
-        try:
-            # Map CSV columns to contact fields
-            contact_data = {}
-            
-            for csv_col, value in row.items():
-                if not value or value.strip() == '':
-                    continue
-                
-                field = find_field_for_column(csv_col)
-                if field:
-                    # Handle special cases
-                    if field == 'tags' and value:
-                        # Split tags by comma
-                        contact_data[field] = [tag.strip() for tag in value.split(',') if tag.strip()]
-                    else:
-                        contact_data[field] = value.strip()
-            
-            # Validate required fields
-            if not contact_data.get('display_name'):
-                # Try to construct from first/last name
-                first_name = contact_data.get('first_name', '').strip()
-                last_name = contact_data.get('last_name', '').strip()
-                if first_name or last_name:
-                    contact_data['display_name'] = f"{first_name} {last_name}".strip()
-                else:
-                    raise ValueError("Display name is required (or provide first_name and last_name)")
-            
-            # Ensure first_name and last_name exist
-            if not contact_data.get('first_name'):
-                # Try to split display_name
-                display_name = contact_data.get('display_name', '')
-                parts = display_name.split(' ', 1)
-                contact_data['first_name'] = parts[0] if parts else ''
-                contact_data['last_name'] = parts[1] if len(parts) > 1 else ''
-            elif not contact_data.get('last_name'):
-                contact_data['last_name'] = ''
-            
-            # Create contact using ContactCreate schema for validation
-            try:
-                contact_create = ContactCreate(**contact_data)
-            except ValidationError as e:
-                errors = ', '.join([f"{err['loc'][0]}: {err['msg']}" for err in e.errors()])
-                raise ValueError(f"Validation error: {errors}")
-            
-            # Check for duplicate email (optional - we'll skip if exists)
-            if contact_create.email:
-                existing = db.query(Contact).filter(
-                    Contact.email == contact_create.email,
-                    Contact.created_by_id == current_user.id
-                ).first()
-                if existing:
-                    results.append(ImportResult(
-                        row_number=row_number,
-                        success=False,
-                        display_name=contact_data.get('display_name'),
-                        error=f"Contact with email {contact_create.email} already exists"
-                    ))
-                    failed += 1
-                    continue
-            
-            # Create contact
-            contact = Contact(
-                first_name=contact_create.first_name,
-                last_name=contact_create.last_name,
-                display_name=contact_create.display_name,
-                company=contact_create.company,
-                email=contact_create.email,
-                website=contact_create.website,
-                main_phone=contact_create.main_phone,
-                mobile_phone=contact_create.mobile_phone,
-                address_line_1=contact_create.address_line_1,
-                address_line_2=contact_create.address_line_2,
-                city=contact_create.city,
-                state=contact_create.state,
-                postal_code=contact_create.postal_code,
-                contact_type=contact_create.contact_type,
-                status=contact_create.status,
-                notes=contact_create.notes,
-                tags=contact_create.tags or [],
-                created_by_id=current_user.id
-            )
-            
-            db.add(contact)
-            db.flush()  # Get the ID without committing
-            
-            results.append(ImportResult(
-                row_number=row_number,
-                success=True,
-                contact_id=contact.id,
-                display_name=contact.display_name
-            ))
-            successful += 1
-            
-        except Exception as e:
-            results.append(ImportResult(
-                row_number=row_number,
-                success=False,
-                display_name=row.get('display_name') or row.get('name') or f"Row {row_number}",
-                error=str(e)
-            ))
-            failed += 1
-    
-    # Commit all successful imports
-    try:
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save imported contacts: {str(e)}"
-        )
-    
-    return ImportResponse(
-        total_rows=row_number,
-        successful=successful,
-        failed=failed,
-        results=results
-    )
 
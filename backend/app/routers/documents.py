@@ -1,12 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Response
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Response, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import os
 import uuid
+import hashlib
+import json
+import math
 from pathlib import Path
-import fitz  # PyMuPDF
-import io
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models import Document, DocumentCategory, Contact, User
@@ -17,9 +18,24 @@ from app.schemas.document_schemas import (
     DocumentCategoryResponse,
     DocumentResponse,
     DocumentSummary,
-    DocumentUpdate
+    DocumentUpdate,
+    DocumentSearchResult,
+    MultipartUploadCreate,
+    MultipartUploadResponse,
+    MultipartUploadPart,
+    MultipartUploadComplete
 )
+from app.core.cache import cached, invalidate
 from app.core.config import settings
+from app.core.file_responses import content_disposition, file_response, hash_file
+from app.core.redis_client import get_redis
+from app.core.storage import get_storage
+from app.schemas.job_schemas import JobAccepted
+from app.services import document_archive, document_processing, document_search, image_renditions
+from app.services.delta_sync import record_deletions
+from app.tasks import enqueue
+from app.tasks.archives import build_document_archive
+from app.tasks.documents import extract_document_metadata, generate_document_thumbnail, generate_image_renditions
 
 router = APIRouter(tags=["documents"])
 
@@ -28,6 +44,7 @@ UPLOAD_DIR = Path(settings.UPLOAD_DIR).resolve()
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.get("/categories", response_model=List[DocumentCategoryResponse])
+@cached("document_categories", tags=("document_categories",))
 async def list_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -71,6 +88,7 @@ async def create_category(
     
     db.add(category)
     db.commit()
+    invalidate("document_categories")
     db.refresh(category)
     
     return DocumentCategoryResponse(
@@ -82,6 +100,34 @@ async def create_category(
         updated_at=category.updated_at
     )
 
+@router.get("/search", response_model=List[DocumentSearchResult])
+async def search_documents(
+    q: str = Query(..., min_length=2, max_length=200),
+    contact_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search document names, descriptions and PDF text, best matches first"""
+    if not document_search.is_search_supported(db):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Document search requires PostgreSQL"
+        )
+    
+    rows = document_search.search_documents(
+        db,
+        current_user.id,
+        q,
+        contact_id=contact_id,
+        category_id=category_id,
+        limit=limit,
+        offset=offset
+    )
+    return [DocumentSearchResult.model_validate(row, from_attributes=True) for row in rows]
+
 @router.get("/contact/{contact_id}", response_model=List[DocumentSummary])
 async def list_contact_documents(
     contact_id: int,
@@ -127,6 +173,11 @@ async def list_contact_documents(
             "file_type": doc.file_type,
             "mime_type": doc.mime_type,
             "pages": doc.pages,
+            "page_width": doc.page_width,
+            "page_height": doc.page_height,
+            "text_length": doc.text_length,
+            "metadata_status": doc.metadata_status,
+            "renditions": doc.renditions,
             "category_id": doc.category_id,
             "category_name": category_name,
             "description": doc.description,
@@ -137,6 +188,130 @@ async def list_contact_documents(
     
     return result
 
+MAX_ARCHIVE_DOCUMENTS = 1000
+
+def _archive_selection(db: Session, contact_id: int, user_id: int, document_ids: Optional[List[int]], category_id: Optional[int]):
+    contact = db.query(Contact).filter(
+        Contact.id == contact_id,
+        Contact.created_by_id == user_id
+    ).first()
+    
+    if not contact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    documents, category_names = document_archive.select_archive_documents(db, contact_id, document_ids, category_id)
+    if not documents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No documents match the selection"
+        )
+    if len(documents) > MAX_ARCHIVE_DOCUMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many documents for one archive (maximum {MAX_ARCHIVE_DOCUMENTS})"
+        )
+    return contact, documents, category_names
+
+@router.get("/contact/{contact_id}/archive")
+async def download_contact_archive(
+    contact_id: int,
+    document_ids: Optional[List[int]] = Query(None),
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download a ZIP of a contact's documents (selected ids, a category, or all)"""
+    contact, documents, category_names = _archive_selection(db, contact_id, current_user.id, document_ids, category_id)
+    archive_name = f"{contact.display_name or 'contact'} documents.zip"
+    
+    # Serve a prebuilt archive for this exact document set if one exists
+    storage = get_storage()
+    cache_key = document_archive.archive_cache_key(documents, category_names)
+    if storage.exists(cache_key):
+        if storage.supports_presigned_urls:
+            return RedirectResponse(
+                storage.presigned_url(cache_key, filename=archive_name, content_type="application/zip"),
+                status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+                headers={"Cache-Control": "no-store"}
+            )
+        return FileResponse(path=str(storage.local_path(cache_key)), filename=archive_name, media_type="application/zip")
+    
+    # Otherwise build it on the fly while streaming
+    return StreamingResponse(
+        document_archive.iter_zip(document_archive.archive_entries(documents, category_names)),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition("attachment", archive_name)}
+    )
+
+@router.post("/contact/{contact_id}/archive/prebuild", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def prebuild_contact_archive(
+    contact_id: int,
+    document_ids: Optional[List[int]] = Query(None),
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Build a large archive in the background; the archive endpoint serves it once ready"""
+    _, documents, category_names = _archive_selection(db, contact_id, current_user.id, document_ids, category_id)
+    cache_key = document_archive.archive_cache_key(documents, category_names)
+    
+    try:
+        job_id = enqueue(
+            build_document_archive,
+            args=(contact_id, [d.id for d in documents], None),
+            owner_id=current_user.id,
+            idempotency_key=cache_key
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not queue archive build: {str(e)}"
+        )
+    
+    return JobAccepted(job_id=job_id, status="queued")
+
+def _stored_file_path(storage, key: str) -> str:
+    """Value for Document.file_path: the absolute path for local files, otherwise the key"""
+    local_path = storage.local_path(key)
+    return str(local_path) if local_path else key
+
+def _after_document_saved(db: Session, document: Document, user_id: int) -> None:
+    # Index filename and description now; PDF text is added once extraction finishes
+    document_search.reindex_document(db, document.id)
+    db.commit()
+    db.refresh(document)
+    
+    # Metadata extraction and thumbnail rendering run on the cpu workers, not in the request
+    if document_processing.is_pdf(document.mime_type, document.filename):
+        try:
+            enqueue(extract_document_metadata, args=(document.id,), owner_id=user_id)
+            enqueue(
+                generate_document_thumbnail,
+                args=(document.id,),
+                owner_id=user_id,
+                idempotency_key=str(document.id)
+            )
+        except Exception as e:
+            print(f"Warning: Could not queue document processing: {e}")
+    elif image_renditions.is_image(document.mime_type, document.filename):
+        try:
+            enqueue(generate_image_renditions, args=(document.id,), owner_id=user_id)
+        except Exception as e:
+            print(f"Warning: Could not queue image renditions: {e}")
+
+def _stored_file_response(storage, key: str, media_type: str, local_path: Optional[Path] = None) -> Response:
+    """Redirect to a presigned URL when the backend supports it, otherwise stream the local file"""
+    if storage.supports_presigned_urls:
+        return RedirectResponse(
+            storage.presigned_url(key, content_type=media_type),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "no-store"}
+        )
+    return FileResponse(path=str(local_path or storage.local_path(key)), media_type=media_type)
+
 @router.post("/contact/{contact_id}/upload", response_model=DocumentResponse)
 async def upload_document(
     contact_id: int,
@@ -168,49 +343,58 @@ async def upload_document(
             detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
         )
     
-    # Generate unique filename
+    # Generate unique filename (also the storage key)
     unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
+    storage = get_storage()
     
     # Save file
+    contents = await file.read()
+    if len(contents) > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+        )
     try:
-        contents = await file.read()
-        if len(contents) > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
-            )
-        
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        storage.save(unique_filename, contents, file.content_type)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
     
-    # Get file size
+    # Get file size and content hash (used as the download ETag)
     file_size = len(contents)
+    content_hash = hashlib.sha256(contents).hexdigest()
     
     # Create document record
     document = Document(
         filename=unique_filename,
         original_filename=file.filename,
-        file_path=str(file_path),
+        file_path=_stored_file_path(storage, unique_filename),
         file_size=file_size,
+        content_hash=content_hash,
+        storage_backend=storage.name,
         file_type=file_ext,
         mime_type=file.content_type,
         category_id=category_id,
         contact_id=contact_id,
         description=description,
         is_private=is_private,
+        metadata_status=(
+            document_processing.METADATA_PENDING
+            if document_processing.is_pdf(file.content_type, unique_filename)
+            else document_processing.METADATA_UNSUPPORTED
+        ),
         created_by_id=current_user.id
     )
     
     db.add(document)
     db.commit()
-    db.refresh(document)
+    _after_document_saved(db, document, current_user.id)
     
+    return _document_response(db, document)
+
+def _document_response(db: Session, document: Document) -> DocumentResponse:
     creator = db.query(User).get(document.created_by_id)
     creator_name = creator.full_name if creator and creator.full_name else creator.username if creator else None
     
@@ -228,6 +412,11 @@ async def upload_document(
         file_type=document.file_type,
         mime_type=document.mime_type,
         pages=document.pages,
+        page_width=document.page_width,
+        page_height=document.page_height,
+        text_length=document.text_length,
+        metadata_status=document.metadata_status,
+        renditions=document.renditions,
         category_id=document.category_id,
         description=document.description,
         is_private=document.is_private,
@@ -239,6 +428,183 @@ async def upload_document(
         created_by_name=creator_name
     )
 
+def _upload_session_key(upload_id: str) -> str:
+    return f"uploads:{upload_id}"
+
+def _load_upload_session(upload_id: str, user_id: int) -> dict:
+    raw = get_redis().get(_upload_session_key(upload_id))
+    session = json.loads(raw) if raw else None
+    if not session or session["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or access denied"
+        )
+    return session
+
+@router.post("/contact/{contact_id}/uploads", response_model=MultipartUploadResponse)
+async def start_multipart_upload(
+    contact_id: int,
+    upload_data: MultipartUploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start a multipart upload for a large document"""
+    contact = db.query(Contact).filter(
+        Contact.id == contact_id,
+        Contact.created_by_id == current_user.id
+    ).first()
+    
+    if not contact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found or access denied"
+        )
+    
+    file_ext = Path(upload_data.filename).suffix.lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
+        )
+    if upload_data.size > settings.MAX_MULTIPART_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {settings.MAX_MULTIPART_FILE_SIZE / 1024 / 1024}MB"
+        )
+    
+    # Storage services allow at most 10,000 parts
+    part_size = max(settings.MULTIPART_PART_SIZE, math.ceil(upload_data.size / 10000))
+    part_count = math.ceil(upload_data.size / part_size)
+    
+    storage = get_storage()
+    key = f"{uuid.uuid4()}{file_ext}"
+    storage_upload_id = storage.create_multipart_upload(key, upload_data.content_type)
+    upload_id = uuid.uuid4().hex
+    
+    session = {
+        "user_id": current_user.id,
+        "contact_id": contact_id,
+        "key": key,
+        "backend": storage.name,
+        "storage_upload_id": storage_upload_id,
+        "filename": upload_data.filename,
+        "content_type": upload_data.content_type,
+        "size": upload_data.size,
+        "category_id": upload_data.category_id,
+        "description": upload_data.description,
+        "is_private": upload_data.is_private,
+    }
+    get_redis().set(_upload_session_key(upload_id), json.dumps(session), ex=settings.JOB_TTL_SECONDS)
+    
+    part_urls = None
+    if storage.supports_presigned_urls:
+        part_urls = [
+            storage.presigned_part_url(key, storage_upload_id, part_number)
+            for part_number in range(1, part_count + 1)
+        ]
+    
+    return MultipartUploadResponse(
+        upload_id=upload_id,
+        part_size=part_size,
+        part_count=part_count,
+        part_urls=part_urls
+    )
+
+@router.put("/uploads/{upload_id}/parts/{part_number}", response_model=MultipartUploadPart)
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Upload one part of a multipart upload through the API (raw request body)"""
+    session = _load_upload_session(upload_id, current_user.id)
+    if part_number < 1 or part_number > 10000:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid part number")
+    
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty part")
+    
+    storage = get_storage(session["backend"])
+    etag = storage.upload_part(session["key"], session["storage_upload_id"], part_number, data)
+    return MultipartUploadPart(part_number=part_number, etag=etag)
+
+@router.post("/uploads/{upload_id}/complete", response_model=DocumentResponse)
+async def complete_multipart_upload(
+    upload_id: str,
+    complete_data: MultipartUploadComplete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Assemble the uploaded parts and create the document"""
+    session = _load_upload_session(upload_id, current_user.id)
+    storage = get_storage(session["backend"])
+    key = session["key"]
+    
+    try:
+        storage.complete_multipart_upload(
+            key,
+            session["storage_upload_id"],
+            [part.dict() for part in complete_data.parts]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to complete upload: {str(e)}"
+        )
+    get_redis().delete(_upload_session_key(upload_id))
+    
+    file_size = storage.size(key)
+    if file_size != session["size"]:
+        storage.delete(key)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Uploaded size {file_size} does not match declared size {session['size']}"
+        )
+    
+    document = Document(
+        filename=key,
+        original_filename=session["filename"],
+        file_path=_stored_file_path(storage, key),
+        file_size=file_size,
+        storage_backend=storage.name,
+        file_type=Path(key).suffix,
+        mime_type=session["content_type"],
+        category_id=session["category_id"],
+        contact_id=session["contact_id"],
+        description=session["description"],
+        is_private=session["is_private"],
+        metadata_status=(
+            document_processing.METADATA_PENDING
+            if document_processing.is_pdf(session["content_type"], key)
+            else document_processing.METADATA_UNSUPPORTED
+        ),
+        created_by_id=current_user.id
+    )
+    
+    db.add(document)
+    db.commit()
+    _after_document_saved(db, document, current_user.id)
+    
+    return _document_response(db, document)
+
+@router.delete("/uploads/{upload_id}")
+async def abort_multipart_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Abort a multipart upload and discard its parts"""
+    session = _load_upload_session(upload_id, current_user.id)
+    storage = get_storage(session["backend"])
+    try:
+        storage.abort_multipart_upload(session["key"], session["storage_upload_id"])
+    except Exception as e:
+        print(f"Warning: Failed to abort upload: {e}")
+    get_redis().delete(_upload_session_key(upload_id))
+    
+    return {"message": "Upload aborted"}
+
 @router.put("/{document_id}", response_model=DocumentResponse)
 async def update_document(
     document_id: int,
@@ -267,36 +633,23 @@ async def update_document(
     if document_data.is_private is not None:
         document.is_private = document_data.is_private
     
+    db.flush()
+    if document_data.description is not None:
+        document_search.reindex_document(db, document.id)
     db.commit()
     db.refresh(document)
     
-    creator = db.query(User).get(document.created_by_id)
-    creator_name = creator.full_name if creator and creator.full_name else creator.username if creator else None
-    
-    category_name = None
-    if document.category_id:
-        category = db.query(DocumentCategory).get(document.category_id)
-        category_name = category.name if category else None
-    
-    return DocumentResponse(
-        id=document.id,
-        filename=document.filename,
-        original_filename=document.original_filename,
-        file_path=document.file_path,
-        file_size=document.file_size,
-        file_type=document.file_type,
-        mime_type=document.mime_type,
-        pages=document.pages,
-        category_id=document.category_id,
-        description=document.description,
-        is_private=document.is_private,
-        contact_id=document.contact_id,
-        created_by_id=document.created_by_id,
-        created_at=document.created_at,
-        updated_at=document.updated_at,
-        category_name=category_name,
-        created_by_name=creator_name
-    )
+    return _document_response(db, document)
+
+def _render_pdf_thumbnail(document: Document, storage, key: str) -> Optional[bytes]:
+    """Render and cache a PDF's thumbnail; None for an empty PDF"""
+    with document_processing.document_local_file(document) as file_path:
+        if not file_path:
+            raise HTTPException(status_code=404, detail="File not found on server")
+        img_data = document_processing.render_pdf_thumbnail(file_path)
+    if img_data:
+        storage.save(key, img_data, "image/png")
+    return img_data
 
 @router.get("/{document_id}/thumbnail")
 async def get_document_thumbnail(
@@ -315,49 +668,108 @@ async def get_document_thumbnail(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found or access denied")
     
-    # Robust path resolution: ignore stored directory, use configured UPLOAD_DIR + filename
-    file_path = UPLOAD_DIR / Path(document.file_path).name
+    storage = document_processing.document_storage(document)
     
-    if not file_path.exists():
-        # Try fallback path
-        fallback_path = Path(document.file_path)
-        if fallback_path.exists():
-            file_path = fallback_path
-        else:
-            raise HTTPException(status_code=404, detail=f"File not found on server: {file_path}")
+    # If it's a PDF, serve the cached thumbnail (rendered by a worker after upload), or render it now
+    if document_processing.is_pdf(document.mime_type, document.filename):
+        key = document_processing.thumbnail_key(document.id)
+        if storage.exists(key):
+            return _stored_file_response(storage, key, "image/png")
         
-    # If it's a PDF, generate thumbnail
-    if document.mime_type == 'application/pdf' or str(file_path).lower().endswith('.pdf'):
         try:
-            doc = fitz.open(str(file_path))
-            if doc.page_count > 0:
-                page = doc.load_page(0)
-                # Render page to an image (pixmap) - 0.3 scale for thumbnail
-                pix = page.get_pixmap(matrix=fitz.Matrix(0.3, 0.3), alpha=False)
-                img_data = pix.tobytes("png")
-                doc.close()
-                return Response(content=img_data, media_type="image/png")
+            img_data = await run_in_threadpool(_render_pdf_thumbnail, document, storage, key)
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error generating PDF thumbnail: {e}")
             import traceback
             traceback.print_exc()
             # Fallback: return 404 so frontend shows default icon
             raise HTTPException(status_code=404, detail=f"Could not generate thumbnail: {str(e)}")
+        if not img_data:
+            raise HTTPException(status_code=404, detail="Thumbnail not available for this document")
+        return Response(content=img_data, media_type="image/png")
 
-    # If it's an image, return the image itself
+    # If it's an image, return its thumbnail rendition, or the image itself until renditions exist
     if document.mime_type and document.mime_type.startswith('image/'):
-        return FileResponse(path=str(file_path), media_type=document.mime_type)
+        if image_renditions.pick_rendition(document.renditions, name="thumbnail"):
+            return _stored_file_response(storage, image_renditions.rendition_key(document.id, "thumbnail"), "image/jpeg")
+        local_path = None
+        if not storage.supports_presigned_urls:
+            local_path = document_processing.resolve_document_path(document.file_path)
+            if not local_path:
+                raise HTTPException(status_code=404, detail=f"File not found on server: {UPLOAD_DIR / Path(document.file_path).name}")
+        return _stored_file_response(storage, document_processing.document_key(document), document.mime_type, local_path)
         
     # For other types, return 404 (frontend will show default icon)
     raise HTTPException(status_code=404, detail="Thumbnail not available for this file type")
 
-@router.get("/{document_id}/download")
+def _serve_document(request: Request, db: Session, document: Document, disposition: str) -> Response:
+    storage = document_processing.document_storage(document)
+    media_type = document.mime_type or "application/octet-stream"
+    
+    # Object stores serve the bytes (with their own Range/ETag handling) via a short-lived URL
+    if storage.supports_presigned_urls:
+        url = storage.presigned_url(
+            document_processing.document_key(document),
+            filename=document.original_filename,
+            disposition=disposition,
+            content_type=media_type
+        )
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers={"Cache-Control": "no-store"})
+    
+    file_path = document_processing.resolve_document_path(document.file_path)
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found on server: {UPLOAD_DIR / Path(document.file_path).name}"
+        )
+    
+    # Documents uploaded before hashing get their hash on first access
+    if not document.content_hash:
+        document.content_hash = hash_file(file_path)
+        db.commit()
+    
+    return file_response(
+        request,
+        file_path,
+        media_type=media_type,
+        content_hash=document.content_hash,
+        last_modified=document.created_at,
+        filename=document.original_filename,
+        disposition=disposition
+    )
+
+def _serve_rendition(request: Request, document: Document, name: str) -> Response:
+    storage = document_processing.document_storage(document)
+    key = image_renditions.rendition_key(document.id, name)
+    if storage.supports_presigned_urls:
+        return _stored_file_response(storage, key, "image/jpeg")
+    
+    path = storage.local_path(key)
+    if not path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rendition not found")
+    
+    # Renditions are immutable once written: tag them by original filename + rendition size
+    meta = document.renditions[name]
+    return file_response(
+        request,
+        path,
+        media_type="image/jpeg",
+        content_hash=f"{Path(document.filename).stem}-{name}-{meta.get('size')}",
+        last_modified=document.created_at,
+        filename=f"{Path(document.original_filename).stem}-{name}.jpg",
+        disposition="inline"
+    )
+
+@router.api_route("/{document_id}/download", methods=["GET", "HEAD"])
 async def download_document(
     document_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Download a document"""
+    """Download a document (supports Range and conditional requests)"""
     document = db.query(Document).join(Contact).filter(
         Document.id == document_id,
         Contact.created_by_id == current_user.id
@@ -369,34 +781,23 @@ async def download_document(
             detail="Document not found or access denied"
         )
     
-    # Robust path resolution
-    file_path = UPLOAD_DIR / Path(document.file_path).name
-    
-    if not file_path.exists():
-        # Try the raw stored path as a fallback
-        fallback_path = Path(document.file_path)
-        if fallback_path.exists():
-            file_path = fallback_path
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"File not found on server. Tried: {file_path} and {fallback_path}"
-            )
-    
-    return FileResponse(
-        path=str(file_path),
-        filename=document.original_filename,
-        media_type=document.mime_type or "application/octet-stream"
-    )
+    return _serve_document(request, db, document, "attachment")
 
-@router.get("/{document_id}/view")
+@router.api_route("/{document_id}/view", methods=["GET", "HEAD"])
 async def view_document(
     document_id: int,
+    request: Request,
     token: Optional[str] = None,
+    width: Optional[int] = Query(None, ge=1, le=10000),
+    rendition: Optional[str] = Query(None, pattern="^(thumbnail|preview|full)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """View a document inline (for preview)"""
+    """View a document inline (for preview; supports Range and conditional requests).
+
+    For photos, `width` picks the smallest rendition at least that wide and
+    `rendition` picks one by name; the original is served until renditions exist.
+    """
     document = db.query(Document).join(Contact).filter(
         Document.id == document_id,
         Contact.created_by_id == current_user.id
@@ -408,24 +809,11 @@ async def view_document(
             detail="Document not found or access denied"
         )
     
-    # Robust path resolution
-    file_path = UPLOAD_DIR / Path(document.file_path).name
-    
-    if not file_path.exists():
-        # Try the raw stored path as a fallback
-        if Path(document.file_path).exists():
-            file_path = Path(document.file_path)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"File not found on server: {file_path}"
-            )
+    name = image_renditions.pick_rendition(document.renditions, width=width, name=rendition)
+    if name:
+        return _serve_rendition(request, document, name)
     
-    return FileResponse(
-        path=str(file_path),
-        media_type=document.mime_type or "application/octet-stream",
-        headers={"Content-Disposition": "inline"}
-    )
+    return _serve_document(request, db, document, "inline")
 
 @router.delete("/{document_id}")
 async def delete_document(
@@ -445,13 +833,10 @@ async def delete_document(
             detail="Document not found or access denied"
         )
     
-    # Delete file from filesystem
-    try:
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
-    except Exception as e:
-        print(f"Warning: Failed to delete file: {e}")
+    # Delete file and derived files from storage
+    document_processing.delete_document_files(document)
     
+    record_deletions(db, "documents", [(document.id, current_user.id)])
     db.delete(document)
     db.commit()
     
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Depends, status
+from celery.result import AsyncResult
+
+from app.celery_app import celery_app
+from app.models import User
+from app.routers.auth import get_current_user
+from app.schemas.job_schemas import JobStatus
+from app.tasks import get_job_owner
+
+router = APIRouter(tags=["jobs"])
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Poll the state of a background job started by the current user"""
+    try:
+        owner_id = get_job_owner(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job store unavailable: {str(e)}"
+        )
+    
+    if owner_id is None or owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or access denied"
+        )
+    
+    result = AsyncResult(job_id, app=celery_app)
+    state = result.state
+    
+    return JobStatus(
+        job_id=job_id,
+        state=state,
+        ready=result.ready(),
+        result=result.result if state == "SUCCESS" else None,
+        error=str(result.result) if state == "FAILURE" else None
+    )
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from app.database import get_db
+from app.models import User
+from app.routers.auth import get_current_user
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.projection import json_response
+from app.schemas.sync_schemas import SyncPage
+from app.services.delta_sync import TOMBSTONES, start_sync, sync_page
+
+router = APIRouter(tags=["sync"])
+
+CURSOR_KEYS = {"since", "until", "stage", "changed_at", "id"}
+
+@router.get("/", response_model=SyncPage)
+async def sync(
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=2000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Contacts, tasks, activities, documents and board cards changed or deleted since the
+    watermark of the previous sync (omit since for a full sync; pass cursor for the next page)"""
+    if cursor:
+        position = decode_cursor(cursor, datetime_keys=("since", "until", "changed_at"))
+        valid = (
+            CURSOR_KEYS <= position.keys()
+            and isinstance(position["stage"], int)
+            and 0 <= position["stage"] <= TOMBSTONES
+            and position["until"] is not None
+        )
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    else:
+        position = start_sync(db, since)
+    
+    page, next_position = sync_page(db, current_user.id, position, limit)
+    page["has_more"] = next_position is not None
+    page["cursor"] = encode_cursor(next_position) if next_position else None
+    
+    return json_response(page)
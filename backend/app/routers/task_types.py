@@ -5,6 +5,7 @@ from typing import List
 from app.database import get_db
 from app.models import TaskType, User
 from app.routers.auth import get_current_user
+from app.core.cache import cached, invalidate
 from app.schemas.task_type_schemas import (
     TaskTypeCreate,
     TaskTypeUpdate,
@@ -14,6 +15,7 @@ from app.schemas.task_type_schemas import (
 router = APIRouter(tags=["task-types"])
 
 @router.get("/", response_model=List[TaskTypeResponse])
+@cached("task_types", tags=("task_types",))
 async def list_task_types(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -57,6 +59,7 @@ async def create_task_type(
     
     db.add(task_type)
     db.commit()
+    invalidate("task_types")
     db.refresh(task_type)
     
     return TaskTypeResponse(
@@ -97,6 +100,7 @@ async def update_task_type(
         task_type.description = task_type_data.description
     
     db.commit()
+    invalidate("task_types")
     db.refresh(task_type)
     
     return TaskTypeResponse(
@@ -133,6 +137,7 @@ async def delete_task_type(
     
     db.delete(task_type)
     db.commit()
+    invalidate("task_types")
     
     return {"message": "Task type deleted successfully"}
 
@@ -1,17 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, literal_column, update, case, select
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 
 from app.database import get_db
-from app.models import Task, Contact, User, Project, task_contact_association
+from app.models import Task, Contact, User, Project, TaskType, task_contact_association, task_calendar_bounds, task_calendar_range
 from app.routers.auth import get_current_user
+from app.core.pagination import encode_cursor, decode_cursor, estimate_row_count
+from app.core.projection import json_response, sparse
+from app.services.list_projections import TASK_SUMMARY, attach_task_contacts
+from app.services.task_service import TaskService
+from app.services.delta_sync import clear_deletions, record_deletions, record_deletions_from
 from app.schemas.task_schemas import (
     TaskCreate,
     TaskUpdate,
     TaskResponse,
     TaskSummary,
-    ContactSummary as TaskContactSummary
+    TaskListItem,
+    TaskPage,
+    TaskBulkComplete,
+    TaskBulkUpdate,
+    TaskBulkResult
 )
 
 router = APIRouter(tags=["tasks"])
@@ -21,23 +31,45 @@ async def list_tasks(
     status_filter: Optional[str] = None,
     assigned_to: Optional[int] = None,
     project_id: Optional[int] = None,
+    include_contacts: bool = False,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List tasks for the current user"""
-    query = db.query(Task).filter(Task.created_by_id == current_user.id)
+    """List tasks for the current user (include_contacts embeds linked contact summaries, fields selects a sparse fieldset)"""
+    projection = sparse(TASK_SUMMARY, fields)
+    query = projection.select().where(Task.created_by_id == current_user.id)
     
     # Filter by status
     if status_filter:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
     
     # Filter by assigned user
     if assigned_to:
-        query = query.filter(Task.assigned_to_id == assigned_to)
+        query = query.where(Task.assigned_to_id == assigned_to)
     
     # Filter by project
     if project_id:
-        query = query.filter(Task.project_id == project_id)
+        query = query.where(Task.project_id == project_id)
+    
+    tasks = projection.fetch(db, query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc()))
+    
+    if include_contacts:
+        attach_task_contacts(db, tasks)
+    
+    return json_response(tasks)
+
+@router.get("/my-tasks", response_model=List[TaskSummary])
+async def get_my_tasks(
+    status_filter: Optional[str] = "incomplete",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get tasks assigned to the current user (for dashboard)"""
+    query = db.query(Task).filter(Task.assigned_to_id == current_user.id)
+    
+    if status_filter:
+        query = query.filter(Task.status == status_filter)
     
     tasks = query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc()).all()
     
@@ -60,23 +92,161 @@ async def list_tasks(
     
     return result
 
-@router.get("/my-tasks", response_model=List[TaskSummary])
-async def get_my_tasks(
+TASK_SUMMARY_FIELDS = (
+    "id", "title", "description", "status", "priority", "due_date",
+    "due_time_start", "due_time_end", "is_all_day", "assigned_to_id", "project_id"
+)
+TASK_FULL_FIELDS = TASK_SUMMARY_FIELDS + (
+    "task_type_id", "created_by_id", "created_at", "updated_at", "completed_at"
+)
+
+def _paginate_tasks(db: Session, query, cursor: Optional[str], limit: int, view: str) -> TaskPage:
+    """Keyset-paginate a task query over (due_date nullslast, created_at desc, id desc)"""
+    fields = TASK_FULL_FIELDS if view == "full" else TASK_SUMMARY_FIELDS
+    
+    # Planner estimate of the filtered set, only needed once per scroll
+    approximate_total = estimate_row_count(db, query) if not cursor else None
+    
+    if cursor:
+        position = decode_cursor(cursor, datetime_keys=("due_date", "created_at"))
+        last_due = position.get("due_date")
+        last_created = position.get("created_at")
+        last_id = position.get("id")
+        if last_created is None or last_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        
+        created_after = (Task.created_at < last_created) | (
+            (Task.created_at == last_created) & (Task.id < last_id)
+        )
+        if last_due is not None:
+            query = query.filter(
+                (Task.due_date > last_due) |
+                ((Task.due_date == last_due) & created_after) |
+                Task.due_date.is_(None)
+            )
+        else:
+            query = query.filter(Task.due_date.is_(None), created_after)
+    
+    tasks = (
+        query.options(load_only(*[getattr(Task, f) for f in fields]))
+        .order_by(Task.due_date.asc().nullslast(), Task.created_at.desc(), Task.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor({
+            "due_date": last.due_date,
+            "created_at": last.created_at,
+            "id": last.id
+        })
+    
+    items = [TaskListItem(**{f: getattr(task, f) for f in fields}) for task in tasks]
+    
+    return TaskPage(items=items, next_cursor=next_cursor, approximate_total=approximate_total)
+
+@router.get("/page", response_model=TaskPage, response_model_exclude_unset=True)
+async def list_tasks_page(
+    status_filter: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    project_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    view: str = Query("summary", pattern="^(summary|full)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cursor-paginated version of list_tasks"""
+    query = db.query(Task).filter(Task.created_by_id == current_user.id)
+    
+    if status_filter:
+        query = query.filter(Task.status == status_filter)
+    if assigned_to:
+        query = query.filter(Task.assigned_to_id == assigned_to)
+    if project_id:
+        query = query.filter(Task.project_id == project_id)
+    
+    return _paginate_tasks(db, query, cursor, limit, view)
+
+@router.get("/my-tasks/page", response_model=TaskPage, response_model_exclude_unset=True)
+async def get_my_tasks_page(
     status_filter: Optional[str] = "incomplete",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    view: str = Query("summary", pattern="^(summary|full)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get tasks assigned to the current user (for dashboard)"""
+    """Cursor-paginated version of get_my_tasks"""
     query = db.query(Task).filter(Task.assigned_to_id == current_user.id)
     
     if status_filter:
         query = query.filter(Task.status == status_filter)
     
-    tasks = query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc()).all()
+    return _paginate_tasks(db, query, cursor, limit, view)
+
+# Longest window the calendar endpoint will serve (a month view plus padding weeks)
+MAX_CALENDAR_WINDOW = timedelta(days=92)
+
+@router.get("/calendar", response_model=List[TaskSummary])
+async def get_calendar_tasks(
+    start: datetime,
+    end: datetime,
+    assignee_ids: Optional[List[int]] = Query(None),
+    status_filter: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get tasks whose calendar span overlaps [start, end) for one or many assignees"""
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
     
-    result = []
-    for task in tasks:
-        task_dict = {
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    if end - start > MAX_CALENDAR_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Calendar window cannot exceed {MAX_CALENDAR_WINDOW.days} days"
+        )
+    
+    span_start, _ = task_calendar_bounds(Task.due_date, Task.due_time_start, Task.due_time_end)
+    span = task_calendar_range(Task.due_date, Task.due_time_start, Task.due_time_end)
+    window = func.tstzrange(start, end, literal_column("'[)'"))
+    
+    # Same predicate as the partial GiST index so the planner can use it
+    query = db.query(Task).filter(
+        span_start.isnot(None),
+        span.op("&&")(window)
+    )
+    
+    # Users see tasks they created or that are assigned to them
+    if not current_user.is_superuser:
+        query = query.filter(
+            (Task.created_by_id == current_user.id) |
+            (Task.assigned_to_id == current_user.id)
+        )
+    
+    if assignee_ids:
+        query = query.filter(Task.assigned_to_id.in_(assignee_ids))
+    
+    if status_filter:
+        query = query.filter(Task.status == status_filter)
+    
+    tasks = query.order_by(span_start.asc(), Task.id.asc()).all()
+    
+    return [
+        {
             "id": task.id,
             "title": task.title,
             "description": task.description,
@@ -89,9 +259,8 @@ async def get_my_tasks(
             "assigned_to_id": task.assigned_to_id,
             "project_id": task.project_id
         }
-        result.append(task_dict)
-    
-    return result
+        for task in tasks
+    ]
 
 @router.post("/", response_model=TaskResponse)
 async def create_task(
@@ -159,40 +328,113 @@ async def create_task(
         task.related_contacts = contacts
     
     db.commit()
-    db.refresh(task)
     
-    # Build response with related contacts
-    related_contacts = [
-        TaskContactSummary(
-            id=c.id,
-            first_name=c.first_name,
-            last_name=c.last_name,
-            email=c.email,
-            full_name=c.full_name
-        )
-        for c in task.related_contacts
-    ]
+    # Reload with relationships eagerly loaded for the response
+    task = TaskService(db).get_task(task.id, current_user.id)
+    return TaskService.to_response(task)
+
+def _bulk_apply(db: Session, task_ids: List[int], values: dict, current_user: User) -> TaskBulkResult:
+    """Apply one set-based UPDATE to the current user's tasks and report what changed"""
+    requested_ids = list(dict.fromkeys(task_ids))
+    
+    if "status" in values:
+        if values["status"] == "complete":
+            # Keep the original completion time for tasks that were already complete
+            values["completed_at"] = case(
+                (Task.status == "complete", Task.completed_at),
+                else_=datetime.now(timezone.utc)
+            )
+        else:
+            values["completed_at"] = None
+    
+    owned = (Task.id.in_(requested_ids), Task.created_by_id == current_user.id)
+    
+    # Previous assignees no longer see reassigned tasks (sync tombstones, same transaction as the UPDATE)
+    if "assigned_to_id" in values:
+        reassigned = [Task.assigned_to_id.isnot(None), Task.assigned_to_id != Task.created_by_id]
+        if values["assigned_to_id"] is not None:
+            reassigned.append(Task.assigned_to_id != values["assigned_to_id"])
+        record_deletions_from(db, "tasks", select(Task.id, Task.assigned_to_id).where(*owned, *reassigned))
+    
+    stmt = (
+        update(Task)
+        .where(*owned)
+        .values(**values)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = sorted(db.execute(stmt).scalars().all())
+    # The new assignee may have seen these tasks before
+    if values.get("assigned_to_id") is not None and updated_ids:
+        clear_deletions(db, "tasks", updated_ids, values["assigned_to_id"])
+    db.commit()
     
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        due_time_start=task.due_time_start,
-        due_time_end=task.due_time_end,
-        is_all_day=task.is_all_day,
-        assigned_to_id=task.assigned_to_id,
-        project_id=task.project_id,
-        contact_ids=task_data.contact_ids or [],
-        created_by_id=task.created_by_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-        completed_at=task.completed_at,
-        related_contacts=related_contacts
+    updated_set = set(updated_ids)
+    return TaskBulkResult(
+        requested=len(requested_ids),
+        updated=len(updated_ids),
+        updated_ids=updated_ids,
+        not_found_ids=[task_id for task_id in requested_ids if task_id not in updated_set]
     )
 
+@router.post("/bulk-update", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    bulk_data: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Reassign, reschedule or change status/priority of many tasks in one statement"""
+    values = bulk_data.dict(exclude_unset=True, exclude={"task_ids"})
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    # Validate referenced rows once for the whole batch
+    if values.get("assigned_to_id") is not None:
+        if not db.query(User.id).filter(User.id == values["assigned_to_id"]).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Assigned user not found"
+            )
+    
+    if values.get("project_id") is not None:
+        project = db.query(Project.id).filter(
+            Project.id == values["project_id"],
+            Project.owner_id == current_user.id
+        ).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Project not found or access denied"
+            )
+    
+    if values.get("task_type_id") is not None:
+        if not db.query(TaskType.id).filter(TaskType.id == values["task_type_id"]).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Task type not found"
+            )
+    
+    for field in ("status", "priority", "is_all_day"):
+        if field in values and values[field] is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{field} cannot be null"
+            )
+    
+    return _bulk_apply(db, bulk_data.task_ids, values, current_user)
+
+@router.post("/bulk-complete", response_model=TaskBulkResult)
+async def bulk_complete_tasks(
+    bulk_data: TaskBulkComplete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark many tasks as complete in one statement"""
+    return _bulk_apply(db, bulk_data.task_ids, {"status": "complete"}, current_user)
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
@@ -200,10 +442,7 @@ async def get_task(
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific task by ID"""
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.created_by_id == current_user.id
-    ).first()
+    task = TaskService(db).get_task(task_id, current_user.id)
     
     if not task:
         raise HTTPException(
@@ -211,39 +450,7 @@ async def get_task(
             detail="Task not found or access denied"
         )
     
-    # Build response with related contacts
-    related_contacts = [
-        TaskContactSummary(
-            id=c.id,
-            first_name=c.first_name,
-            last_name=c.last_name,
-            email=c.email,
-            full_name=c.full_name
-        )
-        for c in task.related_contacts
-    ]
-    
-    contact_ids = [c.id for c in task.related_contacts]
-    
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        due_time_start=task.due_time_start,
-        due_time_end=task.due_time_end,
-        is_all_day=task.is_all_day,
-        assigned_to_id=task.assigned_to_id,
-        project_id=task.project_id,
-        contact_ids=contact_ids,
-        created_by_id=task.created_by_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-        completed_at=task.completed_at,
-        related_contacts=related_contacts
-    )
+    return TaskService.to_response(task)
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
@@ -287,6 +494,14 @@ async def update_task(
     
     # Update task fields
     update_data = task_data.dict(exclude_unset=True, exclude={"contact_ids"})
+    
+    # A previous assignee no longer sees the task (sync tombstone); a new one may have seen it before
+    if "assigned_to_id" in update_data and update_data["assigned_to_id"] != task.assigned_to_id:
+        if task.assigned_to_id not in (None, task.created_by_id):
+            record_deletions(db, "tasks", [(task.id, task.assigned_to_id)])
+        if update_data["assigned_to_id"] is not None:
+            clear_deletions(db, "tasks", [task.id], update_data["assigned_to_id"])
+    
     for field, value in update_data.items():
         setattr(task, field, value)
     
@@ -305,41 +520,10 @@ async def update_task(
         task.related_contacts = contacts
     
     db.commit()
-    db.refresh(task)
     
-    # Build response with related contacts
-    related_contacts = [
-        TaskContactSummary(
-            id=c.id,
-            first_name=c.first_name,
-            last_name=c.last_name,
-            email=c.email,
-            full_name=c.full_name
-        )
-        for c in task.related_contacts
-    ]
-    
-    contact_ids = [c.id for c in task.related_contacts]
-    
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        due_time_start=task.due_time_start,
-        due_time_end=task.due_time_end,
-        is_all_day=task.is_all_day,
-        assigned_to_id=task.assigned_to_id,
-        project_id=task.project_id,
-        contact_ids=contact_ids,
-        created_by_id=task.created_by_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-        completed_at=task.completed_at,
-        related_contacts=related_contacts
-    )
+    # Reload with relationships eagerly loaded for the response
+    task = TaskService(db).get_task(task.id, current_user.id)
+    return TaskService.to_response(task)
 
 @router.delete("/{task_id}")
 async def delete_task(
@@ -372,7 +556,8 @@ async def delete_task(
         # Flush to ensure associations are deleted
         db.flush()
         
-        # Now delete the task itself
+        # Now delete the task itself (for its creator and assignee)
+        record_deletions(db, "tasks", [(task.id, task.created_by_id), (task.id, task.assigned_to_id)])
         db.delete(task)
         db.commit()
         
@@ -8,6 +8,8 @@ from datetime import datetime
 from app.database import get_db
 from app.models import User, Role, AccessProfile
 from app.routers.auth import get_current_user
+from app.core.cache import cached, invalidate
+from app.core.permissions import invalidate_profile
 
 router = APIRouter(tags=["teams"])
 
@@ -85,6 +87,12 @@ class UserUpdate(BaseModel):
     access_profile_id: Optional[int] = None
 
 # Role endpoints
+@cached("roles", tags=("roles",))
+def role_list(db: Session) -> List[dict]:
+    """All roles, cached until a role is created"""
+    roles = db.query(Role).order_by(Role.name.asc()).all()
+    return [RoleResponse.model_validate(role).model_dump() for role in roles]
+
 @router.get("/roles", response_model=List[RoleResponse])
 async def list_roles(
     db: Session = Depends(get_db),
@@ -93,8 +101,7 @@ async def list_roles(
     """List all roles"""
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Only admins can view roles")
-    roles = db.query(Role).order_by(Role.name.asc()).all()
-    return roles
+    return role_list(db)
 
 @router.post("/roles", response_model=RoleResponse)
 async def create_role(
@@ -113,6 +120,7 @@ async def create_role(
     role = Role(**role_data.dict())
     db.add(role)
     db.commit()
+    invalidate("roles")
     db.refresh(role)
     return role
 
@@ -178,6 +186,7 @@ async def update_access_profile(
     
     db.commit()
     db.refresh(profile)
+    invalidate_profile(profile_id)
     return profile
 
 @router.delete("/access-profiles/{profile_id}")
@@ -201,6 +210,7 @@ async def delete_access_profile(
     
     db.delete(profile)
     db.commit()
+    invalidate_profile(profile_id)
     return {"message": "Access profile deleted successfully"}
 
 # User/Team endpoints
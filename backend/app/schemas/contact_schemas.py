@@ -2,6 +2,10 @@ from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from typing import Optional, List
 
+from app.schemas.activity_schemas import ActivitySummary
+from app.schemas.document_schemas import DocumentSummary
+from app.schemas.task_schemas import TaskSummary
+
 class ContactBase(BaseModel):
     # Basic Information
     first_name: str
@@ -130,3 +134,94 @@ class ContactSummary(BaseModel):
     class Config:
         from_attributes = True
 
+class ContactBoardPlacement(BaseModel):
+    """A board card showing where the contact sits on a board"""
+    id: int
+    board_id: int
+    board_name: str
+    board_column_id: int
+    column_name: str
+    position: int
+    notes: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class ContactDetailCounts(BaseModel):
+    """Totals for the contact page tabs, returned even for sections that aren't included"""
+    activities: int = 0
+    documents: int = 0
+    tasks: int = 0
+    open_tasks: int = 0
+    board_cards: int = 0
+
+class ContactDetailResponse(BaseModel):
+    """Contact with the related records the contact page shows, loaded in one request"""
+    contact: ContactResponse
+    sales_rep_name: Optional[str] = None
+    counts: ContactDetailCounts
+    activities: Optional[List[ActivitySummary]] = None  # Only when included
+    documents: Optional[List[DocumentSummary]] = None
+    tasks: Optional[List[TaskSummary]] = None
+    board_cards: Optional[List[ContactBoardPlacement]] = None
+
+class FacetCount(BaseModel):
+    """Number of contacts with a facet value (None = contacts without one)"""
+    value: Optional[str] = None
+    count: int
+
+class SalesRepFacetCount(BaseModel):
+    sales_rep_id: Optional[int] = None
+    sales_rep_name: Optional[str] = None
+    count: int
+
+class ContactFacets(BaseModel):
+    """Sidebar filter counts over the current user's contacts"""
+    total: int
+    tags: List[FacetCount]
+    status: List[FacetCount]
+    contact_type: List[FacetCount]
+    lead_source: List[FacetCount]
+    sales_rep: List[SalesRepFacetCount]
+
+class DuplicateCandidateResponse(BaseModel):
+    """Two contacts the dedupe scan considers the same person; contact is the older one"""
+    id: int
+    score: float
+    reasons: List[str]
+    status: str
+    contact: ContactSummary
+    duplicate: ContactSummary
+    created_at: Optional[datetime] = None
+
+class ContactMergeRequest(BaseModel):
+    primary_id: int  # Contact that is kept
+    duplicate_ids: List[int]  # Contacts folded into it and deleted
+
+class ContactMergeResponse(BaseModel):
+    """Merge outcome with the number of records moved to the primary contact"""
+    primary_id: int
+    merged_ids: List[int]
+    activities: int
+    documents: int
+    board_cards: int
+    tasks: int
+
+class ImportResult(BaseModel):
+    """Result of importing a single contact"""
+    row_number: int
+    success: bool
+    contact_id: Optional[int] = None
+    display_name: Optional[str] = None
+    error: Optional[str] = None
+    action: Optional[str] = None  # created, updated or skipped; duplicate when rejected
+
+class ImportResponse(BaseModel):
+    """Response for CSV import"""
+    total_rows: int
+    successful: int  # Created or updated
+    failed: int
+    updated: int = 0
+    skipped: int = 0
+    results: List[ImportResult]
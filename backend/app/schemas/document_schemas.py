@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class DocumentCategoryBase(BaseModel):
     name: str
@@ -44,6 +44,11 @@ class DocumentResponse(DocumentBase):
     file_type: Optional[str] = None
     mime_type: Optional[str] = None
     pages: Optional[int] = None
+    page_width: Optional[float] = None
+    page_height: Optional[float] = None
+    text_length: Optional[int] = None
+    metadata_status: Optional[str] = None
+    renditions: Optional[Dict[str, Any]] = None  # Photo renditions: name -> {width, height, size}
     contact_id: int
     created_by_id: int
     created_at: datetime
@@ -63,6 +68,11 @@ class DocumentSummary(BaseModel):
     file_type: Optional[str] = None
     mime_type: Optional[str] = None
     pages: Optional[int] = None
+    page_width: Optional[float] = None
+    page_height: Optional[float] = None
+    text_length: Optional[int] = None
+    metadata_status: Optional[str] = None
+    renditions: Optional[Dict[str, Any]] = None  # Photo renditions: name -> {width, height, size}
     category_id: Optional[int] = None
     category_name: Optional[str] = None
     description: Optional[str] = None
@@ -73,3 +83,40 @@ class DocumentSummary(BaseModel):
     class Config:
         from_attributes = True
 
+class DocumentSearchResult(BaseModel):
+    """Ranked full-text search hit with a highlighted snippet"""
+    id: int
+    contact_id: int
+    contact_name: Optional[str] = None
+    original_filename: str
+    mime_type: Optional[str] = None
+    pages: Optional[int] = None
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    created_at: datetime
+    rank: float
+    snippet: Optional[str] = None  # HTML-escaped text, matches wrapped in <mark></mark>
+    
+    class Config:
+        from_attributes = True
+
+class MultipartUploadCreate(DocumentBase):
+    """Start a multipart upload for a large file"""
+    filename: str
+    content_type: Optional[str] = None
+    size: int = Field(..., gt=0)
+
+class MultipartUploadResponse(BaseModel):
+    upload_id: str
+    part_size: int
+    part_count: int
+    # Presigned URLs to PUT each part directly to storage; when absent, PUT parts to
+    # /documents/uploads/{upload_id}/parts/{part_number}
+    part_urls: Optional[List[str]] = None
+
+class MultipartUploadPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+class MultipartUploadComplete(BaseModel):
+    parts: List[MultipartUploadPart] = Field(..., min_length=1)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+class JobAccepted(BaseModel):
+    """Returned when work has been queued for a background worker"""
+    job_id: str
+    status: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    state: str  # PENDING, STARTED, RETRY, SUCCESS, FAILURE
+    ready: bool
+    result: Optional[Any] = None
+    error: Optional[str] = None
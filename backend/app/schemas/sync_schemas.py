@@ -0,0 +1,65 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+
+from app.schemas.activity_schemas import ActivityResponse
+from app.schemas.contact_schemas import ContactSummary
+from app.schemas.document_schemas import DocumentSummary
+from app.schemas.task_schemas import TaskListItem
+
+class SyncContact(ContactSummary):
+    lead_source: Optional[str] = None
+    tags: Optional[List[str]] = None
+    insurance_carrier: Optional[str] = None
+    policy_number: Optional[str] = None
+    claim_number: Optional[str] = None
+    date_of_loss: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class SyncDocument(DocumentSummary):
+    """Document metadata; the file itself is downloaded on demand"""
+    contact_id: int
+    content_hash: Optional[str] = None  # Changes when the file does
+    created_by_id: int
+    updated_at: Optional[datetime] = None
+
+class SyncBoardCard(BaseModel):
+    id: int
+    board_id: int
+    board_column_id: int
+    contact_id: int
+    position: int
+    notes: Optional[str] = None
+    created_by_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+class SyncChanges(BaseModel):
+    """Rows created or updated in the sync window"""
+    contacts: List[SyncContact] = []
+    tasks: List[TaskListItem] = []
+    activities: List[ActivityResponse] = []
+    documents: List[SyncDocument] = []
+    board_cards: List[SyncBoardCard] = []
+
+class SyncDeleted(BaseModel):
+    """Ids deleted (or no longer visible to the user) in the sync window"""
+    contacts: List[int] = []
+    tasks: List[int] = []
+    activities: List[int] = []
+    documents: List[int] = []
+    board_cards: List[int] = []
+
+class SyncPage(BaseModel):
+    """One page of the delta sync feed.
+
+    Apply changes then deleted; while has_more, request the next page with
+    cursor. Afterwards keep watermark and send it as since on the next sync.
+    """
+    changes: SyncChanges
+    deleted: SyncDeleted
+    has_more: bool
+    cursor: Optional[str] = None
+    watermark: datetime
+    reset: bool = False  # Drop the local copy first: this is a full sync
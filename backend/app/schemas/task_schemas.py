@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 
@@ -51,6 +51,8 @@ class TaskResponse(TaskBase):
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     related_contacts: List[ContactSummary] = []
+    task_type_name: Optional[str] = None
+    assigned_to_name: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -68,7 +70,44 @@ class TaskSummary(BaseModel):
     is_all_day: bool
     assigned_to_id: Optional[int] = None
     project_id: Optional[int] = None
+    related_contacts: Optional[List[ContactSummary]] = None  # Only when embedding is requested
     
     class Config:
         from_attributes = True
 
+class TaskListItem(TaskSummary):
+    """Task list row; the extra fields are only present in the "full" projection"""
+    task_type_id: Optional[int] = None
+    created_by_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+class TaskPage(BaseModel):
+    """One page of tasks with an opaque cursor for the next page"""
+    items: List[TaskListItem]
+    next_cursor: Optional[str] = None
+    approximate_total: Optional[int] = None  # Planner estimate, first page only
+
+class TaskBulkComplete(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class TaskBulkUpdate(BaseModel):
+    """Fields to apply to every listed task; only fields that are sent are changed"""
+    task_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    task_type_id: Optional[int] = None
+    due_date: Optional[datetime] = None
+    due_time_start: Optional[datetime] = None
+    due_time_end: Optional[datetime] = None
+    is_all_day: Optional[bool] = None
+    assigned_to_id: Optional[int] = None  # Send null to unassign
+    project_id: Optional[int] = None
+
+class TaskBulkResult(BaseModel):
+    """Compact result of a bulk task operation"""
+    requested: int
+    updated: int
+    updated_ids: List[int]
+    not_found_ids: List[int] = []  # Missing or not owned by the current user
@@ -0,0 +1,354 @@
+"""
+Contact deduplication: candidate scan and merge
+
+Scan (scan_duplicates, run by the bulk-queue task): comparing every pair of an
+owner's contacts is O(n^2), so contacts are first grouped by blocking keys and
+only contacts sharing a block are compared:
+- normalized email
+- normalized phone (main or mobile, E.164)
+- postal code + a trigram of the last name (catches "Smith" / "Smyth")
+Blocks larger than MAX_BLOCK_SIZE (a shared office number, a very common name
+trigram) are skipped: they say little about identity and dominate the cost.
+Each pair is scored from its matching signals and stored in
+contact_duplicate_candidates when it reaches MIN_SCORE. Pairs a user dismissed
+are kept and never re-suggested.
+
+Merge (merge_contacts): folds duplicates into a primary contact in one
+transaction with set-based statements: activities, documents, board cards and
+task links are re-pointed, references from other contacts and @mentions are
+rewritten, blank fields are filled from the duplicates, then the duplicates
+are deleted.
+"""
+import re
+from collections import defaultdict
+from itertools import combinations
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.normalize import normalize_email, normalize_reference
+from app.models import (
+    Activity,
+    BoardCard,
+    BoardColumn,
+    Contact,
+    ContactDuplicateCandidate,
+    Document,
+    activity_mentions,
+    contact_relations,
+    contact_subcontractors,
+    task_contact_association,
+)
+from app.services.contact_detail import contact_detail_options
+from app.services.contact_edges import delete_contact_edges, parse_ids, parse_tags, sync_activity_mentions, sync_contact_edges
+from app.services.delta_sync import board_card_owners, record_contact_deletions, record_deletions_from
+
+MAX_BLOCK_SIZE = 50
+MIN_SCORE = 0.5
+INSERT_BATCH_SIZE = 5000
+MAX_MERGE_DUPLICATES = 50
+
+CANDIDATE_OPEN = "open"
+CANDIDATE_DISMISSED = "dismissed"
+
+# Signal weights; the score is their sum capped at 1
+EMAIL_WEIGHT = 0.5
+PHONE_WEIGHT = 0.4
+NAME_WEIGHT = 0.4  # Scaled by name trigram similarity
+POSTAL_WEIGHT = 0.1
+ADDRESS_WEIGHT = 0.1  # When address trigram similarity >= SIMILAR
+SIMILAR = 0.6
+
+_WORDS = re.compile(r"[a-z0-9]+")
+
+SCAN_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.display_name,
+    Contact.email,
+    Contact.main_phone_e164,
+    Contact.mobile_phone_e164,
+    Contact.postal_code,
+    Contact.address_line_1,
+)
+
+# Scalar fields a merge fills on the primary when it has no value
+MERGE_FILL_COLUMNS = (
+    "company", "email", "website", "main_phone", "mobile_phone",
+    "address_line_1", "address_line_2", "city", "state", "postal_code",
+    "contact_type", "status", "sales_rep_id", "lead_source", "description", "notes",
+    "customer_type", "date_of_loss", "roof_type", "insurance_carrier", "date_of_filing",
+    "due_time", "code_upgrade", "policy_number", "claim_number", "deductible",
+    "desk_adjuster_name", "desk_adjuster_phone",
+)
+
+def trigrams(value: Optional[str]) -> Set[str]:
+    """Word trigrams as pg_trgm computes them ("  s", " sm", "smi", ...)"""
+    grams = set()
+    for word in _WORDS.findall((value or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _postal_key(postal_code: Optional[str]) -> Optional[str]:
+    key = normalize_reference(postal_code)
+    # ZIP+4 and ZIP match on the 5-digit ZIP
+    return key[:5] if key and key.isdigit() else key
+
+class _ScanRow:
+    __slots__ = ("id", "email", "phones", "postal", "name", "last_name", "address")
+
+    def __init__(self, row):
+        self.id = row.id
+        self.email = normalize_email(row.email)
+        self.phones = {phone for phone in (row.main_phone_e164, row.mobile_phone_e164) if phone}
+        self.postal = _postal_key(row.postal_code)
+        self.name = trigrams(row.display_name or f"{row.first_name} {row.last_name}")
+        self.last_name = trigrams(row.last_name)
+        self.address = trigrams(row.address_line_1)
+
+    def blocking_keys(self):
+        if self.email:
+            yield ("email", self.email)
+        for phone in self.phones:
+            yield ("phone", phone)
+        if self.postal:
+            for gram in self.last_name:
+                # "  s" only says the name starts with s
+                if not gram.startswith("  "):
+                    yield ("postal_name", self.postal, gram)
+
+def score_pair(a: _ScanRow, b: _ScanRow) -> Tuple[float, List[str]]:
+    score = 0.0
+    reasons = []
+    if a.email and a.email == b.email:
+        score += EMAIL_WEIGHT
+        reasons.append("email")
+    if a.phones & b.phones:
+        score += PHONE_WEIGHT
+        reasons.append("phone")
+    name_similarity = similarity(a.name, b.name)
+    score += NAME_WEIGHT * name_similarity
+    if name_similarity >= SIMILAR:
+        reasons.append("name")
+    if a.postal and a.postal == b.postal:
+        score += POSTAL_WEIGHT
+        reasons.append("postal_code")
+    if similarity(a.address, b.address) >= SIMILAR:
+        score += ADDRESS_WEIGHT
+        reasons.append("address")
+    return min(score, 1.0), reasons
+
+def find_candidates(rows: Sequence[_ScanRow], min_score: float = MIN_SCORE) -> Tuple[List[Tuple[int, int, float, List[str]]], int]:
+    """Scored (contact_id, duplicate_id, score, reasons) pairs from rows in id order,
+    plus the number of pairs compared"""
+    blocks = defaultdict(list)
+    for index, row in enumerate(rows):
+        for key in row.blocking_keys():
+            blocks[key].append(index)
+
+    seen = set()
+    candidates = []
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for i, j in combinations(members, 2):
+            if (i, j) in seen:
+                continue
+            seen.add((i, j))
+            score, reasons = score_pair(rows[i], rows[j])
+            if score >= min_score:
+                candidates.append((rows[i].id, rows[j].id, round(score, 3), reasons))
+    return candidates, len(seen)
+
+def scan_duplicates(db: Session, user_id: int, min_score: float = MIN_SCORE) -> dict:
+    """Replace a user's open duplicate candidates with a fresh scan; commits"""
+    statement = (
+        select(*SCAN_COLUMNS)
+        .where(Contact.created_by_id == user_id)
+        .order_by(Contact.id)
+        .execution_options(yield_per=10000)
+    )
+    rows = [_ScanRow(row) for row in db.execute(statement)]
+    candidates, compared = find_candidates(rows, min_score)
+
+    table = ContactDuplicateCandidate.__table__
+    dismissed = set(db.execute(
+        select(table.c.contact_id, table.c.duplicate_id).where(
+            table.c.owner_id == user_id,
+            table.c.status == CANDIDATE_DISMISSED
+        )
+    ).all())
+    db.execute(delete(table).where(table.c.owner_id == user_id, table.c.status == CANDIDATE_OPEN))
+    values = [
+        {
+            "owner_id": user_id,
+            "contact_id": contact_id,
+            "duplicate_id": duplicate_id,
+            "score": score,
+            "reasons": reasons,
+            "status": CANDIDATE_OPEN,
+        }
+        for contact_id, duplicate_id, score, reasons in candidates
+        if (contact_id, duplicate_id) not in dismissed
+    ]
+    for offset in range(0, len(values), INSERT_BATCH_SIZE):
+        db.execute(insert(table), values[offset:offset + INSERT_BATCH_SIZE])
+    db.commit()
+    return {"contacts": len(rows), "pairs_compared": compared, "candidates": len(values)}
+
+def _replace_ids(values, old_ids: Set[int], new_id: int, exclude: int = None) -> List[int]:
+    """An id array with old_ids swapped for new_id, de-duplicated, without exclude"""
+    result = []
+    for contact_id in parse_ids(values):
+        contact_id = new_id if contact_id in old_ids else contact_id
+        if contact_id != exclude and contact_id not in result:
+            result.append(contact_id)
+    return result
+
+def merge_contacts(db: Session, user_id: int, primary_id: int, duplicate_ids: Sequence[int]) -> Optional[dict]:
+    """Fold duplicate contacts into the primary and delete them; commits.
+
+    Returns None when any contact is missing or not owned by the user. Raises
+    ValueError for an invalid request.
+    """
+    duplicate_ids = list(dict.fromkeys(duplicate_ids))
+    if not duplicate_ids:
+        raise ValueError("No duplicates to merge")
+    if primary_id in duplicate_ids:
+        raise ValueError("The primary contact can't also be a duplicate")
+    if len(duplicate_ids) > MAX_MERGE_DUPLICATES:
+        raise ValueError(f"At most {MAX_MERGE_DUPLICATES} contacts can be merged at once")
+
+    contacts = (
+        db.query(Contact)
+        .options(*contact_detail_options())
+        .filter(Contact.id.in_([primary_id, *duplicate_ids]), Contact.created_by_id == user_id)
+        .order_by(Contact.id)
+        .all()
+    )
+    if len(contacts) != len(duplicate_ids) + 1:
+        return None
+    primary = next(contact for contact in contacts if contact.id == primary_id)
+    duplicates = [contact for contact in contacts if contact.id != primary_id]
+    merged = set(duplicate_ids)
+
+    # 1. Values the primary lacks, taken from the oldest duplicate that has them
+    fills = {}
+    for column in MERGE_FILL_COLUMNS:
+        if getattr(primary, column) in (None, ""):
+            for duplicate in duplicates:
+                if getattr(duplicate, column) not in (None, ""):
+                    fills[column] = getattr(duplicate, column)
+                    break
+    assigned_to_ids = parse_ids(primary.assigned_to_ids)
+    subcontractor_ids = parse_ids(primary.subcontractor_ids)
+    related_contact_ids = parse_ids(primary.related_contact_ids)
+    tags = parse_tags(primary.tags)
+    custom_fields = {}
+    for duplicate in reversed(duplicates):
+        custom_fields.update(duplicate.custom_fields or {})
+        assigned_to_ids += parse_ids(duplicate.assigned_to_ids)
+        subcontractor_ids += parse_ids(duplicate.subcontractor_ids)
+        related_contact_ids += parse_ids(duplicate.related_contact_ids)
+        tags += parse_tags(duplicate.tags)
+    custom_fields.update(primary.custom_fields or {})
+
+    # 2. Re-point the duplicates' records
+    moved = {}
+    moved["activities"] = db.execute(
+        update(Activity).where(Activity.contact_id.in_(merged)).values(contact_id=primary_id)
+    ).rowcount
+    moved["documents"] = db.execute(
+        update(Document).where(Document.contact_id.in_(merged)).values(contact_id=primary_id)
+    ).rowcount
+
+    # One card per board: drop duplicate cards on boards the primary is already on,
+    # and all but the oldest duplicate card per remaining board
+    primary_board_columns = select(BoardColumn.id).where(BoardColumn.board_id.in_(
+        select(BoardColumn.board_id)
+        .join(BoardCard, BoardCard.board_column_id == BoardColumn.id)
+        .where(BoardCard.contact_id == primary_id)
+    ))
+    oldest_duplicate_cards = (
+        select(func.min(BoardCard.id))
+        .join(BoardColumn, BoardColumn.id == BoardCard.board_column_id)
+        .where(BoardCard.contact_id.in_(merged))
+        .group_by(BoardColumn.board_id)
+    )
+    dropped_cards = and_(
+        BoardCard.contact_id.in_(merged),
+        or_(BoardCard.board_column_id.in_(primary_board_columns), BoardCard.id.not_in(oldest_duplicate_cards))
+    )
+    record_deletions_from(db, "board_cards", board_card_owners().where(dropped_cards))
+    db.execute(delete(BoardCard).where(dropped_cards).execution_options(synchronize_session=False))
+    moved["board_cards"] = db.execute(
+        update(BoardCard).where(BoardCard.contact_id.in_(merged)).values(contact_id=primary_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    linked_tasks = select(task_contact_association.c.task_id).where(task_contact_association.c.contact_id == primary_id)
+    moved["tasks"] = db.execute(
+        insert(task_contact_association).from_select(
+            ["task_id", "contact_id"],
+            select(task_contact_association.c.task_id, primary_id)
+            .where(
+                task_contact_association.c.contact_id.in_(merged),
+                task_contact_association.c.task_id.not_in(linked_tasks)
+            )
+            .distinct()
+        )
+    ).rowcount
+    db.execute(delete(task_contact_association).where(task_contact_association.c.contact_id.in_(merged)))
+
+    # 3. Rewrite references to the duplicates held by other contacts and activities
+    referencing_contacts = select(contact_subcontractors.c.contact_id).where(
+        contact_subcontractors.c.subcontractor_id.in_(merged)
+    ).union(
+        select(contact_relations.c.contact_id).where(contact_relations.c.related_contact_id.in_(merged))
+    )
+    for contact in (
+        db.query(Contact)
+        .options(*contact_detail_options())
+        .filter(Contact.id.in_(referencing_contacts), Contact.id.not_in([primary_id, *merged]))
+        .all()
+    ):
+        contact.subcontractor_ids = _replace_ids(contact.subcontractor_ids, merged, primary_id, exclude=contact.id)
+        contact.related_contact_ids = _replace_ids(contact.related_contact_ids, merged, primary_id, exclude=contact.id)
+        db.flush()
+        sync_contact_edges(db, contact)
+    mentioning = select(activity_mentions.c.activity_id).where(activity_mentions.c.contact_id.in_(merged))
+    for activity in db.query(Activity).filter(Activity.id.in_(mentioning)).all():
+        activity.related_contact_ids = _replace_ids(activity.related_contact_ids, merged, primary_id)
+        db.flush()
+        sync_activity_mentions(db, activity)
+
+    # 4. Delete the duplicates, then update the primary (its email may have been a duplicate's)
+    db.execute(delete(ContactDuplicateCandidate).where(
+        ContactDuplicateCandidate.owner_id == user_id,
+        or_(ContactDuplicateCandidate.contact_id.in_(merged), ContactDuplicateCandidate.duplicate_id.in_(merged))
+    ))
+    for duplicate_id in merged:
+        delete_contact_edges(db, duplicate_id)
+    record_contact_deletions(db, merged)
+    db.execute(delete(Contact).where(Contact.id.in_(merged)))
+
+    for column, value in fills.items():
+        setattr(primary, column, value)
+    primary.assigned_to_ids = list(dict.fromkeys(assigned_to_ids))
+    primary.subcontractor_ids = _replace_ids(subcontractor_ids, merged, primary_id, exclude=primary_id)
+    primary.related_contact_ids = _replace_ids(related_contact_ids, merged, primary_id, exclude=primary_id)
+    primary.tags = list(dict.fromkeys(tags))
+    primary.custom_fields = custom_fields or primary.custom_fields
+    db.flush()
+    sync_contact_edges(db, primary)
+    db.commit()
+
+    return {"primary_id": primary_id, "merged_ids": sorted(merged), **moved}
@@ -0,0 +1,286 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload, undefer_group
+from typing import Iterable, Optional, Set
+
+from app.models import Activity, BoardCard, BoardColumn, Contact, Document, Task, User, task_contact_association
+from app.schemas.activity_schemas import ActivitySummary
+from app.schemas.contact_schemas import ContactBoardPlacement, ContactDetailCounts, ContactDetailResponse, ContactResponse
+from app.schemas.document_schemas import DocumentSummary
+from app.schemas.task_schemas import TaskSummary
+
+DETAIL_SECTIONS = ("activities", "documents", "tasks", "board_cards")
+
+OPEN_TASK_STATUSES = ("incomplete", "in_progress")
+
+# Only the columns the summaries need; Document.text_content and search_vector stay deferred
+ACTIVITY_COLUMNS = (
+    Activity.id,
+    Activity.contact_id,
+    Activity.activity_type,
+    Activity.content,
+    Activity.subject,
+    Activity.created_by_id,
+    Activity.created_at,
+)
+DOCUMENT_COLUMNS = (
+    Document.id,
+    Document.contact_id,
+    Document.filename,
+    Document.original_filename,
+    Document.file_size,
+    Document.file_type,
+    Document.mime_type,
+    Document.pages,
+    Document.page_width,
+    Document.page_height,
+    Document.text_length,
+    Document.metadata_status,
+    Document.renditions,
+    Document.category_id,
+    Document.description,
+    Document.is_private,
+    Document.created_by_id,
+    Document.created_at,
+)
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.due_date,
+    Task.due_time_start,
+    Task.due_time_end,
+    Task.is_all_day,
+    Task.assigned_to_id,
+    Task.project_id,
+)
+USER_NAME_COLUMNS = (User.id, User.username, User.full_name)
+
+# Deferred column groups on Contact (see app.models.Contact)
+CONTACT_DETAIL_GROUPS = ("detail", "claim")
+
+def contact_detail_options():
+    """Loader options that fetch every Contact column in the main SELECT"""
+    return tuple(undefer_group(group) for group in CONTACT_DETAIL_GROUPS)
+
+def refresh_contact(db: Session, contact: Contact) -> None:
+    """Session.refresh() that also reloads the deferred groups in the same SELECT"""
+    db.refresh(contact, attribute_names=[attr.key for attr in Contact.__mapper__.column_attrs])
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    """Parse a comma-separated include list; None means every section"""
+    if include is None:
+        return set(DETAIL_SECTIONS)
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested - set(DETAIL_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return requested
+
+def _user_name(user: Optional[User]) -> Optional[str]:
+    if not user:
+        return None
+    return user.full_name or user.username
+
+def _newest_first(rows):
+    return sorted(rows, key=lambda row: (row.created_at is not None, row.created_at, row.id), reverse=True)
+
+class ContactDetailService:
+    """Loads a contact page in a fixed number of queries.
+
+    The contact row (with its sales rep) is one query, each included section is
+    one selectinload query with its own small joins, and all tab counts come
+    from a single statement of scalar subqueries. The number of queries depends
+    only on which sections are requested, never on how many rows they hold.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def section_options(sections: Iterable[str]):
+        options = [*contact_detail_options(), joinedload(Contact.sales_rep).load_only(*USER_NAME_COLUMNS)]
+        if "activities" in sections:
+            options.append(
+                selectinload(Contact.activities).options(
+                    load_only(*ACTIVITY_COLUMNS),
+                    joinedload(Activity.created_by).load_only(*USER_NAME_COLUMNS)
+                )
+            )
+        if "documents" in sections:
+            options.append(
+                selectinload(Contact.documents).options(
+                    load_only(*DOCUMENT_COLUMNS),
+                    joinedload(Document.category),
+                    joinedload(Document.created_by).load_only(*USER_NAME_COLUMNS)
+                )
+            )
+        if "tasks" in sections:
+            options.append(selectinload(Contact.tasks).options(load_only(*TASK_COLUMNS)))
+        if "board_cards" in sections:
+            options.append(
+                selectinload(Contact.board_cards).options(
+                    joinedload(BoardCard.column).joinedload(BoardColumn.board)
+                )
+            )
+        return options
+
+    def counts(self, contact_id: int) -> ContactDetailCounts:
+        """All tab counts in one round trip"""
+        task_links = (
+            select(func.count())
+            .select_from(task_contact_association.join(Task, Task.id == task_contact_association.c.task_id))
+            .where(task_contact_association.c.contact_id == contact_id)
+        )
+        row = self.db.execute(
+            select(
+                select(func.count(Activity.id)).where(Activity.contact_id == contact_id).scalar_subquery().label("activities"),
+                select(func.count(Document.id)).where(Document.contact_id == contact_id).scalar_subquery().label("documents"),
+                task_links.scalar_subquery().label("tasks"),
+                task_links.where(Task.status.in_(OPEN_TASK_STATUSES)).scalar_subquery().label("open_tasks"),
+                select(func.count(BoardCard.id)).where(BoardCard.contact_id == contact_id).scalar_subquery().label("board_cards"),
+            )
+        ).one()
+        return ContactDetailCounts(**row._mapping)
+
+    def get_detail(self, contact_id: int, user_id: int, sections: Set[str]) -> Optional[ContactDetailResponse]:
+        contact = (
+            self.db.query(Contact)
+            .options(*self.section_options(sections))
+            .filter(Contact.id == contact_id, Contact.created_by_id == user_id)
+            .first()
+        )
+        if not contact:
+            return None
+
+        detail = ContactDetailResponse(
+            contact=contact_response(contact),
+            sales_rep_name=_user_name(contact.sales_rep),
+            counts=self.counts(contact_id)
+        )
+
+        if "activities" in sections:
+            detail.activities = [
+                ActivitySummary(
+                    id=activity.id,
+                    activity_type=activity.activity_type,
+                    content=activity.content,
+                    subject=activity.subject,
+                    created_by_id=activity.created_by_id,
+                    created_by_name=_user_name(activity.created_by),
+                    created_at=activity.created_at
+                )
+                for activity in _newest_first(contact.activities)
+            ]
+
+        if "documents" in sections:
+            detail.documents = [
+                DocumentSummary(
+                    id=doc.id,
+                    filename=doc.filename,
+                    original_filename=doc.original_filename,
+                    file_size=doc.file_size,
+                    file_type=doc.file_type,
+                    mime_type=doc.mime_type,
+                    pages=doc.pages,
+                    page_width=doc.page_width,
+                    page_height=doc.page_height,
+                    text_length=doc.text_length,
+                    metadata_status=doc.metadata_status,
+                    renditions=doc.renditions,
+                    category_id=doc.category_id,
+                    category_name=doc.category.name if doc.category else None,
+                    description=doc.description,
+                    is_private=doc.is_private,
+                    created_at=doc.created_at,
+                    created_by_name=_user_name(doc.created_by)
+                )
+                for doc in _newest_first(contact.documents)
+            ]
+
+        if "tasks" in sections:
+            # Open tasks first, soonest due date first, undated last
+            tasks = sorted(
+                contact.tasks,
+                key=lambda task: (task.status not in OPEN_TASK_STATUSES, task.due_date is None, task.due_date or 0, task.id)
+            )
+            detail.tasks = [
+                TaskSummary(
+                    id=task.id,
+                    title=task.title,
+                    description=task.description,
+                    status=task.status,
+                    priority=task.priority,
+                    due_date=task.due_date,
+                    due_time_start=task.due_time_start,
+                    due_time_end=task.due_time_end,
+                    is_all_day=task.is_all_day,
+                    assigned_to_id=task.assigned_to_id,
+                    project_id=task.project_id
+                )
+                for task in tasks
+            ]
+
+        if "board_cards" in sections:
+            detail.board_cards = [
+                ContactBoardPlacement(
+                    id=card.id,
+                    board_id=card.column.board_id,
+                    board_name=card.column.board.name,
+                    board_column_id=card.board_column_id,
+                    column_name=card.column.name,
+                    position=card.position,
+                    notes=card.notes,
+                    created_at=card.created_at
+                )
+                for card in sorted(contact.board_cards, key=lambda card: card.id)
+            ]
+
+        return detail
+
+def contact_response(contact: Contact) -> ContactResponse:
+    return ContactResponse(
+        id=contact.id,
+        first_name=contact.first_name,
+        last_name=contact.last_name,
+        display_name=contact.display_name,
+        company=contact.company,
+        email=contact.email,
+        website=contact.website,
+        main_phone=contact.main_phone,
+        mobile_phone=contact.mobile_phone,
+        address_line_1=contact.address_line_1,
+        address_line_2=contact.address_line_2,
+        city=contact.city,
+        state=contact.state,
+        postal_code=contact.postal_code,
+        contact_type=contact.contact_type,
+        status=contact.status,
+        sales_rep_id=contact.sales_rep_id,
+        lead_source=contact.lead_source,
+        assigned_to_ids=contact.assigned_to_ids or [],
+        subcontractor_ids=contact.subcontractor_ids or [],
+        related_contact_ids=contact.related_contact_ids or [],
+        description=contact.description,
+        notes=contact.notes,
+        tags=contact.tags or [],
+        customer_type=contact.customer_type,
+        texting_opt_out=contact.texting_opt_out,
+        date_of_loss=contact.date_of_loss,
+        roof_type=contact.roof_type,
+        insurance_carrier=contact.insurance_carrier,
+        date_of_filing=contact.date_of_filing,
+        due_time=contact.due_time,
+        code_upgrade=contact.code_upgrade,
+        policy_number=contact.policy_number,
+        claim_number=contact.claim_number,
+        deductible=contact.deductible,
+        desk_adjuster_name=contact.desk_adjuster_name,
+        desk_adjuster_phone=contact.desk_adjuster_phone,
+        custom_fields=contact.custom_fields,
+        created_by_id=contact.created_by_id,
+        created_at=contact.created_at,
+        updated_at=contact.updated_at,
+        full_name=contact.full_name
+    )
@@ -0,0 +1,125 @@
+"""
+Keep the contact edge tables in sync with the JSON id arrays
+
+Contact.assigned_to_ids / subcontractor_ids / related_contact_ids / tags and
+Activity.related_contact_ids remain the source of truth (they're what the API
+reads and writes). Every write path calls the sync functions below after the
+row is flushed, which replace that row's edges inside the same transaction.
+Ids that don't reference an existing user/contact are skipped rather than
+violating the foreign keys.
+"""
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Activity,
+    Contact,
+    User,
+    activity_mentions,
+    contact_assignees,
+    contact_relations,
+    contact_subcontractors,
+    contact_tags,
+)
+
+EDGE_FIELDS = ("assigned_to_ids", "subcontractor_ids", "related_contact_ids", "tags")
+
+def parse_ids(values) -> List[int]:
+    """Integer ids from a JSON array, de-duplicated in order; junk entries are ignored"""
+    ids = []
+    for value in values or []:
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            continue
+        if number not in ids:
+            ids.append(number)
+    return ids
+
+def parse_tags(values) -> List[str]:
+    """Trimmed, non-empty tag strings from a JSON array, de-duplicated in order"""
+    tags = []
+    for value in values or []:
+        if not isinstance(value, str):
+            continue
+        tag = value.strip()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+def _existing(db: Session, column, ids: Iterable[int]) -> List[int]:
+    ids = list(ids)
+    if not ids:
+        return []
+    found = set(db.execute(select(column).where(column.in_(ids))).scalars())
+    return [i for i in ids if i in found]
+
+def _replace(db: Session, table, owner_column: str, owner_id: int, target_column: str, target_ids: List[int]) -> None:
+    db.execute(delete(table).where(table.c[owner_column] == owner_id))
+    if target_ids:
+        db.execute(insert(table), [{owner_column: owner_id, target_column: target_id} for target_id in target_ids])
+
+def sync_contact_edges(db: Session, contact: Contact) -> None:
+    """Rewrite the assignee/subcontractor/relation/tag edges of a flushed contact"""
+    contact_ids = parse_ids(contact.subcontractor_ids) + parse_ids(contact.related_contact_ids)
+    valid_contacts = set(_existing(db, Contact.id, contact_ids))
+
+    _replace(
+        db, contact_assignees, "contact_id", contact.id, "user_id",
+        _existing(db, User.id, parse_ids(contact.assigned_to_ids))
+    )
+    _replace(
+        db, contact_subcontractors, "contact_id", contact.id, "subcontractor_id",
+        [i for i in parse_ids(contact.subcontractor_ids) if i in valid_contacts and i != contact.id]
+    )
+    _replace(
+        db, contact_relations, "contact_id", contact.id, "related_contact_id",
+        [i for i in parse_ids(contact.related_contact_ids) if i in valid_contacts and i != contact.id]
+    )
+    sync_contact_tags(db, contact)
+
+def sync_contact_tags(db: Session, contact: Contact) -> None:
+    """Rewrite the contact_tags rows of a flushed contact"""
+    _replace(db, contact_tags, "contact_id", contact.id, "tag", parse_tags(contact.tags))
+
+def replace_contact_tags(db: Session, tags_by_contact: Dict[int, list]) -> None:
+    """Rewrite the contact_tags rows of many contacts in two statements (bulk imports)"""
+    if not tags_by_contact:
+        return
+    db.execute(delete(contact_tags).where(contact_tags.c.contact_id.in_(list(tags_by_contact))))
+    rows = [
+        {"contact_id": contact_id, "tag": tag}
+        for contact_id, tags in tags_by_contact.items()
+        for tag in parse_tags(tags)
+    ]
+    if rows:
+        db.execute(insert(contact_tags), rows)
+
+def sync_activity_mentions(db: Session, activity: Activity) -> None:
+    """Rewrite the @mention edges of a flushed activity"""
+    _replace(
+        db, activity_mentions, "activity_id", activity.id, "contact_id",
+        _existing(db, Contact.id, parse_ids(activity.related_contact_ids))
+    )
+
+def delete_contact_edges(db: Session, contact_id: int) -> None:
+    """Remove every edge touching a contact (before deleting it or its activities)"""
+    db.execute(delete(contact_assignees).where(contact_assignees.c.contact_id == contact_id))
+    db.execute(delete(contact_tags).where(contact_tags.c.contact_id == contact_id))
+    db.execute(delete(contact_subcontractors).where(or_(
+        contact_subcontractors.c.contact_id == contact_id,
+        contact_subcontractors.c.subcontractor_id == contact_id
+    )))
+    db.execute(delete(contact_relations).where(or_(
+        contact_relations.c.contact_id == contact_id,
+        contact_relations.c.related_contact_id == contact_id
+    )))
+    db.execute(delete(activity_mentions).where(or_(
+        activity_mentions.c.contact_id == contact_id,
+        activity_mentions.c.activity_id.in_(select(Activity.id).where(Activity.contact_id == contact_id))
+    )))
+
+def delete_activity_mentions(db: Session, activity_id: int) -> None:
+    db.execute(delete(activity_mentions).where(activity_mentions.c.activity_id == activity_id))
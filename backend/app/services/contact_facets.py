@@ -0,0 +1,129 @@
+"""
+Facet counts for the contact list sidebar
+
+Counts contacts per tag, status, contact_type, lead_source and sales rep in one
+statement: GROUPING SETS on Postgres (a single pass over the user's contacts),
+an equivalent UNION ALL of grouped selects elsewhere. Tags are counted from the
+contact_tags table, so a contact with several tags counts once per tag.
+
+Results are cached per user in Redis for CONTACT_FACETS_CACHE_TTL_SECONDS and
+dropped by invalidate_contact_facets() on every contact write. Redis being
+unavailable only costs the cache: facets are computed on each request instead.
+"""
+import json
+from typing import Any, Dict
+
+import redis
+from sqlalchemy import case, distinct, func, literal, null, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models import Contact, contact_tags
+from app.schemas.contact_schemas import ContactFacets
+from app.services.list_projections import SalesRep
+
+# Facet name -> columns it groups by (the first one is the facet value)
+FACET_COLUMNS = {
+    "tags": (contact_tags.c.tag,),
+    "status": (Contact.status,),
+    "contact_type": (Contact.contact_type,),
+    "lead_source": (Contact.lead_source,),
+    "sales_rep": (Contact.sales_rep_id, SalesRep.full_name, SalesRep.username),
+}
+
+VALUE_COLUMNS = {
+    "tag": contact_tags.c.tag,
+    "status": Contact.status,
+    "contact_type": Contact.contact_type,
+    "lead_source": Contact.lead_source,
+    "sales_rep_id": Contact.sales_rep_id,
+    "sales_rep_full_name": SalesRep.full_name,
+    "sales_rep_username": SalesRep.username,
+}
+
+def _cache_key(user_id: int) -> str:
+    return f"contact_facets:{user_id}"
+
+def _from_contacts(statement, user_id: int):
+    return (
+        statement.select_from(Contact)
+        .outerjoin(contact_tags, contact_tags.c.contact_id == Contact.id)
+        .outerjoin(SalesRep, SalesRep.id == Contact.sales_rep_id)
+        .where(Contact.created_by_id == user_id)
+    )
+
+def facet_statement(dialect_name: str, user_id: int):
+    """(facet, value columns..., count) rows, plus one "total" row"""
+    # The tag join repeats contacts, so count distinct ids
+    count = func.count(distinct(Contact.id)).label("count")
+    if dialect_name == "postgresql":
+        facet = case(
+            *((func.grouping(columns[0]) == 0, literal(name)) for name, columns in FACET_COLUMNS.items()),
+            else_=literal("total"),
+        )
+        statement = select(
+            facet.label("facet"),
+            *(column.label(name) for name, column in VALUE_COLUMNS.items()),
+            count,
+        )
+        grouping_sets = [tuple_(*columns) for columns in FACET_COLUMNS.values()]
+        return _from_contacts(statement, user_id).group_by(func.grouping_sets(*grouping_sets, tuple_()))
+
+    selects = []
+    for name, columns in [*FACET_COLUMNS.items(), ("total", ())]:
+        statement = select(
+            literal(name).label("facet"),
+            *((column if column in columns else null()).label(key) for key, column in VALUE_COLUMNS.items()),
+            count,
+        )
+        statement = _from_contacts(statement, user_id)
+        selects.append(statement.group_by(*columns) if columns else statement)
+    return union_all(*selects)
+
+def compute_contact_facets(db: Session, user_id: int) -> Dict[str, Any]:
+    facets = {name: [] for name in FACET_COLUMNS}
+    total = 0
+    for row in db.execute(facet_statement(db.get_bind().dialect.name, user_id)).mappings():
+        name = row["facet"]
+        if name == "total":
+            total = row["count"]
+        elif name == "sales_rep":
+            rep_id = row["sales_rep_id"]
+            facets[name].append({
+                "sales_rep_id": rep_id,
+                "sales_rep_name": (row["sales_rep_full_name"] or row["sales_rep_username"]) if rep_id is not None else None,
+                "count": row["count"],
+            })
+        else:
+            facets[name].append({"value": row["tag" if name == "tags" else name], "count": row["count"]})
+
+    for name, items in facets.items():
+        label = "sales_rep_name" if name == "sales_rep" else "value"
+        # Most common first; the "no value" bucket last
+        items.sort(key=lambda item: (item[label] is None, -item["count"], item[label] or ""))
+    return ContactFacets(total=total, **facets).model_dump()
+
+def get_contact_facets(db: Session, user_id: int) -> Dict[str, Any]:
+    """Facet counts for a user's contacts, from the Redis cache when possible"""
+    key = _cache_key(user_id)
+    try:
+        cached = get_redis().get(key)
+        if cached:
+            return json.loads(cached)
+    except redis.RedisError as e:
+        print(f"Warning: contact facet cache read failed: {e}")
+
+    facets = compute_contact_facets(db, user_id)
+    try:
+        get_redis().set(key, json.dumps(facets), ex=settings.CONTACT_FACETS_CACHE_TTL_SECONDS)
+    except redis.RedisError as e:
+        print(f"Warning: contact facet cache write failed: {e}")
+    return facets
+
+def invalidate_contact_facets(user_id: int) -> None:
+    """Drop a user's cached facets; call after committing any contact write"""
+    try:
+        get_redis().delete(_cache_key(user_id))
+    except redis.RedisError as e:
+        print(f"Warning: contact facet cache invalidation failed: {e}")
@@ -0,0 +1,194 @@
+"""
+CSV contact import, shared by the synchronous import endpoint and the bulk import task
+"""
+import csv
+import io
+from typing import List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.schemas.contact_schemas import ContactCreate, ImportResult, ImportResponse
+from app.services.contact_edges import replace_contact_tags
+from app.services.contact_facets import invalidate_contact_facets
+from app.services.contact_upsert import DUPLICATE, ON_DUPLICATE_ERROR, ON_DUPLICATE_SKIP, UPDATED, upsert_contacts
+
+IMPORT_BATCH_SIZE = 500
+
+def import_contacts_csv(db: Session, content_str: str, user_id: int, on_duplicate: str = ON_DUPLICATE_ERROR) -> ImportResponse:
+    """Create contacts from CSV text for a user and commit them.
+
+    Rows that fail validation are reported in the results and skipped. Rows whose
+    email the user already has are handled per on_duplicate (see
+    app.services.contact_upsert). Raises if the final commit fails (after rolling back).
+    """
+    csv_reader = csv.DictReader(io.StringIO(content_str))
+    
+    # Column mapping - map common CSV column names to our fields
+    column_mapping = {
+        # Name fields
+        'first_name': ['first_name', 'first name', 'firstname', 'fname'],
+        'last_name': ['last_name', 'last name', 'lastname', 'lname'],
+        'display_name': ['display_name', 'display name', 'full_name', 'full name', 'name'],
+        # Contact info
+        'email': ['email', 'e-mail', 'email address'],
+        'company': ['company', 'organization', 'org'],
+        'website': ['website', 'url', 'web'],
+        # Phone
+        'main_phone': ['phone', 'main_phone', 'main phone', 'telephone', 'tel', 'primary phone'],
+        'mobile_phone': ['mobile', 'mobile_phone', 'mobile phone', 'cell', 'cell phone'],
+        # Address
+        'address_line_1': ['address', 'address_line_1', 'address line 1', 'street', 'street address'],
+        'address_line_2': ['address_line_2', 'address line 2', 'address2', 'suite', 'apt'],
+        'city': ['city'],
+        'state': ['state', 'province'],
+        'postal_code': ['postal_code', 'postal code', 'zip', 'zipcode', 'zip code'],
+        # Other fields
+        'contact_type': ['type', 'contact_type', 'contact type'],
+        'status': ['status'],
+        'notes': ['notes', 'note', 'description', 'comments'],
+        'tags': ['tags', 'tag'],
+    }
+    
+    # Normalize column names (lowercase, strip spaces)
+    def normalize_column_name(col_name: str) -> str:
+        return col_name.lower().strip()
+    
+    # Find mapping for a column name
+    def find_field_for_column(col_name: str) -> Optional[str]:
+        normalized = normalize_column_name(col_name)
+        for field, possible_names in column_mapping.items():
+            if normalized in [normalize_column_name(n) for n in possible_names]:
+                return field
+        return None
+    
+    results: List[ImportResult] = []
+    pending = []  # (row_number, Contact column values) of rows that passed validation
+    failed = 0
+    row_number = 0
+    
+    # Process each row
+    for row in csv_reader:
+        row_number += 1
+        try:
+            # Map CSV columns to contact fields
+            contact_data = {}
+            
+            for csv_col, value in row.items():
+                if not value or value.strip() == '':
+                    continue
+                
+                field = find_field_for_column(csv_col)
+                if field:
+                    # Handle special cases
+                    if field == 'tags' and value:
+                        # Split tags by comma
+                        contact_data[field] = [tag.strip() for tag in value.split(',') if tag.strip()]
+                    else:
+                        contact_data[field] = value.strip()
+            
+            # Validate required fields
+            if not contact_data.get('display_name'):
+                # Try to construct from first/last name
+                first_name = contact_data.get('first_name', '').strip()
+                last_name = contact_data.get('last_name', '').strip()
+                if first_name or last_name:
+                    contact_data['display_name'] = f"{first_name} {last_name}".strip()
+                else:
+                    raise ValueError("Display name is required (or provide first_name and last_name)")
+            
+            # Ensure first_name and last_name exist
+            if not contact_data.get('first_name'):
+                # Try to split display_name
+                display_name = contact_data.get('display_name', '')
+                parts = display_name.split(' ', 1)
+                contact_data['first_name'] = parts[0] if parts else ''
+                contact_data['last_name'] = parts[1] if len(parts) > 1 else ''
+            elif not contact_data.get('last_name'):
+                contact_data['last_name'] = ''
+            
+            # Create contact using ContactCreate schema for validation
+            try:
+                contact_create = ContactCreate(**contact_data)
+            except ValidationError as e:
+                errors = ', '.join([f"{err['loc'][0]}: {err['msg']}" for err in e.errors()])
+                raise ValueError(f"Validation error: {errors}")
+            
+            # Queue the contact; duplicates are settled by the batch upsert below
+            pending.append((row_number, {
+                "first_name": contact_create.first_name,
+                "last_name": contact_create.last_name,
+                "display_name": contact_create.display_name,
+                "company": contact_create.company,
+                "email": contact_create.email,
+                "website": contact_create.website,
+                "main_phone": contact_create.main_phone,
+                "mobile_phone": contact_create.mobile_phone,
+                "address_line_1": contact_create.address_line_1,
+                "address_line_2": contact_create.address_line_2,
+                "city": contact_create.city,
+                "state": contact_create.state,
+                "postal_code": contact_create.postal_code,
+                "contact_type": contact_create.contact_type,
+                "status": contact_create.status,
+                "notes": contact_create.notes,
+                # None rather than [] so the update policy keeps existing tags
+                "tags": contact_create.tags or None,
+                "created_by_id": user_id,
+            }))
+            
+        except Exception as e:
+            results.append(ImportResult(
+                row_number=row_number,
+                success=False,
+                display_name=row.get('display_name') or row.get('name') or f"Row {row_number}",
+                error=str(e)
+            ))
+            failed += 1
+    
+    # Insert in batches, one upsert statement each, and commit all successful imports
+    successful = updated = skipped = 0
+    try:
+        for offset in range(0, len(pending), IMPORT_BATCH_SIZE):
+            batch = pending[offset:offset + IMPORT_BATCH_SIZE]
+            outcomes = upsert_contacts(db, [values for _, values in batch], on_duplicate)
+            tags_by_contact = {}
+            for (batch_row_number, values), (contact_id, action) in zip(batch, outcomes):
+                result = ImportResult(
+                    row_number=batch_row_number,
+                    success=action != DUPLICATE,
+                    contact_id=contact_id,
+                    display_name=values["display_name"],
+                    action=action
+                )
+                if action == DUPLICATE:
+                    result.error = f"Contact with email {values['email']} already exists"
+                    if on_duplicate == ON_DUPLICATE_SKIP:
+                        result.action = "skipped"
+                        skipped += 1
+                    else:
+                        failed += 1
+                else:
+                    successful += 1
+                    if action == UPDATED:
+                        updated += 1
+                    if values["tags"] is not None:
+                        tags_by_contact[contact_id] = values["tags"]
+                results.append(result)
+            replace_contact_tags(db, tags_by_contact)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if successful:
+        invalidate_contact_facets(user_id)
+    
+    results.sort(key=lambda result: result.row_number)
+    return ImportResponse(
+        total_rows=row_number,
+        successful=successful,
+        failed=failed,
+        updated=updated,
+        skipped=skipped,
+        results=results
+    )
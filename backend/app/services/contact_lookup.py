@@ -0,0 +1,24 @@
+"""
+Resolve a typed phone / policy number / claim number to contacts
+
+The search term is normalized both as a phone (E.164) and as a reference key,
+and matched by equality against Contact's indexed normalized columns, so the
+lookup is a handful of index probes instead of a pattern scan over raw values.
+"""
+from typing import Optional
+
+from sqlalchemy import ColumnElement, or_
+
+from app.core.normalize import normalize_phone, normalize_reference
+from app.models import Contact
+
+def lookup_condition(term: str) -> Optional[ColumnElement]:
+    """WHERE clause matching contacts by any normalized key, or None if the term can't match any"""
+    conditions = []
+    phone = normalize_phone(term)
+    if phone:
+        conditions += [Contact.main_phone_e164 == phone, Contact.mobile_phone_e164 == phone]
+    reference = normalize_reference(term)
+    if reference:
+        conditions += [Contact.policy_number_key == reference, Contact.claim_number_key == reference]
+    return or_(*conditions) if conditions else None
@@ -0,0 +1,152 @@
+"""
+Atomic contact creation with per-owner email duplicate handling
+
+Contacts are unique per owner on their normalized email (uq_contacts_owner_email,
+a partial unique index over rows that have one). Instead of SELECTing for an
+existing contact before every insert, which costs a round trip per row and lets
+two concurrent imports both pass the check, rows are written with
+INSERT ... ON CONFLICT against that index and the database arbitrates:
+
+- error:  conflicting rows are left alone and reported as duplicates
+- skip:   same as error, but callers treat the duplicate as a no-op
+- update: the existing contact is updated with the row's non-null values
+
+Rows go out as one statement per batch (via executemany / insertmanyvalues).
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.normalize import derived_keys, normalize_email
+from app.models import Contact
+from app.services.contact_detail import contact_detail_options
+
+ON_DUPLICATE_ERROR = "error"
+ON_DUPLICATE_SKIP = "skip"
+ON_DUPLICATE_UPDATE = "update"
+DUPLICATE_POLICIES = (ON_DUPLICATE_ERROR, ON_DUPLICATE_SKIP, ON_DUPLICATE_UPDATE)
+
+CREATED = "created"
+UPDATED = "updated"
+DUPLICATE = "duplicate"
+
+# Never overwritten when updating an existing contact
+PROTECTED_COLUMNS = ("id", "created_by_id", "created_at", "email", "email_normalized")
+
+CONFLICT_TARGET = {
+    "index_elements": [Contact.__table__.c.created_by_id, Contact.__table__.c.email_normalized],
+    "index_where": Contact.__table__.c.email_normalized.isnot(None),
+}
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Contact upserts are not supported on {dialect}")
+    return _DIALECT_INSERTS[dialect](Contact.__table__)
+
+def _rounds(rows: List[Tuple[int, Dict[str, Any]]]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+    """Split rows so an email appears at most once per statement (ON CONFLICT can't
+    touch the same row twice in one statement); later repeats go in later rounds"""
+    rounds = []
+    seen = defaultdict(int)
+    for index, values in rows:
+        key = values["email_normalized"]
+        if seen[key] == len(rounds):
+            rounds.append([])
+        rounds[seen[key]].append((index, values))
+        seen[key] += 1
+    return rounds
+
+def upsert_contacts(
+    db: Session,
+    rows: Sequence[Dict[str, Any]],
+    policy: str = ON_DUPLICATE_ERROR,
+    update_columns: Optional[Iterable[str]] = None,
+) -> List[Tuple[Optional[int], str]]:
+    """Insert contact rows (Contact column -> value, created_by_id included) without committing.
+
+    Returns (contact_id, CREATED | UPDATED | DUPLICATE) per row, in order; for
+    DUPLICATE the id is the existing contact's. Rows must share the same keys.
+    update_columns limits what the update policy may change (default: every key).
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {policy}")
+    if not rows:
+        return []
+
+    table = Contact.__table__
+    prepared = [{**values, **derived_keys(values)} for values in rows]
+    results: List[Tuple[Optional[int], str]] = [(None, DUPLICATE)] * len(prepared)
+    keyed = [(i, values) for i, values in enumerate(prepared) if values.get("email_normalized")]
+    unkeyed = [(i, values) for i, values in enumerate(prepared) if not values.get("email_normalized")]
+
+    if unkeyed:
+        # No email, nothing to conflict with: a plain multi-row insert
+        statement = _insert(db).returning(table.c.id, sort_by_parameter_order=True)
+        ids = db.execute(statement, [values for _, values in unkeyed]).scalars().all()
+        for (index, _), contact_id in zip(unkeyed, ids):
+            results[index] = (contact_id, CREATED)
+
+    first_id_by_email: Dict[str, int] = {}
+    for batch in _rounds(keyed):
+        statement = _insert(db)
+        if policy == ON_DUPLICATE_UPDATE:
+            columns = set(update_columns if update_columns is not None else batch[0][1])
+            columns |= set(derived_keys({field: None for field in columns}))
+            set_ = {
+                name: func.coalesce(statement.excluded[name], table.c[name])
+                for name in columns
+                if name in table.c and name not in PROTECTED_COLUMNS
+            }
+            # updated_at stays NULL on insert, which tells inserted and updated rows apart
+            set_["updated_at"] = func.now()
+            statement = statement.on_conflict_do_update(**CONFLICT_TARGET, set_=set_)
+        else:
+            statement = statement.on_conflict_do_nothing(**CONFLICT_TARGET)
+        statement = statement.returning(table.c.id, table.c.email_normalized, table.c.updated_at)
+
+        returned = {row.email_normalized: row for row in db.execute(statement, [values for _, values in batch])}
+        for index, values in batch:
+            email = values["email_normalized"]
+            row = returned.get(email)
+            if row is None:
+                results[index] = (first_id_by_email.get(email), DUPLICATE)
+                continue
+            created = row.updated_at is None and email not in first_id_by_email
+            results[index] = (row.id, CREATED if created else UPDATED)
+            first_id_by_email.setdefault(email, row.id)
+
+    # Point duplicates of contacts that existed before this call at them
+    missing = {
+        prepared[index]["email_normalized"]: prepared[index]["created_by_id"]
+        for index, (contact_id, action) in enumerate(results)
+        if action == DUPLICATE and contact_id is None
+    }
+    if missing:
+        existing = dict(db.execute(
+            select(table.c.email_normalized, table.c.id).where(
+                tuple_(table.c.email_normalized, table.c.created_by_id).in_(list(missing.items()))
+            )
+        ).all())
+        results = [
+            (existing.get(prepared[index]["email_normalized"]), action) if action == DUPLICATE and contact_id is None
+            else (contact_id, action)
+            for index, (contact_id, action) in enumerate(results)
+        ]
+
+    return results
+
+def find_by_email(db: Session, user_id: int, email: Optional[str]) -> Optional[Contact]:
+    """The owner's contact with this email (case-insensitive), if any"""
+    email_key = normalize_email(email)
+    if not email_key:
+        return None
+    return db.query(Contact).options(*contact_detail_options()).filter(
+        Contact.created_by_id == user_id,
+        Contact.email_normalized == email_key
+    ).first()
@@ -0,0 +1,316 @@
+"""
+Delta sync feed for the mobile client
+
+Instead of re-downloading full lists, the client keeps a watermark and asks for
+what changed since then:
+
+- changes: rows whose row_changed_at (updated_at, or created_at for rows never
+  updated) falls in (since, until], entity by entity in FEEDS order, each
+  keyset-paginated on (changed_at, id)
+- deleted: ids from sync_tombstones in the same window, sent after all changes
+  so a row changed and then deleted within one window ends up deleted
+
+until is the database clock when the sync started. The client stores it as its
+next since once a page comes back with has_more false. Rows are stamped with
+their transaction's start time, so a transaction that commits after a sync read
+past its stamp would be missed; every incremental sync therefore re-scans the
+last SYNC_OVERLAP_SECONDS before since (the client applies rows idempotently).
+A since older than the tombstone retention can't be served incrementally and
+restarts as a full sync with reset set.
+
+Deletes add their tombstones in the same transaction with record_deletions /
+record_deletions_from, including rows a user merely stops seeing (a task
+reassigned away from its assignee).
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.projection import Projection
+from app.models import Activity, Board, BoardCard, BoardColumn, Contact, Document, SyncTombstone, Task, row_changed_at
+from app.services.list_projections import CONTACT_SUMMARY, TASK_SUMMARY, contact_summary_select
+
+# ContactSummary plus what the field app shows offline
+SYNC_CONTACT = Projection(
+    columns={
+        **CONTACT_SUMMARY.columns,
+        "lead_source": Contact.lead_source,
+        "tags": Contact.tags,
+        "insurance_carrier": Contact.insurance_carrier,
+        "policy_number": Contact.policy_number,
+        "claim_number": Contact.claim_number,
+        "date_of_loss": Contact.date_of_loss,
+        "created_at": Contact.created_at,
+        "updated_at": Contact.updated_at,
+    },
+    computed=CONTACT_SUMMARY.computed,
+    hidden=CONTACT_SUMMARY.hidden,
+    requires=CONTACT_SUMMARY.requires,
+)
+
+# TaskListItem ("full" view)
+SYNC_TASK = Projection(
+    columns={
+        **TASK_SUMMARY.columns,
+        "task_type_id": Task.task_type_id,
+        "created_by_id": Task.created_by_id,
+        "created_at": Task.created_at,
+        "updated_at": Task.updated_at,
+        "completed_at": Task.completed_at,
+    },
+)
+
+SYNC_ACTIVITY = Projection(
+    columns={
+        "id": Activity.id,
+        "contact_id": Activity.contact_id,
+        "activity_type": Activity.activity_type,
+        "content": Activity.content,
+        "subject": Activity.subject,
+        "related_contact_ids": Activity.related_contact_ids,
+        "created_by_id": Activity.created_by_id,
+        "created_at": Activity.created_at,
+        "updated_at": Activity.updated_at,
+    },
+)
+
+# Metadata only: files are downloaded on demand (content_hash tells the client when to refetch)
+SYNC_DOCUMENT = Projection(
+    columns={
+        "id": Document.id,
+        "contact_id": Document.contact_id,
+        "filename": Document.filename,
+        "original_filename": Document.original_filename,
+        "file_size": Document.file_size,
+        "file_type": Document.file_type,
+        "mime_type": Document.mime_type,
+        "content_hash": Document.content_hash,
+        "pages": Document.pages,
+        "metadata_status": Document.metadata_status,
+        "renditions": Document.renditions,
+        "category_id": Document.category_id,
+        "description": Document.description,
+        "is_private": Document.is_private,
+        "created_by_id": Document.created_by_id,
+        "created_at": Document.created_at,
+        "updated_at": Document.updated_at,
+    },
+)
+
+SYNC_BOARD_CARD = Projection(
+    columns={
+        "id": BoardCard.id,
+        "board_id": BoardColumn.board_id,
+        "board_column_id": BoardCard.board_column_id,
+        "contact_id": BoardCard.contact_id,
+        "position": BoardCard.position,
+        "notes": BoardCard.notes,
+        "created_by_id": BoardCard.created_by_id,
+        "created_at": BoardCard.created_at,
+        "updated_at": BoardCard.updated_at,
+    },
+)
+
+class SyncFeed:
+    """An entity in the sync feed: what is sent per row and which rows a user sees"""
+
+    def __init__(self, name: str, model, projection: Projection, visible: Callable[[int], Select]):
+        self.name = name  # Key in the response and SyncTombstone.entity
+        self.model = model
+        self.projection = projection
+        self.visible = visible
+        self.changed_at = row_changed_at(model.updated_at, model.created_at)
+
+FEEDS = (
+    SyncFeed(
+        "contacts", Contact, SYNC_CONTACT,
+        lambda user_id: contact_summary_select(SYNC_CONTACT).where(Contact.created_by_id == user_id),
+    ),
+    SyncFeed(
+        "tasks", Task, SYNC_TASK,
+        lambda user_id: SYNC_TASK.select().where(
+            or_(Task.created_by_id == user_id, Task.assigned_to_id == user_id)
+        ),
+    ),
+    SyncFeed(
+        "activities", Activity, SYNC_ACTIVITY,
+        lambda user_id: SYNC_ACTIVITY.select()
+        .join(Contact, Contact.id == Activity.contact_id)
+        .where(Contact.created_by_id == user_id),
+    ),
+    SyncFeed(
+        "documents", Document, SYNC_DOCUMENT,
+        lambda user_id: SYNC_DOCUMENT.select()
+        .select_from(Document)
+        .join(Contact, Contact.id == Document.contact_id)
+        .where(Contact.created_by_id == user_id),
+    ),
+    SyncFeed(
+        "board_cards", BoardCard, SYNC_BOARD_CARD,
+        lambda user_id: SYNC_BOARD_CARD.select()
+        .select_from(BoardCard)
+        .join(BoardColumn, BoardColumn.id == BoardCard.board_column_id)
+        .join(Board, Board.id == BoardColumn.board_id)
+        .where(Board.created_by_id == user_id),
+    ),
+)
+FEED_NAMES = tuple(feed.name for feed in FEEDS)
+TOMBSTONES = len(FEEDS)  # Stage after the last feed
+
+def _aware(value: datetime) -> datetime:
+    # sqlite hands back naive timestamps; everything here is UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def start_sync(db: Session, since: Optional[datetime]) -> Dict[str, Any]:
+    """Position of a new sync session: its (since, until] window and whether the
+    client has to drop its local copy first"""
+    until = _aware(db.execute(select(func.now())).scalar())
+    reset = False
+    if since is not None:
+        since = _aware(since)
+        if since < until - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            # Tombstones from that far back may be pruned already
+            since, reset = None, True
+        else:
+            since -= timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+    return {"since": since, "until": until, "stage": 0, "changed_at": None, "id": None, "reset": reset}
+
+def _window(changed_at, id_column, position: Dict[str, Any]) -> List[Any]:
+    conditions = [changed_at <= position["until"]]
+    if position["changed_at"] is not None:
+        # Resume after the last row of the previous page
+        conditions.append(or_(
+            changed_at > position["changed_at"],
+            and_(changed_at == position["changed_at"], id_column > position["id"])
+        ))
+    elif position["since"] is not None:
+        conditions.append(changed_at > position["since"])
+    return conditions
+
+def _changed_rows(db: Session, feed: SyncFeed, user_id: int, position: Dict[str, Any], limit: int):
+    statement = (
+        feed.visible(user_id)
+        .add_columns(feed.changed_at.label("sync_changed_at"))
+        .where(*_window(feed.changed_at, feed.model.id, position))
+        .order_by(feed.changed_at, feed.model.id)
+        .limit(limit)
+    )
+    return db.execute(statement).all()
+
+def _tombstone_rows(db: Session, user_id: int, position: Dict[str, Any], limit: int):
+    statement = (
+        select(SyncTombstone.entity, SyncTombstone.entity_id, SyncTombstone.deleted_at, SyncTombstone.id)
+        .where(
+            SyncTombstone.owner_id == user_id,
+            *_window(SyncTombstone.deleted_at, SyncTombstone.id, position)
+        )
+        .order_by(SyncTombstone.deleted_at, SyncTombstone.id)
+        .limit(limit)
+    )
+    return db.execute(statement).all()
+
+def sync_page(db: Session, user_id: int, position: Dict[str, Any], limit: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """One page of changes and deletions (at most limit rows in total) from position.
+
+    Returns the page (SyncPage without cursor) and the position of the next page,
+    None once the window is exhausted.
+    """
+    changes: Dict[str, List[Dict[str, Any]]] = {name: [] for name in FEED_NAMES}
+    deleted: Dict[str, List[int]] = {name: [] for name in FEED_NAMES}
+    page = {
+        "changes": changes,
+        "deleted": deleted,
+        "watermark": position["until"],
+        "reset": position.get("reset", False),
+    }
+    # A full sync has nothing to delete on the client
+    last_stage = TOMBSTONES if position["since"] is not None else TOMBSTONES - 1
+    remaining = limit
+    stage = position["stage"]
+
+    while stage <= last_stage:
+        if remaining == 0:
+            return page, {**position, "stage": stage, "changed_at": None, "id": None, "reset": False}
+
+        if stage == TOMBSTONES:
+            rows = _tombstone_rows(db, user_id, position, remaining + 1)
+            for row in rows[:remaining]:
+                if row.entity in deleted:
+                    deleted[row.entity].append(row.entity_id)
+            last = rows[remaining - 1] if len(rows) > remaining else None
+            last_position = (last.deleted_at, last.id) if last is not None else None
+        else:
+            feed = FEEDS[stage]
+            rows = _changed_rows(db, feed, user_id, position, remaining + 1)
+            # The trailing sync_changed_at column is ignored by serialize()
+            changes[feed.name] = feed.projection.serialize(rows[:remaining])
+            last = rows[remaining - 1] if len(rows) > remaining else None
+            last_position = (last.sync_changed_at, last.id) if last is not None else None
+
+        if last_position is not None:
+            return page, {**position, "stage": stage, "changed_at": last_position[0], "id": last_position[1], "reset": False}
+        remaining -= len(rows)
+        stage += 1
+        position = {**position, "changed_at": None, "id": None}
+
+    return page, None
+
+def record_deletions(db: Session, entity: str, rows: Iterable[Tuple[int, Optional[int]]]) -> None:
+    """Add tombstones for (entity_id, owner_id) pairs in the caller's transaction;
+    pairs without an owner are skipped"""
+    values = [
+        {"entity": entity, "entity_id": entity_id, "owner_id": owner_id}
+        for entity_id, owner_id in set(rows)
+        if owner_id is not None
+    ]
+    if values:
+        db.execute(insert(SyncTombstone), values)
+
+def record_deletions_from(db: Session, entity: str, statement: Select) -> None:
+    """record_deletions for a SELECT of (entity_id, owner_id), without fetching the rows"""
+    db.execute(
+        insert(SyncTombstone).from_select(
+            ["entity_id", "owner_id", "entity"],
+            statement.add_columns(literal(entity))
+        )
+    )
+
+def clear_deletions(db: Session, entity: str, entity_ids: Sequence[int], owner_id: int) -> None:
+    """Drop a user's tombstones for rows that became visible to them again"""
+    db.execute(delete(SyncTombstone).where(
+        SyncTombstone.entity == entity,
+        SyncTombstone.entity_id.in_(entity_ids),
+        SyncTombstone.owner_id == owner_id
+    ))
+
+def board_card_owners() -> Select:
+    """(card id, board owner) of board cards; filter it and pass it to record_deletions_from"""
+    return (
+        select(BoardCard.id, Board.created_by_id)
+        .join(BoardColumn, BoardColumn.id == BoardCard.board_column_id)
+        .join(Board, Board.id == BoardColumn.board_id)
+    )
+
+def record_contact_deletions(db: Session, contact_ids: Sequence[int]) -> None:
+    """Tombstones for contacts about to be deleted and the activities, documents and
+    board cards still attached to them"""
+    record_deletions_from(db, "contacts", select(Contact.id, Contact.created_by_id).where(Contact.id.in_(contact_ids)))
+    for entity, model in (("activities", Activity), ("documents", Document)):
+        record_deletions_from(
+            db, entity,
+            select(model.id, Contact.created_by_id)
+            .join(Contact, Contact.id == model.contact_id)
+            .where(model.contact_id.in_(contact_ids))
+        )
+    record_deletions_from(db, "board_cards", board_card_owners().where(BoardCard.contact_id.in_(contact_ids)))
+
+def prune_tombstones(db: Session) -> int:
+    """Delete tombstones past SYNC_TOMBSTONE_RETENTION_DAYS; returns how many"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted = db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff)).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,157 @@
+"""
+Streaming ZIP archives of a contact's documents
+
+iter_zip() writes the archive with the standard zipfile module into a sink that
+only buffers the bytes produced since the last yield. zipfile detects that the
+sink can't seek and writes data descriptors after each member, so the archive
+is produced incrementally: memory use is bounded by the read chunk size, not
+by the archive size, and nothing is written to disk.
+
+Members are stored uncompressed (ZIP_STORED): PDFs and photos are already
+compressed, so deflating them costs CPU for almost no size gain.
+
+Prebuilt archives are cached under archives/<sha256>.zip. Nothing tracks which
+contact an archive belongs to, so they expire instead: prune_archives() deletes
+those older than ARCHIVE_CACHE_TTL_HOURS (a daily beat task).
+"""
+import hashlib
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.core.config import settings
+from app.core.storage import LOCAL, StorageBackend
+from app.models import Document, DocumentCategory
+from app.services import document_processing
+
+CHUNK_SIZE = 256 * 1024
+ARCHIVE_PREFIX = "archives/"
+
+@dataclass
+class ArchiveEntry:
+    name: str  # Path inside the archive
+    open: Callable[[], BinaryIO]
+    modified: Optional[datetime] = None
+
+class _StreamSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip(entries: Iterable[ArchiveEntry]) -> Iterator[bytes]:
+    """Yield a ZIP archive of the entries chunk by chunk"""
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for entry in entries:
+            modified = entry.modified or datetime.now()
+            info = zipfile.ZipInfo(entry.name, date_time=modified.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            # Sizes aren't known up front, so always reserve zip64 fields
+            with entry.open() as source, archive.open(info, mode="w", force_zip64=True) as member:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+def _safe_name(name: str) -> str:
+    name = Path(name.replace("\\", "/")).name.strip() or "file"
+    return name.replace("/", "_")
+
+def archive_names(documents, category_names: Dict[int, str]) -> Dict[int, str]:
+    """Name each document inside the archive: "<category>/<original filename>", de-duplicated"""
+    names: Dict[int, str] = {}
+    used = set()
+    for document in documents:
+        folder = _safe_name(category_names[document.category_id]) if document.category_id in category_names else None
+        filename = _safe_name(document.original_filename)
+        stem, suffix = Path(filename).stem, Path(filename).suffix
+        candidate = f"{folder}/{filename}" if folder else filename
+        counter = 2
+        while candidate.lower() in used:
+            numbered = f"{stem} ({counter}){suffix}"
+            candidate = f"{folder}/{numbered}" if folder else numbered
+            counter += 1
+        used.add(candidate.lower())
+        names[document.id] = candidate
+    return names
+
+def _opener(document) -> Callable[[], BinaryIO]:
+    def open_document() -> BinaryIO:
+        storage = document_processing.document_storage(document)
+        if storage.name == LOCAL:
+            path = document_processing.resolve_document_path(document.file_path)
+            if not path:
+                raise FileNotFoundError(document.file_path)
+            return open(path, "rb")
+        return storage.open(document_processing.document_key(document))
+    return open_document
+
+def archive_entries(documents, category_names: Dict[int, str]) -> List[ArchiveEntry]:
+    names = archive_names(documents, category_names)
+    return [
+        ArchiveEntry(name=names[document.id], open=_opener(document), modified=document.created_at)
+        for document in documents
+    ]
+
+def archive_cache_key(documents, category_names: Dict[int, str]) -> str:
+    """Storage key of a prebuilt archive for exactly this document set.
+
+    Uploaded files never change in place (each upload gets a new filename), so the
+    set of filenames plus the archive layout identifies the archive contents.
+    """
+    digest = hashlib.sha256()
+    for document in sorted(documents, key=lambda d: d.id):
+        digest.update(f"{document.id}:{document.filename}:{document.original_filename}:".encode("utf-8"))
+        digest.update(category_names.get(document.category_id, "").encode("utf-8"))
+        digest.update(b"\n")
+    return f"{ARCHIVE_PREFIX}{digest.hexdigest()}.zip"
+
+def prune_archives(storage: StorageBackend, max_age_hours: int = settings.ARCHIVE_CACHE_TTL_HOURS) -> int:
+    """Delete prebuilt archives older than max_age_hours; returns how many were deleted"""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+    expired = [key for key, modified in storage.list(ARCHIVE_PREFIX) if modified < cutoff]
+    for key in expired:
+        storage.delete(key)
+    return len(expired)
+
+def select_archive_documents(db, contact_id: int, document_ids: Optional[List[int]] = None, category_id: Optional[int] = None):
+    """Documents of a contact to include, optionally limited to ids or a category, plus category names"""
+    query = db.query(Document).filter(Document.contact_id == contact_id)
+    if document_ids:
+        query = query.filter(Document.id.in_(document_ids))
+    if category_id:
+        query = query.filter(Document.category_id == category_id)
+    documents = query.order_by(Document.category_id.asc().nullsfirst(), Document.created_at.asc(), Document.id.asc()).all()
+
+    category_ids = {d.category_id for d in documents if d.category_id}
+    category_names = {}
+    if category_ids:
+        category_names = dict(
+            db.query(DocumentCategory.id, DocumentCategory.name)
+            .filter(DocumentCategory.id.in_(category_ids))
+            .all()
+        )
+    return documents, category_names
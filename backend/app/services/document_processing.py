@@ -0,0 +1,142 @@
+"""
+Document processing helpers shared by the documents router and Celery tasks
+
+PyMuPDF is imported inside the functions that use it: the API processes and the
+I/O workers import this module but rarely render a PDF, and the import costs
+startup time and memory in every one of them.
+"""
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.core.config import settings
+from app.core.storage import LOCAL, StorageBackend, StorageError, get_storage
+from app.services import image_renditions
+
+UPLOAD_DIR = Path(settings.UPLOAD_DIR).resolve()
+THUMBNAIL_SCALE = 0.3
+MAX_TEXT_LENGTH = 2_000_000  # Cap stored text so a scanned 2,000 page PDF can't bloat the row
+
+# Metadata extraction states (Document.metadata_status)
+METADATA_PENDING = "pending"
+METADATA_COMPLETE = "complete"
+METADATA_UNSUPPORTED = "unsupported"
+METADATA_FAILED = "failed"
+
+def resolve_document_path(stored_path: str) -> Optional[Path]:
+    """Find a document's file: configured UPLOAD_DIR + filename first, then the stored path"""
+    file_path = UPLOAD_DIR / Path(stored_path).name
+    if file_path.exists():
+        return file_path
+    fallback_path = Path(stored_path)
+    if fallback_path.exists():
+        return fallback_path
+    return None
+
+def document_storage(document) -> StorageBackend:
+    """Storage backend holding a document's file"""
+    return get_storage(document.storage_backend or LOCAL)
+
+def document_key(document) -> str:
+    """Storage key of a document's file (the unique filename generated at upload)"""
+    return document.filename
+
+@contextmanager
+def document_local_file(document) -> Iterator[Optional[Path]]:
+    """Yield a local path to a document's file (downloading it if needed), or None if missing"""
+    storage = document_storage(document)
+    if storage.name == LOCAL:
+        yield resolve_document_path(document.file_path)
+        return
+    with ExitStack() as stack:
+        try:
+            path = stack.enter_context(storage.local_copy(document_key(document)))
+        except StorageError as e:
+            print(f"Warning: Could not fetch document {document.id} from storage: {e}")
+            path = None
+        yield path
+
+def is_pdf(mime_type: Optional[str], file_path) -> bool:
+    return mime_type == 'application/pdf' or str(file_path).lower().endswith('.pdf')
+
+def count_pdf_pages(file_path: Path) -> int:
+    """Count the pages of a PDF file"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(str(file_path)) as doc:
+        return doc.page_count
+
+def extract_pdf_metadata(file_path) -> dict:
+    """Read page count, first page dimensions and the embedded text layer of a PDF.
+
+    Module-level and free of database access so it can run in a process pool.
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(str(file_path)) as doc:
+        page_width = page_height = None
+        if doc.page_count > 0:
+            rect = doc.load_page(0).rect
+            page_width, page_height = round(rect.width, 2), round(rect.height, 2)
+
+        chunks = []
+        text_length = 0
+        for page in doc:
+            text = page.get_text("text")
+            if text_length < MAX_TEXT_LENGTH:
+                chunks.append(text)
+            text_length += len(text)
+
+        return {
+            "pages": doc.page_count,
+            "page_width": page_width,
+            "page_height": page_height,
+            "text_length": text_length,
+            # PostgreSQL text columns can't store NUL characters
+            "text_content": "".join(chunks)[:MAX_TEXT_LENGTH].replace("\x00", ""),
+        }
+
+def thumbnail_key(document_id: int) -> str:
+    """Storage key of the cached thumbnail for a document"""
+    return f"thumbnails/{document_id}.png"
+
+def render_pdf_thumbnail(file_path: Path, scale: float = THUMBNAIL_SCALE) -> Optional[bytes]:
+    """Render the first page of a PDF to PNG bytes. Returns None for empty PDFs."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(str(file_path)) as doc:
+        if doc.page_count == 0:
+            return None
+        page = doc.load_page(0)
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        return pix.tobytes("png")
+
+def apply_metadata(document, metadata: Optional[dict], status: str) -> None:
+    """Copy extraction results onto a Document row"""
+    document.metadata_status = status
+    document.metadata_extracted_at = datetime.now(timezone.utc)
+    if metadata:
+        for field, value in metadata.items():
+            setattr(document, field, value)
+
+def delete_document_files(document) -> None:
+    """Remove a document's file and derived files from storage"""
+    storage = document_storage(document)
+    keys = [document_key(document), thumbnail_key(document.id)]
+    keys += [
+        image_renditions.rendition_key(document.id, name)
+        for name in (document.renditions or {})
+        if name in image_renditions.RENDITION_SIZES
+    ]
+    for key in keys:
+        try:
+            storage.delete(key)
+        except Exception as e:
+            print(f"Warning: Failed to delete file {key}: {e}")
+    # Legacy rows may point outside UPLOAD_DIR
+    if storage.name == LOCAL and document.file_path and Path(document.file_path).name == document.filename:
+        try:
+            Path(document.file_path).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: Failed to delete file: {e}")
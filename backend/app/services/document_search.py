@@ -0,0 +1,108 @@
+"""
+Full-text search over document filenames, descriptions and extracted PDF text
+"""
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+from app.models import Document, Contact
+
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+HEADLINE_MAX_CHARS = 100_000  # ts_headline re-parses the text, so only look at the start of long files
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=30, MinWords=10, StartSel=<mark>, StopSel=</mark>"
+# "&" first, so the entities added for the others aren't escaped again
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+
+def _html_escape(value):
+    """SQL expression HTML-escaping a text value"""
+    for character, entity in HTML_ESCAPES:
+        value = func.replace(value, character, entity)
+    return value
+
+def _weighted(value, weight: str):
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(value, "")), literal_column(f"'{weight}'"))
+
+def document_search_vector():
+    """tsvector expression: filename (A) > description (B) > document text (C)"""
+    # Split "denial_letter-2023.pdf" into words so filename parts match
+    filename = func.regexp_replace(Document.original_filename, r"[_\-.]+", " ", "g")
+    return (
+        _weighted(filename, "A")
+        .op("||")(_weighted(Document.description, "B"))
+        .op("||")(_weighted(Document.text_content, "C"))
+    )
+
+def is_search_supported(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+def reindex_document(db: Session, document_id: int) -> None:
+    """Recompute the search vector for one document from its stored columns (no file access)"""
+    reindex_documents(db, [document_id])
+
+def reindex_documents(db: Session, document_ids: List[int]) -> None:
+    """Recompute search vectors for several documents in one UPDATE"""
+    if not document_ids or not is_search_supported(db):
+        return
+    db.query(Document).filter(Document.id.in_(document_ids)).update(
+        {Document.search_vector: document_search_vector()},
+        synchronize_session=False
+    )
+
+def search_documents(
+    db: Session,
+    user_id: int,
+    query_text: str,
+    contact_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+):
+    """Rank the user's documents against a web-style query and build highlighted snippets.
+
+    Ranking runs over the GIN index; snippets are only generated for the returned page.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+    rank = func.ts_rank_cd(Document.search_vector, tsquery)
+    
+    ranked = (
+        db.query(Document.id.label("id"), rank.label("rank"))
+        .join(Contact, Document.contact_id == Contact.id)
+        .filter(
+            Contact.created_by_id == user_id,
+            Document.search_vector.op("@@")(tsquery)
+        )
+    )
+    if contact_id:
+        ranked = ranked.filter(Document.contact_id == contact_id)
+    if category_id:
+        ranked = ranked.filter(Document.category_id == category_id)
+    ranked = ranked.order_by(rank.desc(), Document.id.desc()).limit(limit).offset(offset).subquery()
+    
+    # Uploaded text is untrusted: escape it so <mark> is the only markup in the snippet
+    snippet = func.ts_headline(
+        SEARCH_CONFIG,
+        _html_escape(func.left(func.coalesce(Document.text_content, Document.description, ""), HEADLINE_MAX_CHARS)),
+        tsquery,
+        HEADLINE_OPTIONS
+    )
+    
+    return (
+        db.query(
+            Document.id,
+            Document.contact_id,
+            Contact.display_name.label("contact_name"),
+            Document.original_filename,
+            Document.mime_type,
+            Document.pages,
+            Document.category_id,
+            Document.description,
+            Document.created_at,
+            ranked.c.rank,
+            snippet.label("snippet"),
+        )
+        .join(ranked, ranked.c.id == Document.id)
+        .join(Contact, Document.contact_id == Contact.id)
+        .order_by(ranked.c.rank.desc(), Document.id.desc())
+        .all()
+    )
@@ -1,65 +1,63 @@
-import os
-import aiofiles
+import shutil
 from pathlib import Path
 from typing import Optional
-import shutil
-from app.core.config import settings
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.storage import StorageBackend, get_storage
 
 class FileService:
-    """Service for handling file operations."""
-    
-    def __init__(self):
-        self.upload_dir = Path(settings.UPLOAD_DIR)
-        self.upload_dir.mkdir(exist_ok=True)
-    
+    """Service for handling file operations on the configured storage backend."""
+
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        self.storage = storage or get_storage()
+
     async def save_uploaded_file(self, content: bytes, filename: str) -> str:
         """
-        Save uploaded file content to disk.
-        
+        Save uploaded file content to storage.
+
         Args:
             content: File content as bytes
-            filename: Name for the saved file
-            
+            filename: Storage key for the saved file
+
         Returns:
-            Full path to the saved file
+            Full path to the saved file for local storage, otherwise the storage key
         """
-        file_path = self.upload_dir / filename
-        
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
-        
-        return str(file_path)
-    
+        await run_in_threadpool(self.storage.save, filename, content)
+        return self.get_file_path(filename)
+
     async def delete_file(self, file_path: str) -> bool:
         """
-        Delete a file from disk.
-        
+        Delete a file from storage.
+
         Args:
-            file_path: Path to the file to delete
-            
+            file_path: Storage key (or local path) of the file to delete
+
         Returns:
             True if file was deleted, False otherwise
         """
+        key = Path(file_path).name if Path(file_path).is_absolute() else file_path
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                return True
-            return False
+            if not await run_in_threadpool(self.storage.exists, key):
+                return False
+            await run_in_threadpool(self.storage.delete, key)
+            return True
         except Exception:
             return False
-    
+
     def get_file_path(self, filename: str) -> str:
-        """Get full path for a filename."""
-        return str(self.upload_dir / filename)
-    
+        """Get full path for a filename (the key itself for remote storage)."""
+        local_path = self.storage.local_path(filename)
+        return str(local_path) if local_path else filename
+
     def file_exists(self, filename: str) -> bool:
         """Check if a file exists."""
-        return (self.upload_dir / filename).exists()
-    
+        return self.storage.exists(filename)
+
     async def move_file(self, source_path: str, destination_path: str) -> bool:
-        """Move a file from source to destination."""
+        """Move a file from source to destination (local storage only)."""
         try:
             shutil.move(source_path, destination_path)
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
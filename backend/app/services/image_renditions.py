@@ -0,0 +1,95 @@
+"""
+Downscaled renditions of uploaded photos
+
+Each image document gets up to three JPEG renditions, stored next to the
+original under renditions/<document_id>/<name>.jpg:
+- thumbnail: 320px on the long edge (lists, grids)
+- preview:   1280px (viewer)
+- full:      2560px (zoom / print)
+EXIF orientation is applied to the pixels and metadata is stripped, so every
+browser shows the photo the right way up. Renditions are never upscaled.
+
+Pillow is imported on first render, not when the module is imported.
+"""
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Name -> maximum long edge in pixels, largest first
+RENDITION_SIZES = {
+    "full": 2560,
+    "preview": 1280,
+    "thumbnail": 320,
+}
+JPEG_QUALITY = 82
+ORIENTATION_TAG = 0x0112
+
+def is_image(mime_type: Optional[str], filename: str) -> bool:
+    if mime_type and mime_type.startswith("image/"):
+        return True
+    return Path(filename).suffix.lower() in (".jpg", ".jpeg", ".png")
+
+def rendition_key(document_id: int, name: str) -> str:
+    return f"renditions/{document_id}/{name}.jpg"
+
+def _flatten(image: "Image.Image") -> "Image.Image":
+    """JPEG has no alpha channel: composite transparent images onto white"""
+    from PIL import Image
+
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB") if image.mode != "RGB" else image
+
+def render_renditions(file_path) -> Tuple[Dict[str, bytes], Dict[str, dict]]:
+    """Render every rendition of an image file.
+
+    Returns (encoded JPEG bytes by name, metadata by name). Metadata includes the
+    original dimensions under "original".
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(file_path) as source:
+        width, height = source.size
+        if source.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+            width, height = height, width
+        # For JPEGs, let the decoder downscale by a power of two while decoding
+        largest = max(RENDITION_SIZES.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        image = _flatten(image)
+
+    renditions: Dict[str, bytes] = {}
+    metadata: Dict[str, dict] = {"original": {"width": width, "height": height}}
+
+    # Largest first, so each smaller rendition is resized from the previous one
+    for name, max_edge in RENDITION_SIZES.items():
+        if max(image.size) > max_edge:
+            image = image.copy()
+            image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        renditions[name] = buffer.getvalue()
+        metadata[name] = {"width": image.size[0], "height": image.size[1], "size": len(renditions[name])}
+
+    return renditions, metadata
+
+def pick_rendition(renditions: Optional[dict], width: Optional[int] = None, name: Optional[str] = None) -> Optional[str]:
+    """Choose a rendition by name, or the smallest one at least `width` pixels wide"""
+    if not renditions:
+        return None
+    available = [n for n in RENDITION_SIZES if n in renditions]
+    if name:
+        return name if name in available else None
+    if width is None:
+        return None
+    # Smallest first; fall back to the largest when none is wide enough
+    for candidate in reversed(available):
+        if renditions[candidate]["width"] >= width:
+            return candidate
+    return available[0] if available else None
@@ -0,0 +1,168 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy.orm import Session, aliased
+
+from app.core.projection import Projection
+from app.models import Board, BoardColumn, Contact, Task, User, task_contact_association
+
+SalesRep = aliased(User, name="sales_rep")
+
+def contact_full_name(row: Mapping[str, Any]) -> str:
+    # Same rule as Contact.full_name
+    return row["display_name"] or f"{row['first_name']} {row['last_name']}".strip()
+
+def sales_rep_name(row: Mapping[str, Any]) -> Optional[str]:
+    if row["sales_rep_id"] is None:
+        return None
+    return row["sales_rep_full_name"] or row["sales_rep_username"]
+
+def address_info(row: Mapping[str, Any]) -> Optional[str]:
+    """One-line address with the main (or mobile) phone appended"""
+    parts = [
+        row[key]
+        for key in ("address_line_1", "address_line_2", "city", "state", "postal_code")
+        if row[key]
+    ]
+    info = ", ".join(parts) if parts else None
+
+    if row["main_phone"]:
+        phone = f"P: {row['main_phone']}"
+    elif row["mobile_phone"]:
+        phone = f"M: {row['mobile_phone']}"
+    else:
+        return info
+    return f"{info} {phone}" if info else phone
+
+# ContactSummary; select it with contact_summary_select(), which joins the sales rep when needed
+CONTACT_SUMMARY = Projection(
+    columns={
+        "id": Contact.id,
+        "first_name": Contact.first_name,
+        "last_name": Contact.last_name,
+        "display_name": Contact.display_name,
+        "email": Contact.email,
+        "main_phone": Contact.main_phone,
+        "mobile_phone": Contact.mobile_phone,
+        "company": Contact.company,
+        "contact_type": Contact.contact_type,
+        "status": Contact.status,
+        "sales_rep_id": Contact.sales_rep_id,
+        "address_line_1": Contact.address_line_1,
+        "address_line_2": Contact.address_line_2,
+        "city": Contact.city,
+        "state": Contact.state,
+        "postal_code": Contact.postal_code,
+        "sales_rep_full_name": SalesRep.full_name,
+        "sales_rep_username": SalesRep.username,
+    },
+    computed={
+        "sales_rep_name": sales_rep_name,
+        "address_info": address_info,
+        "full_name": contact_full_name,
+    },
+    hidden=("sales_rep_full_name", "sales_rep_username"),
+    requires={
+        "sales_rep_name": ("sales_rep_id", "sales_rep_full_name", "sales_rep_username"),
+        "address_info": ("address_line_1", "address_line_2", "city", "state", "postal_code", "main_phone", "mobile_phone"),
+        "full_name": ("display_name", "first_name", "last_name"),
+    },
+)
+
+def contact_summary_select(projection: Projection = CONTACT_SUMMARY):
+    statement = projection.select().select_from(Contact)
+    if "sales_rep_full_name" in projection.columns:
+        statement = statement.outerjoin(SalesRep, SalesRep.id == Contact.sales_rep_id)
+    return statement
+
+# TaskSummary without embedded contacts
+TASK_SUMMARY = Projection(
+    columns={
+        "id": Task.id,
+        "title": Task.title,
+        "description": Task.description,
+        "status": Task.status,
+        "priority": Task.priority,
+        "due_date": Task.due_date,
+        "due_time_start": Task.due_time_start,
+        "due_time_end": Task.due_time_end,
+        "is_all_day": Task.is_all_day,
+        "assigned_to_id": Task.assigned_to_id,
+        "project_id": Task.project_id,
+    },
+    computed={"related_contacts": lambda row: None},
+)
+
+# task_schemas.ContactSummary, keyed by the task it's linked to
+TASK_CONTACT = Projection(
+    columns={
+        "task_id": task_contact_association.c.task_id,
+        "id": Contact.id,
+        "first_name": Contact.first_name,
+        "last_name": Contact.last_name,
+        "email": Contact.email,
+        "display_name": Contact.display_name,
+    },
+    computed={"full_name": contact_full_name},
+    hidden=("display_name",),
+    requires={"full_name": ("display_name", "first_name", "last_name")},
+)
+
+def attach_task_contacts(db: Session, tasks: List[Dict[str, Any]]) -> None:
+    """Fill related_contacts on projected tasks with one extra query"""
+    if not tasks or "related_contacts" not in tasks[0]:
+        return
+    by_task = defaultdict(list)
+    statement = (
+        TASK_CONTACT.select()
+        .select_from(task_contact_association)
+        .join(Contact, Contact.id == task_contact_association.c.contact_id)
+        .where(task_contact_association.c.task_id.in_([task["id"] for task in tasks]))
+        .order_by(task_contact_association.c.task_id, Contact.id)
+    )
+    for contact in TASK_CONTACT.fetch(db, statement):
+        by_task[contact.pop("task_id")].append(contact)
+    for task in tasks:
+        task["related_contacts"] = by_task.get(task["id"], [])
+
+BOARD = Projection(
+    columns={
+        "id": Board.id,
+        "name": Board.name,
+        "description": Board.description,
+        "color": Board.color,
+        "created_by_id": Board.created_by_id,
+        "created_at": Board.created_at,
+        "updated_at": Board.updated_at,
+    },
+    computed={"columns": lambda row: []},
+)
+
+BOARD_COLUMN = Projection(
+    columns={
+        "id": BoardColumn.id,
+        "board_id": BoardColumn.board_id,
+        "name": BoardColumn.name,
+        "position": BoardColumn.position,
+        "color": BoardColumn.color,
+        "wip_limit": BoardColumn.wip_limit,
+        "created_at": BoardColumn.created_at,
+        "updated_at": BoardColumn.updated_at,
+    },
+    computed={"cards": lambda row: []},
+)
+
+def attach_board_columns(db: Session, boards: List[Dict[str, Any]]) -> None:
+    """Fill columns (ordered by position) on projected boards with one extra query"""
+    if not boards or "columns" not in boards[0]:
+        return
+    by_board = defaultdict(list)
+    statement = (
+        BOARD_COLUMN.select()
+        .where(BoardColumn.board_id.in_([board["id"] for board in boards]))
+        .order_by(BoardColumn.board_id, BoardColumn.position)
+    )
+    for column in BOARD_COLUMN.fetch(db, statement):
+        by_board[column["board_id"]].append(column)
+    for board in boards:
+        board["columns"] = by_board.get(board["id"], [])
@@ -0,0 +1,55 @@
+"""
+Versioned per-process cache of the reference data served by /api/v1/bootstrap
+
+Company settings, contact field definitions, task types, document categories and
+the user directory change rarely but are loaded on every page load. Each process
+keeps one built copy tagged with a version: a single aggregate query over the
+source tables (row count and latest change per table). Any insert, update or
+delete moves the version, in whichever worker or task made it, so there are no
+invalidation hooks to miss; a request pays for the version query and rebuilds
+only when it moved.
+"""
+import hashlib
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Company, ContactFieldDefinition, DocumentCategory, TaskType, User, row_changed_at
+
+REFERENCE_MODELS = (Company, ContactFieldDefinition, TaskType, DocumentCategory, User)
+
+# (version, reference data)
+_cache: Tuple[Optional[str], Optional[Dict[str, Any]]] = (None, None)
+_cache_lock = Lock()
+
+def reference_version(db: Session) -> str:
+    """Version stamp of the reference tables; changes whenever a row is added, changed or removed"""
+    columns = []
+    for model in REFERENCE_MODELS:
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(row_changed_at(model.updated_at, model.created_at))).scalar_subquery())
+    stamp = "|".join(str(value) for value in db.execute(select(*columns)).one())
+    return hashlib.sha1(stamp.encode("utf-8")).hexdigest()[:16]
+
+def get_reference_data(db: Session, build: Callable[[Session], Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Current (version, reference data), calling build(db) when the cached copy is stale.
+
+    The data is built after the version is read, so it is never older than its
+    version; a change in between just causes one more rebuild on the next call.
+    """
+    global _cache
+    version = reference_version(db)
+    cached_version, data = _cache
+    if cached_version == version:
+        return version, data
+    data = build(db)
+    with _cache_lock:
+        _cache = (version, data)
+    return version, data
+
+def clear_reference_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = (None, None)
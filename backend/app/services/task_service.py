@@ -0,0 +1,87 @@
+from sqlalchemy.orm import Session, selectinload, load_only
+from typing import List, Optional
+
+from app.models import Task, Contact
+from app.schemas.task_schemas import TaskResponse, ContactSummary
+
+# Contact columns needed to build a ContactSummary (full_name uses display/first/last)
+CONTACT_SUMMARY_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.display_name,
+    Contact.email,
+)
+
+def related_contacts_option():
+    """Loader option that fetches related contact summaries in one extra query"""
+    return selectinload(Task.related_contacts).options(load_only(*CONTACT_SUMMARY_COLUMNS))
+
+def contact_summaries(task: Task) -> List[ContactSummary]:
+    return [
+        ContactSummary(
+            id=c.id,
+            first_name=c.first_name,
+            last_name=c.last_name,
+            email=c.email,
+            full_name=c.full_name
+        )
+        for c in task.related_contacts
+    ]
+
+class TaskService:
+    """Read-model loader for tasks.
+
+    Loads tasks together with related contacts, task type and assignee using
+    selectinload, so building responses never triggers lazy loads.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def read_options():
+        return (
+            related_contacts_option(),
+            selectinload(Task.task_type),
+            selectinload(Task.assigned_to),
+        )
+
+    def get_task(self, task_id: int, user_id: int) -> Optional[Task]:
+        """Get a task owned by the user with its relationships loaded."""
+        return (
+            self.db.query(Task)
+            .options(*self.read_options())
+            .filter(Task.id == task_id, Task.created_by_id == user_id)
+            .populate_existing()
+            .first()
+        )
+
+    @staticmethod
+    def to_response(task: Task) -> TaskResponse:
+        """Build a TaskResponse from a task loaded with read_options()."""
+        related_contacts = contact_summaries(task)
+        assignee = task.assigned_to
+
+        return TaskResponse(
+            id=task.id,
+            title=task.title,
+            description=task.description,
+            status=task.status,
+            priority=task.priority,
+            task_type_id=task.task_type_id,
+            task_type_name=task.task_type.name if task.task_type else None,
+            due_date=task.due_date,
+            due_time_start=task.due_time_start,
+            due_time_end=task.due_time_end,
+            is_all_day=task.is_all_day,
+            assigned_to_id=task.assigned_to_id,
+            assigned_to_name=(assignee.full_name or assignee.username) if assignee else None,
+            project_id=task.project_id,
+            contact_ids=[c.id for c in related_contacts],
+            created_by_id=task.created_by_id,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            completed_at=task.completed_at,
+            related_contacts=related_contacts
+        )
@@ -1,13 +1,61 @@
 """
-Celery tasks for AdjustFlow
-This module will contain background tasks as they are implemented.
+Background tasks and job bookkeeping
+
+Tasks live in app.tasks.documents (cpu queue) and app.tasks.imports (bulk queue).
+enqueue() records who started a job so /api/v1/jobs/{job_id} can enforce access,
+and optionally de-duplicates submissions with an idempotency key.
 """
+import uuid
+from typing import Any, Optional, Sequence
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+def _owner_key(job_id: str) -> str:
+    return f"jobs:owner:{job_id}"
+
+def _idempotency_key(task_name: str, key: str) -> str:
+    return f"jobs:idempotency:{task_name}:{key}"
+
+def enqueue(
+    task,
+    args: Sequence[Any] = (),
+    owner_id: Optional[int] = None,
+    idempotency_key: Optional[str] = None,
+) -> str:
+    """Send a task to its queue and return the job id.
+
+    When an idempotency key is given, repeated submissions within JOB_TTL_SECONDS
+    return the job id of the first submission instead of running the task again.
+    """
+    redis_client = get_redis()
+    job_id = str(uuid.uuid4())
+
+    if idempotency_key:
+        key = _idempotency_key(task.name, idempotency_key)
+        if not redis_client.set(key, job_id, nx=True, ex=settings.JOB_TTL_SECONDS):
+            existing = redis_client.get(key)
+            if existing:
+                return existing
+
+    if owner_id is not None:
+        redis_client.set(_owner_key(job_id), owner_id, ex=settings.JOB_TTL_SECONDS)
+
+    try:
+        task.apply_async(args=list(args), task_id=job_id)
+    except Exception:
+        # Never queued: don't hand this job id to later submissions
+        if idempotency_key:
+            redis_client.delete(_idempotency_key(task.name, idempotency_key))
+        if owner_id is not None:
+            redis_client.delete(_owner_key(job_id))
+        raise
+    return job_id
 
-# Tasks will be added here as needed
-# Example:
-# from app.celery_app import celery_app
-#
-# @celery_app.task
-# def example_task():
-#     pass
+def release_idempotency_key(task_name: str, key: str) -> None:
+    """Allow a task to be submitted again with the same idempotency key"""
+    get_redis().delete(_idempotency_key(task_name, key))
 
+def get_job_owner(job_id: str) -> Optional[int]:
+    owner = get_redis().get(_owner_key(job_id))
+    return int(owner) if owner is not None else None
@@ -0,0 +1,44 @@
+"""
+Archive tasks (bulk queue)
+"""
+import tempfile
+from typing import List, Optional
+
+from app.celery_app import celery_app, RETRY_POLICY
+from app.core.storage import get_storage
+from app.database import SessionLocal
+from app.services import document_archive
+from app.tasks import release_idempotency_key
+from app.tasks.imports import prune_staged_imports
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def build_document_archive(self, contact_id: int, document_ids: Optional[List[int]] = None, category_id: Optional[int] = None) -> dict:
+    """Prebuild and cache the ZIP archive of a contact's documents"""
+    db = SessionLocal()
+    try:
+        documents, category_names = document_archive.select_archive_documents(db, contact_id, document_ids, category_id)
+    finally:
+        db.close()
+    if not documents:
+        return {"archive_key": None, "documents": 0}
+
+    storage = get_storage()
+    key = document_archive.archive_cache_key(documents, category_names)
+    try:
+        if not storage.exists(key):
+            with tempfile.TemporaryFile() as tmp:
+                for chunk in document_archive.iter_zip(document_archive.archive_entries(documents, category_names)):
+                    tmp.write(chunk)
+                tmp.seek(0)
+                storage.save_stream(key, tmp, "application/zip")
+    finally:
+        release_idempotency_key(self.name, key)
+    return {"archive_key": key, "documents": len(documents), "size": storage.size(key)}
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def prune_document_archives(self) -> dict:
+    """Delete prebuilt archives older than ARCHIVE_CACHE_TTL_HOURS and stale staged import files"""
+    return {
+        "deleted": document_archive.prune_archives(get_storage()),
+        "staged_imports_deleted": prune_staged_imports(),
+    }
@@ -0,0 +1,18 @@
+"""
+Contact deduplication tasks (bulk queue)
+"""
+from app.celery_app import celery_app, RETRY_POLICY
+from app.database import SessionLocal
+from app.services.contact_dedupe import scan_duplicates
+from app.tasks import release_idempotency_key
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def scan_contact_duplicates(self, user_id: int) -> dict:
+    """Score likely duplicate pairs among a user's contacts for review"""
+    db = SessionLocal()
+    try:
+        return scan_duplicates(db, user_id)
+    finally:
+        db.close()
+        # Only de-duplicate submissions while the scan is running
+        release_idempotency_key(self.name, str(user_id))
@@ -0,0 +1,98 @@
+"""
+Document processing tasks (cpu queue)
+"""
+from app.celery_app import celery_app, RETRY_POLICY
+from app.database import SessionLocal
+from app.models import Document
+from app.services import document_processing, document_search, image_renditions
+from app.tasks import release_idempotency_key
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def extract_document_metadata(self, document_id: int) -> dict:
+    """Record page count, page size and the text layer of an uploaded PDF"""
+    db = SessionLocal()
+    try:
+        document = db.query(Document).get(document_id)
+        if not document:
+            return {"document_id": document_id, "status": None}
+
+        if not document_processing.is_pdf(document.mime_type, document.filename):
+            document_processing.apply_metadata(document, None, document_processing.METADATA_UNSUPPORTED)
+            db.commit()
+            return {"document_id": document_id, "status": document.metadata_status}
+
+        with document_processing.document_local_file(document) as file_path:
+            if not file_path:
+                # File may still be landing in storage; let the retry policy handle it
+                raise FileNotFoundError(document.file_path)
+            try:
+                metadata = document_processing.extract_pdf_metadata(file_path)
+                document_processing.apply_metadata(document, metadata, document_processing.METADATA_COMPLETE)
+            except RuntimeError as e:
+                # PyMuPDF raises RuntimeError subclasses for corrupt or encrypted files; retrying won't help
+                print(f"Warning: Could not extract metadata for document {document_id}: {e}")
+                document_processing.apply_metadata(document, None, document_processing.METADATA_FAILED)
+        db.flush()
+        document_search.reindex_document(db, document_id)
+        db.commit()
+        return {"document_id": document_id, "status": document.metadata_status, "pages": document.pages}
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def generate_document_thumbnail(self, document_id: int) -> dict:
+    """Render and cache the first-page thumbnail of a PDF document"""
+    db = SessionLocal()
+    try:
+        document = db.query(Document).get(document_id)
+        if not document:
+            return {"document_id": document_id, "thumbnail": None}
+
+        if not document_processing.is_pdf(document.mime_type, document.filename):
+            return {"document_id": document_id, "thumbnail": None}
+
+        with document_processing.document_local_file(document) as file_path:
+            if not file_path:
+                return {"document_id": document_id, "thumbnail": None}
+            img_data = document_processing.render_pdf_thumbnail(file_path)
+        if not img_data:
+            return {"document_id": document_id, "thumbnail": None}
+
+        key = document_processing.thumbnail_key(document_id)
+        document_processing.document_storage(document).save(key, img_data, "image/png")
+        return {"document_id": document_id, "thumbnail": key}
+    finally:
+        db.close()
+        # Only de-duplicate while the job is running; afterwards the cached file is served
+        release_idempotency_key(self.name, str(document_id))
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def generate_image_renditions(self, document_id: int) -> dict:
+    """Store thumbnail/preview/full JPEG renditions of an uploaded photo"""
+    db = SessionLocal()
+    try:
+        document = db.query(Document).get(document_id)
+        if not document or not image_renditions.is_image(document.mime_type, document.filename):
+            return {"document_id": document_id, "renditions": None}
+
+        with document_processing.document_local_file(document) as file_path:
+            if not file_path:
+                raise FileNotFoundError(document.file_path)
+            try:
+                renditions, metadata = image_renditions.render_renditions(file_path)
+            except FileNotFoundError:
+                raise
+            except (OSError, ValueError) as e:
+                # Pillow raises OSError/UnidentifiedImageError for corrupt images; retrying won't help
+                print(f"Warning: Could not render image renditions for document {document_id}: {e}")
+                return {"document_id": document_id, "renditions": None}
+
+        storage = document_processing.document_storage(document)
+        for name, data in renditions.items():
+            storage.save(image_renditions.rendition_key(document_id, name), data, "image/jpeg")
+
+        document.renditions = metadata
+        db.commit()
+        return {"document_id": document_id, "renditions": sorted(renditions)}
+    finally:
+        db.close()
@@ -0,0 +1,54 @@
+"""
+Bulk import tasks (bulk queue)
+
+CSV files are staged under IMPORT_DIR on the shared uploads volume. A staged
+file holds customer contact data, so it is removed once its task has finished
+for good (succeeded, or failed after its retries); prune_staged_imports()
+sweeps any left behind, e.g. by a submission de-duplicated by idempotency key.
+"""
+import time
+from pathlib import Path
+
+from app.celery_app import celery_app, RETRY_POLICY
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.contact_import import import_contacts_csv
+from app.services.contact_upsert import ON_DUPLICATE_ERROR
+
+IMPORT_DIR = Path(settings.UPLOAD_DIR).resolve() / "imports"
+
+def _discard_staged_file(self, exc, task_id, args, kwargs, einfo) -> None:
+    """on_failure: the task won't run again, so its staged file is no longer needed"""
+    staged_path = args[0] if args else kwargs.get("staged_path")
+    if staged_path:
+        Path(staged_path).unlink(missing_ok=True)
+
+@celery_app.task(bind=True, on_failure=_discard_staged_file, **RETRY_POLICY)
+def import_contacts(self, staged_path: str, user_id: int, on_duplicate: str = ON_DUPLICATE_ERROR) -> dict:
+    """Import a staged CSV file of contacts for a user"""
+    path = Path(staged_path)
+    content_str = path.read_text(encoding="utf-8")
+
+    db = SessionLocal()
+    try:
+        result = import_contacts_csv(db, content_str, user_id, on_duplicate)
+    finally:
+        db.close()
+
+    path.unlink(missing_ok=True)
+    return result.dict()
+
+def prune_staged_imports(max_age_seconds: int = settings.JOB_TTL_SECONDS) -> int:
+    """Delete staged import files older than max_age_seconds (long past any retry); returns how many"""
+    if not IMPORT_DIR.is_dir():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+    for path in IMPORT_DIR.glob("*.csv"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            pass  # Finished by its task meanwhile
+    return deleted
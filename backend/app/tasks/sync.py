@@ -0,0 +1,15 @@
+"""
+Delta sync maintenance (io queue)
+"""
+from app.celery_app import celery_app, RETRY_POLICY
+from app.database import SessionLocal
+from app.services.delta_sync import prune_tombstones
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def prune_sync_tombstones(self) -> dict:
+    """Delete tombstones older than any client can still ask for incrementally"""
+    db = SessionLocal()
+    try:
+        return {"deleted": prune_tombstones(db)}
+    finally:
+        db.close()
@@ -0,0 +1,135 @@
+"""
+Benchmark for deferred Contact column groups
+
+Seeds a contact fixture and compares loading every Contact column (what listings
+did before the "detail"/"claim" groups were deferred, reproduced here with
+contact_detail_options()) against the default load that skips the groups.
+Reports the bytes of row data the database returns and the ORM hydration time.
+
+Against Postgres the fixture lives in a throwaway schema that is dropped at the
+end, and row bytes are measured server-side with pg_column_size(). Against any
+other database (e.g. sqlite://) row bytes are the summed length of the raw
+values the driver returns.
+
+Run from the backend directory:
+    python -m benchmarks.contact_hydration [--rows 50000] [--url postgresql://...]
+"""
+import argparse
+import gc
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.models import AccessProfile, Contact, Role, User
+from app.services.contact_detail import contact_detail_options
+
+SCHEMA = "benchmark_contact_hydration"
+USER_ID = 1
+BATCH_SIZE = 5000
+
+def seed(db: Session, rows: int) -> None:
+    db.add(User(id=USER_ID, email="bench@example.com", username="bench", hashed_password="x"))
+    db.flush()
+    for offset in range(0, rows, BATCH_SIZE):
+        db.bulk_insert_mappings(Contact, [
+            {
+                "first_name": f"First{i}",
+                "last_name": f"Last{i % 500}",
+                "display_name": f"First{i} Last{i % 500}",
+                "email": f"contact{i}@example.com",
+                "company": f"Company {i % 200}",
+                "main_phone": f"555-01{i % 100:02d}",
+                "address_line_1": f"{i} Main Street",
+                "city": "Springfield",
+                "state": "IL",
+                "postal_code": f"{62700 + i % 50}",
+                "contact_type": "Customer",
+                "status": "Active",
+                "assigned_to_ids": [USER_ID],
+                "subcontractor_ids": [i % 97, i % 89],
+                "related_contact_ids": [],
+                "description": "Dolor sit amet " * 20,
+                "notes": "Lorem ipsum " * 40,
+                "tags": ["storm", "2024"],
+                "insurance_carrier": "Acme Mutual",
+                "policy_number": f"POL-{i:08d}",
+                "claim_number": f"CLM-{i:08d}",
+                "deductible": 1000.0,
+                "desk_adjuster_name": "Pat Adjuster",
+                "desk_adjuster_phone": "555-0199",
+                "custom_fields": {"roof_pitch": "6/12", "stories": 2, "gutters": "seamless"},
+                "created_by_id": USER_ID,
+            }
+            for i in range(offset, min(offset + BATCH_SIZE, rows))
+        ])
+    db.commit()
+
+def listing_query(db: Session, all_columns: bool) -> Query:
+    query = db.query(Contact).filter(Contact.created_by_id == USER_ID).order_by(Contact.id)
+    if all_columns:
+        query = query.options(*contact_detail_options())
+    return query
+
+def row_bytes(db: Session, query: Query) -> int:
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        # Compile through the ORM so the loader options decide the column list
+        sql = query.statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+        return connection.execute(text(f"SELECT sum(pg_column_size(r.*)) FROM ({sql}) AS r")).scalar() or 0
+    total = 0
+    for row in connection.execute(query.statement):
+        total += sum(len(str(value)) for value in row if value is not None)
+    return total
+
+def hydration_ms(db: Session, load: Callable[[], list], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        db.expunge_all()
+        gc.collect()
+        start = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def main(url: str, rows: int, repeat: int) -> None:
+    engine = create_engine(url)
+    postgres = engine.dialect.name == "postgresql"
+    if postgres:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        engine.dispose()
+        # Unqualified table names resolve to the throwaway schema
+        engine = create_engine(url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+    tables = [Role.__table__, AccessProfile.__table__, User.__table__, Contact.__table__]
+    Contact.metadata.create_all(engine, tables=tables)
+    db = Session(bind=engine)
+    try:
+        seed(db, rows)
+        print(f"{rows} contacts on {engine.dialect.name}, best of {repeat}")
+        print(f"{'load':<22}{'row MiB':>10}{'hydrate ms':>12}")
+        for label, all_columns in (("all columns (before)", True), ("deferred groups", False)):
+            query = listing_query(db, all_columns)
+            size = row_bytes(db, query)
+            elapsed = hydration_ms(db, lambda: listing_query(db, all_columns).all(), repeat)
+            print(f"{label:<22}{size / 2**20:>10.1f}{elapsed:>12.1f}")
+    finally:
+        db.close()
+        if postgres:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        else:
+            Contact.metadata.drop_all(engine, tables=tables)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Contact hydration with deferred column groups")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.url, args.rows, args.repeat)
@@ -0,0 +1,154 @@
+"""
+Benchmark for contact lookup by phone / policy number / claim number
+
+Seeds contacts whose phones and reference numbers are stored in mixed formats,
+then looks up a sample of them typed in a different format. Compares the
+pattern search contacts used to rely on (ILIKE '%term%' over the raw columns,
+which scans every row and misses numbers formatted differently) against
+lookup_condition(), an equality match on the indexed normalized columns.
+Reports the mean time per lookup and how many lookups found their contact.
+
+Against Postgres the fixture lives in a throwaway schema that is dropped at the
+end; any other database (e.g. sqlite://) is used as-is.
+
+Run from the backend directory:
+    python -m benchmarks.contact_lookup [--rows 200000] [--lookups 200] [--url postgresql://...]
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.normalize import normalize_phone, normalize_reference
+from app.models import AccessProfile, Contact, Role, User
+from app.services.contact_lookup import lookup_condition
+
+SCHEMA = "benchmark_contact_lookup"
+USER_ID = 1
+BATCH_SIZE = 5000
+
+PHONE_FORMATS = (
+    "({area}) {exchange}-{line}",
+    "{area}.{exchange}.{line}",
+    "+1 {area} {exchange} {line}",
+    "1-{area}-{exchange}-{line}",
+)
+
+def phone(i: int, style: int) -> str:
+    number = f"{2000000000 + i * 7919 % 7999999999:010d}"
+    return PHONE_FORMATS[style % len(PHONE_FORMATS)].format(area=number[:3], exchange=number[3:6], line=number[6:])
+
+def policy(i: int, style: int) -> str:
+    return (f"POL-{i:08d}", f"pol {i:08d}", f"POL{i:08d}")[style % 3]
+
+def claim(i: int, style: int) -> str:
+    return (f"CLM-{i:08d}-A", f"clm{i:08d}a", f"CLM {i:08d} A")[style % 3]
+
+def seed(db: Session, rows: int) -> None:
+    db.add(User(id=USER_ID, email="bench@example.com", username="bench", hashed_password="x"))
+    db.flush()
+    for offset in range(0, rows, BATCH_SIZE):
+        mappings = []
+        for i in range(offset, min(offset + BATCH_SIZE, rows)):
+            main_phone, mobile_phone = phone(i, i), phone(i + rows, i + 1)
+            policy_number, claim_number = policy(i, i), claim(i, i)
+            # Bulk inserts skip Contact's validators, so fill the keys here
+            mappings.append({
+                "first_name": f"First{i}",
+                "last_name": f"Last{i % 500}",
+                "display_name": f"First{i} Last{i % 500}",
+                "main_phone": main_phone,
+                "mobile_phone": mobile_phone,
+                "policy_number": policy_number,
+                "claim_number": claim_number,
+                "main_phone_e164": normalize_phone(main_phone),
+                "mobile_phone_e164": normalize_phone(mobile_phone),
+                "policy_number_key": normalize_reference(policy_number),
+                "claim_number_key": normalize_reference(claim_number),
+                "created_by_id": USER_ID,
+            })
+        db.bulk_insert_mappings(Contact, mappings)
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+def lookup_terms(rows: int, lookups: int) -> list:
+    """(term, expected contact index) pairs, typed in a different format than stored"""
+    rng = random.Random(42)
+    terms = []
+    for _ in range(lookups):
+        i = rng.randrange(rows)
+        kind = rng.randrange(4)
+        if kind == 0:
+            terms.append((phone(i, i + 2), i))
+        elif kind == 1:
+            terms.append((phone(i + rows, i + 3), i))
+        elif kind == 2:
+            terms.append((policy(i, i + 1), i))
+        else:
+            terms.append((claim(i, i + 2), i))
+    return terms
+
+def pattern_condition(term: str):
+    pattern = f"%{term}%"
+    return or_(
+        Contact.main_phone.ilike(pattern),
+        Contact.mobile_phone.ilike(pattern),
+        Contact.policy_number.ilike(pattern),
+        Contact.claim_number.ilike(pattern),
+    )
+
+def run(db: Session, terms: list, condition, first_id: int) -> tuple:
+    found = 0
+    start = time.perf_counter()
+    for term, index in terms:
+        clause = condition(term)
+        if clause is None:
+            continue
+        ids = db.execute(
+            select(Contact.id).where(Contact.created_by_id == USER_ID, clause)
+        ).scalars().all()
+        found += (first_id + index) in ids
+    elapsed = time.perf_counter() - start
+    return elapsed / len(terms) * 1000, found
+
+def main(url: str, rows: int, lookups: int) -> None:
+    engine = create_engine(url)
+    postgres = engine.dialect.name == "postgresql"
+    if postgres:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        engine.dispose()
+        # Unqualified table names resolve to the throwaway schema
+        engine = create_engine(url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+    tables = [Role.__table__, AccessProfile.__table__, User.__table__, Contact.__table__]
+    Contact.metadata.create_all(engine, tables=tables)
+    db = Session(bind=engine)
+    try:
+        seed(db, rows)
+        first_id = db.execute(select(Contact.id).order_by(Contact.id).limit(1)).scalar()
+        terms = lookup_terms(rows, lookups)
+        print(f"{rows} contacts on {engine.dialect.name}, {lookups} lookups")
+        print(f"{'lookup':<24}{'ms/lookup':>12}{'found':>10}")
+        for label, condition in (("ILIKE raw (before)", pattern_condition), ("normalized index", lookup_condition)):
+            per_lookup, found = run(db, terms, condition, first_id)
+            print(f"{label:<24}{per_lookup:>12.2f}{f'{found}/{lookups}':>10}")
+    finally:
+        db.close()
+        if postgres:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        else:
+            Contact.metadata.drop_all(engine, tables=tables)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark contact lookup by phone/policy/claim number")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    main(args.url, args.rows, args.lookups)
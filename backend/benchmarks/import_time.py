@@ -0,0 +1,101 @@
+"""
+Benchmark for API startup: import time and memory of main:app
+
+Imports the app in fresh interpreters under `python -X importtime` and reports
+the best total import time, the slowest top-level imports and the peak RSS.
+Heavy optional libraries (PyMuPDF, Pillow, pandas, openpyxl, boto3) are only
+needed by the code paths that use them and must not load with the app.
+
+Exits non-zero when the import takes longer than --budget-ms or one of the lazy
+modules was imported, so it can run as a startup budget check in CI. Importing
+main doesn't touch the database (that happens in the lifespan handler); the
+app's settings must still resolve, e.g. with DATABASE_URL=sqlite://.
+
+Run from the backend directory:
+    python -m benchmarks.import_time [--runs 5] [--budget-ms 3000] [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Libraries that must load on first use, not with the app
+LAZY_MODULES = ("fitz", "pymupdf", "PIL", "pandas", "openpyxl", "boto3")
+
+PROBE = """
+import json, resource, sys
+import {module}
+app = getattr({module}, {attribute!r})
+print(json.dumps({{
+    "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "lazy_loaded": [name for name in {lazy!r} if name in sys.modules],
+}}))
+"""
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """(self us, cumulative us, indented module name) per `-X importtime` line"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return entries
+
+def run_once(target: str) -> Tuple[int, List[Tuple[int, int, str]], Dict]:
+    """Import target in a new interpreter; returns (total us, importtime entries, probe result)"""
+    module, _, attribute = target.partition(":")
+    code = PROBE.format(module=module, attribute=attribute or "app", lazy=LAZY_MODULES)
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"Importing {target} failed")
+    entries = parse_importtime(result.stderr)
+    # Nested imports are indented by two spaces per level
+    total = next(cumulative for _, cumulative, name in entries if name == f" {module}")
+    return total, entries, json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(target: str, runs: int, budget_ms: float, top: int) -> int:
+    best = None
+    for _ in range(runs):
+        total, entries, probe = run_once(target)
+        if best is None or total < best[0]:
+            best = (total, entries, probe)
+    total, entries, probe = best
+
+    # The app's own top-level modules and the libraries they pull in, slowest first
+    direct = [(cumulative, name.strip()) for _, cumulative, name in entries if name.startswith("  ") and not name.startswith("    ")]
+    print(f"{target}: {total / 1000:.0f} ms import (best of {runs}), "
+          f"{probe['max_rss_kib'] / 1024:.1f} MiB peak RSS, {probe['modules']} modules")
+    print(f"  {'module':<36}{'cumulative ms':>14}")
+    for cumulative, name in sorted(direct, reverse=True)[:top]:
+        print(f"  {name:<36}{cumulative / 1000:>14.1f}")
+
+    failed = False
+    if probe["lazy_loaded"]:
+        print(f"FAIL: imported at startup: {', '.join(probe['lazy_loaded'])}")
+        failed = True
+    if total / 1000 > budget_ms:
+        print(f"FAIL: import took {total / 1000:.0f} ms, budget is {budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"OK: within the {budget_ms:.0f} ms budget, no lazy modules loaded")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark and budget-check the import time of the API app")
+    parser.add_argument("--target", default="main:app", help="module:attribute to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=3000)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.target, args.runs, args.budget_ms, args.top))
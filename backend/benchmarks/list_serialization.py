@@ -0,0 +1,173 @@
+"""
+Benchmark for the contact list serialization path
+
+Compares the previous list_contacts pipeline (full ORM entities -> dicts ->
+response_model validation -> stdlib json) with the column projection in
+app.services.list_projections encoded by orjson, on an in-memory SQLite
+database. Reports CPU time (best of several runs) and peak traced memory for
+building the response body, and checks both paths produce the same JSON.
+
+Run from the backend directory:
+    python -m benchmarks.list_serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Contact, User
+from app.schemas.contact_schemas import ContactSummary
+from app.services.list_projections import CONTACT_SUMMARY, contact_summary_select
+
+USER_ID = 1
+
+def make_session(rows: int) -> Session:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[User.__table__, Contact.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+
+    db = SessionLocal()
+    db.add_all([
+        User(id=user_id, email=f"user{user_id}@example.com", username=f"user{user_id}", hashed_password="x",
+             full_name=f"Sales Rep {user_id}" if user_id % 2 else None)
+        for user_id in range(1, 6)
+    ])
+    db.bulk_insert_mappings(Contact, [
+        {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i % 500}",
+            "display_name": f"First{i} Last{i % 500}",
+            "email": f"contact{i}@example.com",
+            "company": f"Company {i % 200}",
+            "main_phone": f"555-01{i % 100:02d}" if i % 3 else None,
+            "mobile_phone": f"555-02{i % 100:02d}",
+            "address_line_1": f"{i} Main Street",
+            "city": "Springfield",
+            "state": "IL",
+            "postal_code": f"{62700 + i % 50}",
+            "contact_type": "Customer",
+            "status": "Active",
+            "sales_rep_id": (i % 6) or None,
+            "notes": "Lorem ipsum " * 40,
+            "description": "Dolor sit amet " * 20,
+            "custom_fields": {"roof_pitch": "6/12", "stories": 2},
+            "created_by_id": USER_ID,
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+    return db
+
+def legacy_body(db: Session) -> bytes:
+    """Reference implementation: the list_contacts path before projections"""
+    contacts = (
+        db.query(Contact)
+        .filter(Contact.created_by_id == USER_ID)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+        .options(joinedload(Contact.sales_rep))
+        .all()
+    )
+    result = []
+    for contact in contacts:
+        sales_rep_name = None
+        if contact.sales_rep_id and contact.sales_rep:
+            sales_rep_name = contact.sales_rep.full_name or contact.sales_rep.username
+
+        address_parts = [
+            part for part in (contact.address_line_1, contact.address_line_2, contact.city, contact.state, contact.postal_code)
+            if part
+        ]
+        address_info = ", ".join(address_parts) if address_parts else None
+        if address_info and contact.main_phone:
+            address_info += f" P: {contact.main_phone}"
+        elif address_info and contact.mobile_phone:
+            address_info += f" M: {contact.mobile_phone}"
+        elif not address_info and contact.main_phone:
+            address_info = f"P: {contact.main_phone}"
+        elif not address_info and contact.mobile_phone:
+            address_info = f"M: {contact.mobile_phone}"
+
+        result.append({
+            "id": contact.id,
+            "first_name": contact.first_name,
+            "last_name": contact.last_name,
+            "display_name": contact.display_name,
+            "email": contact.email,
+            "main_phone": contact.main_phone,
+            "mobile_phone": contact.mobile_phone,
+            "company": contact.company,
+            "contact_type": contact.contact_type,
+            "status": contact.status,
+            "sales_rep_id": contact.sales_rep_id,
+            "sales_rep_name": sales_rep_name,
+            "address_line_1": contact.address_line_1,
+            "address_line_2": contact.address_line_2,
+            "city": contact.city,
+            "state": contact.state,
+            "postal_code": contact.postal_code,
+            "address_info": address_info,
+            "full_name": contact.full_name
+        })
+
+    # What FastAPI does with response_model=List[ContactSummary] and JSONResponse
+    adapter = TypeAdapter(List[ContactSummary])
+    content = adapter.dump_python(adapter.validate_python(result), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def projected_body(db: Session) -> bytes:
+    query = (
+        contact_summary_select()
+        .where(Contact.created_by_id == USER_ID)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+    )
+    return orjson.dumps(CONTACT_SUMMARY.fetch(db, query))
+
+def measure(db: Session, build: Callable[[Session], bytes], repeat: int):
+    cpu_times = []
+    for _ in range(repeat):
+        db.expunge_all()
+        gc.collect()
+        start = time.process_time()
+        body = build(db)
+        cpu_times.append(time.process_time() - start)
+
+    db.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    build(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return body, min(cpu_times), peak
+
+def main(rows: int, repeat: int) -> None:
+    db = make_session(rows)
+    legacy, legacy_cpu, legacy_peak = measure(db, legacy_body, repeat)
+    projected, projected_cpu, projected_peak = measure(db, projected_body, repeat)
+
+    if json.loads(legacy) != json.loads(projected):
+        print("⚠️  projected response differs from the legacy response")
+
+    print(f"{rows} contacts, best of {repeat}")
+    print(f"{'path':<12}{'cpu ms':>10}{'peak MiB':>12}{'body KiB':>12}")
+    for name, cpu, peak, body in (
+        ("legacy", legacy_cpu, legacy_peak, legacy),
+        ("projected", projected_cpu, projected_peak, projected),
+    ):
+        print(f"{name:<12}{cpu * 1000:>10.1f}{peak / 2**20:>12.1f}{len(body) / 1024:>12.1f}")
+    print(f"speedup: {legacy_cpu / projected_cpu:.1f}x cpu, {legacy_peak / projected_peak:.1f}x peak memory")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark contact list serialization")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,103 @@
+"""
+Microbenchmark for AccessProfile permission checks
+
+Compares walking the raw permissions JSON on every check against the compiled
+permission engine in app.core.permissions.
+
+Run from the backend directory:
+    python -m benchmarks.permission_checks
+"""
+import json
+import timeit
+
+from app.core.permissions import compile_permissions
+
+SAMPLE_PERMISSIONS = {
+    "records": {
+        "contacts": {"view": True, "edit": True, "delete": False, "scope": "own"},
+        "tasks": {"view": True, "edit": True, "delete": True, "scope": "all"},
+        "documents": {"view": True, "upload": True, "delete": False},
+        "activities": {"view": True, "edit": True},
+    },
+    "features": {
+        "boards": {"*": True},
+        "imports": {"contacts": True},
+        "exports": {"excel": False, "pdf": True, "csv": True},
+    },
+    "tabs": ["dashboard", "contacts", "boards", "documents", "tasks", "settings"],
+    "settings": {"company": False, "teams": False, "fields": True},
+}
+
+CHECKS = [
+    "records.contacts.edit",
+    "records.contacts.delete",
+    "features.boards.columns.edit",
+    "tabs.documents",
+    "settings.company",
+    "exports.unknown.permission",
+]
+
+
+def naive_has(permissions: dict, permission: str) -> bool:
+    """Reference implementation: walk the JSON for each check"""
+    node = permissions
+    parts = permission.split(".")
+    for index, part in enumerate(parts):
+        if isinstance(node, dict):
+            if node.get("*") is True:
+                return True
+            if part not in node:
+                return False
+            node = node[part]
+        elif isinstance(node, list):
+            return part in node and index == len(parts) - 1
+        elif isinstance(node, str):
+            return node == part and index == len(parts) - 1
+        else:
+            return False
+    if isinstance(node, (dict, list)):
+        return bool(node)
+    return bool(node)
+
+
+def main(iterations: int = 200_000) -> None:
+    raw = json.dumps(SAMPLE_PERMISSIONS)
+    compiled = compile_permissions(SAMPLE_PERMISSIONS)
+
+    for check in CHECKS:
+        expected = naive_has(SAMPLE_PERMISSIONS, check)
+        if compiled.has(check) != expected:
+            print(f"⚠️  mismatch for {check}: compiled={compiled.has(check)} naive={expected}")
+
+    def per_request_json():
+        # What an uncached check costs: decode the stored JSON and walk it
+        permissions = json.loads(raw)
+        for check in CHECKS:
+            naive_has(permissions, check)
+
+    def per_request_walk():
+        for check in CHECKS:
+            naive_has(SAMPLE_PERMISSIONS, check)
+
+    def per_request_compiled():
+        for check in CHECKS:
+            compiled.has(check)
+
+    compile_runs = iterations // 10
+    results = {
+        "json decode + walk": timeit.timeit(per_request_json, number=iterations),
+        "walk (pre-decoded)": timeit.timeit(per_request_walk, number=iterations),
+        "compiled": timeit.timeit(per_request_compiled, number=iterations),
+    }
+    compile_cost = timeit.timeit(lambda: compile_permissions(SAMPLE_PERMISSIONS), number=compile_runs)
+
+    checks_per_run = len(CHECKS)
+    print(f"Permission checks: {iterations} runs x {checks_per_run} checks")
+    for name, elapsed in results.items():
+        per_check_ns = elapsed / (iterations * checks_per_run) * 1e9
+        print(f"  {name:<22} {elapsed:8.3f}s  {per_check_ns:8.1f} ns/check")
+    print(f"  compile (cache miss)   {compile_cost / compile_runs * 1e6:8.1f} us/profile")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark for list response payloads
+
+For the contact list on an in-memory SQLite database, measures the encoded
+body size and encode time of stdlib json vs orjson, the effect of a ?fields=
+sparse fieldset, and the size/CPU cost of gzip and (if installed) Brotli at the
+levels the CompressionMiddleware uses.
+
+Run from the backend directory:
+    python -m benchmarks.response_payloads [--rows 10000] [--fields id,display_name,status,sales_rep_name]
+"""
+import argparse
+import json
+import time
+import zlib
+from typing import Callable
+
+import orjson
+
+from app.core.compression import brotli
+from app.core.config import settings
+from app.core.projection import Projection
+from app.models import Contact
+from app.services.list_projections import CONTACT_SUMMARY, contact_summary_select
+from benchmarks.list_serialization import USER_ID, make_session
+
+def cpu_ms(func: Callable[[], bytes], repeat: int = 5):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        result = func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+def gzip_body(body: bytes) -> bytes:
+    compressor = zlib.compressobj(settings.GZIP_COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+def report(db, label: str, projection: Projection) -> None:
+    rows = projection.fetch(
+        db,
+        contact_summary_select(projection)
+        .where(Contact.created_by_id == USER_ID)
+        .order_by(Contact.last_name.asc(), Contact.first_name.asc())
+    )
+    # FastAPI's JSONResponse settings vs the app's ORJSONResponse
+    stdlib, stdlib_ms = cpu_ms(lambda: json.dumps(rows, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    body, orjson_ms = cpu_ms(lambda: orjson.dumps(rows, option=orjson.OPT_UTC_Z))
+    gzipped, gzip_ms = cpu_ms(lambda: gzip_body(body))
+
+    print(f"\n{label} ({len(rows)} rows, {len(projection.fields)} fields)")
+    print(f"  {'encoding':<16}{'KiB':>10}{'cpu ms':>10}")
+    print(f"  {'json (stdlib)':<16}{len(stdlib) / 1024:>10.1f}{stdlib_ms:>10.1f}")
+    print(f"  {'orjson':<16}{len(body) / 1024:>10.1f}{orjson_ms:>10.1f}")
+    print(f"  {'+ gzip':<16}{len(gzipped) / 1024:>10.1f}{gzip_ms:>10.1f}")
+    if brotli is not None:
+        compressed, brotli_ms = cpu_ms(lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY))
+        print(f"  {'+ brotli':<16}{len(compressed) / 1024:>10.1f}{brotli_ms:>10.1f}")
+    else:
+        print("  (brotli not installed)")
+
+def main(rows: int, fields: str) -> None:
+    db = make_session(rows)
+    report(db, "full ContactSummary", CONTACT_SUMMARY)
+    report(db, f"?fields={fields}", CONTACT_SUMMARY.only(fields.split(",")))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response payload size and encoding cost")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--fields", default="id,display_name,status,sales_rep_name")
+    args = parser.parse_args()
+    main(args.rows, args.fields)
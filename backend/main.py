@@ -2,15 +2,17 @@ from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-import uvicorn
 import os
 from typing import List, Optional
+from contextlib import asynccontextmanager
 
 from app.database import get_db, engine
 from app.models import Base
 import time
 from sqlalchemy import text
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.responses import ORJSONResponse
 
 # Import all models so they register with Base.metadata before table creation
 from app.models import (  # noqa: F401
@@ -49,9 +51,13 @@ def _init_database_extensions():
         print(f"⚠️  Warning: Could not initialize database extensions: {e}")
         print("   This is okay if extensions already exist")
 
-_wait_for_db()
-_init_database_extensions()
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # On server startup rather than at import, so importing main:app stays cheap
+    _wait_for_db()
+    _init_database_extensions()
+    Base.metadata.create_all(bind=engine)
+    yield
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -59,7 +65,9 @@ app = FastAPI(
     description="Project Management and CRM API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -71,7 +79,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from app.routers import auth, projects, exports, tasks, contacts, dashboard, activities, documents, contact_fields, task_types, boards, teams, company
+# Brotli/gzip for JSON and text responses; file downloads and ranges pass through
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+from app.routers import auth, projects, exports, tasks, contacts, dashboard, activities, documents, contact_fields, task_types, boards, teams, company, jobs, sync, bootstrap, cache
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
@@ -87,6 +103,10 @@ app.include_router(task_types.router, prefix="/api/v1/task-types", tags=["task-t
 app.include_router(boards.router, prefix="/api/v1/boards", tags=["boards"])
 app.include_router(teams.router, prefix="/api/v1/teams", tags=["teams"])
 app.include_router(company.router, prefix="/api/v1/company", tags=["company"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["sync"])
+app.include_router(bootstrap.router, prefix="/api/v1/bootstrap", tags=["bootstrap"])
+app.include_router(cache.router, prefix="/api/v1/cache", tags=["cache"])
 
 @app.get("/")
 async def root():
@@ -101,6 +121,8 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
@@ -0,0 +1,19 @@
+"""
+Add contact_duplicate_candidates: pairs of an owner's contacts scored as likely
+duplicates by the dedupe scan (app.tasks.dedupe), with their review status.
+"""
+from app.database import engine
+from app.models import ContactDuplicateCandidate
+
+def upgrade():
+    """Create contact_duplicate_candidates and its indexes"""
+    ContactDuplicateCandidate.__table__.create(engine, checkfirst=True)
+    print("✅ Created contact_duplicate_candidates")
+    print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop contact_duplicate_candidates"""
+    ContactDuplicateCandidate.__table__.drop(engine, checkfirst=True)
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,28 @@
+"""
+Add edge tables mirroring the JSON id arrays:
+- contact_assignees (contact_id, user_id)           <- contacts.assigned_to_ids
+- contact_subcontractors (contact_id, subcontractor_id) <- contacts.subcontractor_ids
+- contact_relations (contact_id, related_contact_id)    <- contacts.related_contact_ids
+- activity_mentions (activity_id, contact_id)        <- activities.related_contact_ids
+Each has a composite primary key for forward lookups and an index on the
+target column for reverse lookups. Run migrations.backfill_contact_edges next.
+"""
+from app.database import engine
+from app.models import activity_mentions, contact_assignees, contact_relations, contact_subcontractors
+
+EDGE_TABLES = (contact_assignees, contact_subcontractors, contact_relations, activity_mentions)
+
+def upgrade():
+    """Create the edge tables and their reverse-lookup indexes"""
+    for table in EDGE_TABLES:
+        table.create(engine, checkfirst=True)
+        print(f"✅ Created {table.name}")
+    print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop the edge tables (the JSON columns are untouched)"""
+    for table in reversed(EDGE_TABLES):
+        table.drop(engine, checkfirst=True)
+
+if __name__ == "__main__":
+    upgrade()
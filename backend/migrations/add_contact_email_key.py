@@ -0,0 +1,86 @@
+"""
+Add contacts.email_normalized and the per-owner unique index on it
+(uq_contacts_owner_email), the arbiter for INSERT ... ON CONFLICT in
+app.services.contact_upsert.
+
+Steps:
+1. Add the column and backfill lower(trim(email)) in id ranges
+2. Resolve existing duplicates: for each (owner, email) the oldest contact keeps
+   the key, later ones get NULL so they don't block the index. Nothing is
+   deleted; their ids are printed for review.
+3. Build the partial unique index concurrently. A concurrent build that failed
+   (e.g. a duplicate slipped in meanwhile) leaves an invalid index behind, which
+   is dropped first so re-running the migration retries cleanly.
+
+Usage (from the backend directory):
+    python -m migrations.add_contact_email_key [batch_size]
+"""
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+
+BACKFILL_SQL = text("""
+    UPDATE contacts
+    SET email_normalized = nullif(lower(btrim(email)), '')
+    WHERE id > :lo AND id <= :hi
+      AND email_normalized IS DISTINCT FROM nullif(lower(btrim(email)), '')
+""")
+
+RESOLVE_DUPLICATES_SQL = text("""
+    UPDATE contacts c
+    SET email_normalized = NULL
+    FROM (
+        SELECT id, row_number() OVER (PARTITION BY created_by_id, email_normalized ORDER BY id) AS position
+        FROM contacts
+        WHERE email_normalized IS NOT NULL
+    ) ranked
+    WHERE c.id = ranked.id AND ranked.position > 1
+    RETURNING c.id
+""")
+
+def upgrade(batch_size: int = 5000):
+    """Add and backfill email_normalized, resolve duplicates, build the unique index"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE contacts ADD COLUMN IF NOT EXISTS email_normalized VARCHAR"))
+        print("✅ Added contacts.email_normalized")
+        max_id = conn.execute(text("SELECT coalesce(max(id), 0) FROM contacts")).scalar()
+
+    updated = 0
+    for lo in range(0, max_id, batch_size):
+        # One short transaction per range keeps locks and WAL bursts small
+        with engine.begin() as conn:
+            updated += conn.execute(BACKFILL_SQL, {"lo": lo, "hi": lo + batch_size}).rowcount
+    print(f"✅ Backfilled email_normalized on {updated} contacts")
+
+    with engine.begin() as conn:
+        duplicate_ids = conn.execute(RESOLVE_DUPLICATES_SQL).scalars().all()
+    if duplicate_ids:
+        print(f"⚠️  {len(duplicate_ids)} contacts share an email with an older contact of the same owner; "
+              f"their email key was cleared: {sorted(duplicate_ids)}")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = conn.execute(text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'uq_contacts_owner_email' AND NOT i.indisvalid
+        """)).scalar()
+        if invalid:
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS uq_contacts_owner_email"))
+            print("✅ Dropped invalid uq_contacts_owner_email from an earlier run")
+        conn.execute(text("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_contacts_owner_email
+            ON contacts (created_by_id, email_normalized)
+            WHERE email_normalized IS NOT NULL
+        """))
+        print("✅ Created uq_contacts_owner_email")
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop the unique index and email_normalized"""
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS uq_contacts_owner_email"))
+        conn.execute(text("ALTER TABLE contacts DROP COLUMN IF EXISTS email_normalized"))
+
+if __name__ == "__main__":
+    upgrade(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
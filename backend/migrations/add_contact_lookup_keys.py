@@ -0,0 +1,85 @@
+"""
+Add normalized lookup keys to contacts:
+- main_phone_e164, mobile_phone_e164 (E.164 phones)
+- policy_number_key, claim_number_key (alphanumeric, upper-cased)
+New writes fill them through Contact's validators. Existing rows are backfilled
+in id-ordered batches with the same Python normalization (app.core.normalize),
+then each column is indexed concurrently: building the indexes after the
+backfill is faster than maintaining them row by row during it.
+
+Usage (from the backend directory):
+    python -m migrations.add_contact_lookup_keys [batch_size]
+"""
+import sys
+
+from sqlalchemy import text
+
+from app.core.normalize import normalize_phone, normalize_reference
+from app.database import SessionLocal, engine
+from app.models import Contact
+
+LOOKUP_COLUMNS = ("main_phone_e164", "mobile_phone_e164", "policy_number_key", "claim_number_key")
+
+def backfill(batch_size: int = 5000) -> None:
+    last_id = 0
+    updated = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Contact.id, Contact.main_phone, Contact.mobile_phone, Contact.policy_number, Contact.claim_number)
+                .filter(Contact.id > last_id)
+                .order_by(Contact.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            db.bulk_update_mappings(Contact, [
+                {
+                    "id": row.id,
+                    "main_phone_e164": normalize_phone(row.main_phone),
+                    "mobile_phone_e164": normalize_phone(row.mobile_phone),
+                    "policy_number_key": normalize_reference(row.policy_number),
+                    "claim_number_key": normalize_reference(row.claim_number),
+                }
+                for row in rows
+            ])
+            db.commit()
+            updated += len(rows)
+            print(f"✅ Normalized contacts up to id {last_id} ({updated} rows)")
+        finally:
+            db.close()
+
+def upgrade(batch_size: int = 5000):
+    """Add the lookup key columns, backfill them and index them"""
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            ALTER TABLE contacts
+            {", ".join(f"ADD COLUMN IF NOT EXISTS {column} VARCHAR" for column in LOOKUP_COLUMNS)}
+        """))
+        print("✅ Added contact lookup key columns")
+
+    backfill(batch_size)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for column in LOOKUP_COLUMNS:
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contacts_{column} ON contacts ({column})"))
+            print(f"✅ Created ix_contacts_{column}")
+        conn.execute(text("ANALYZE contacts"))
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop the lookup key columns and their indexes"""
+    with engine.begin() as conn:
+        for column in LOOKUP_COLUMNS:
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_contacts_{column}"))
+        conn.execute(text(f"""
+            ALTER TABLE contacts
+            {", ".join(f"DROP COLUMN IF EXISTS {column}" for column in LOOKUP_COLUMNS)}
+        """))
+
+if __name__ == "__main__":
+    upgrade(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
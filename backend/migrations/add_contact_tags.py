@@ -0,0 +1,61 @@
+"""
+Add contact_tags (contact_id, tag), the normalized form of contacts.tags, and
+backfill it; plus an index on contacts.created_by_id, which every per-user
+contact listing and the facet counts filter on.
+
+The backfill works through contacts in id ranges with one INSERT ... SELECT per
+range (tags trimmed, blanks and non-strings skipped, like
+app.services.contact_edges.parse_tags), and ON CONFLICT DO NOTHING makes re-runs
+safe.
+
+Usage (from the backend directory):
+    python -m migrations.add_contact_tags [batch_size]
+"""
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import contact_tags
+
+BACKFILL_SQL = text("""
+    INSERT INTO contact_tags (contact_id, tag)
+    SELECT DISTINCT c.id, btrim(e.value #>> '{}')
+    FROM contacts c
+    CROSS JOIN LATERAL json_array_elements(c.tags) AS e(value)
+    WHERE c.id > :lo AND c.id <= :hi
+      AND json_typeof(c.tags) = 'array'
+      AND json_typeof(e.value) = 'string'
+      AND btrim(e.value #>> '{}') <> ''
+    ON CONFLICT DO NOTHING
+""")
+
+def upgrade(batch_size: int = 5000):
+    """Create contact_tags, index contacts.created_by_id and backfill tags"""
+    contact_tags.create(engine, checkfirst=True)
+    print("✅ Created contact_tags")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contacts_created_by_id ON contacts (created_by_id)"))
+        print("✅ Created ix_contacts_created_by_id")
+        max_id = conn.execute(text("SELECT coalesce(max(id), 0) FROM contacts")).scalar()
+
+    inserted = 0
+    for lo in range(0, max_id, batch_size):
+        # One short transaction per range keeps locks and WAL bursts small
+        with engine.begin() as conn:
+            inserted += conn.execute(BACKFILL_SQL, {"lo": lo, "hi": lo + batch_size}).rowcount
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE contact_tags"))
+    print(f"✅ contact_tags: {inserted} tags backfilled")
+    print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop contact_tags and the created_by_id index (contacts.tags is untouched)"""
+    contact_tags.drop(engine, checkfirst=True)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_contacts_created_by_id"))
+
+if __name__ == "__main__":
+    upgrade(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
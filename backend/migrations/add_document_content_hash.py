@@ -0,0 +1,57 @@
+"""
+Add documents.content_hash (SHA-256 of the stored file), used as the ETag for
+conditional and range requests on download/view, and hash existing files.
+Files that can't be found are left NULL and hashed on first access instead.
+"""
+from sqlalchemy import text
+from app.database import engine, SessionLocal
+from app.core.file_responses import hash_file
+from app.models import Document
+from app.services.document_processing import resolve_document_path
+
+BATCH_SIZE = 200
+
+def upgrade():
+    """Add content_hash column and hash existing documents"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"))
+        print("✅ Added documents.content_hash")
+    
+    db = SessionLocal()
+    try:
+        last_id = 0
+        hashed = missing = 0
+        while True:
+            rows = (
+                db.query(Document.id, Document.file_path)
+                .filter(Document.id > last_id, Document.content_hash.is_(None))
+                .order_by(Document.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            
+            updates = []
+            for row in rows:
+                file_path = resolve_document_path(row.file_path)
+                if not file_path:
+                    missing += 1
+                    continue
+                updates.append({"id": row.id, "content_hash": hash_file(file_path)})
+            db.bulk_update_mappings(Document, updates)
+            db.commit()
+            hashed += len(updates)
+            print(f"✅ Hashed documents up to id {last_id} ({hashed} hashed, {missing} missing)")
+    finally:
+        db.close()
+    print("✅ Migration completed successfully")
+
+def downgrade():
+    """Remove content_hash column"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents DROP COLUMN IF EXISTS content_hash"))
+
+if __name__ == "__main__":
+    upgrade()
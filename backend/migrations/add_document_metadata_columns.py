@@ -0,0 +1,48 @@
+"""
+Add extracted PDF metadata columns to documents:
+- page_width, page_height (first page, in points)
+- text_length, text_content (embedded text layer)
+- metadata_status, metadata_extracted_at
+Existing rows start as 'pending'; fill them with backfill_document_metadata.py.
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """Add metadata columns to documents table"""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            ALTER TABLE documents
+            ADD COLUMN IF NOT EXISTS page_width DOUBLE PRECISION,
+            ADD COLUMN IF NOT EXISTS page_height DOUBLE PRECISION,
+            ADD COLUMN IF NOT EXISTS text_length INTEGER,
+            ADD COLUMN IF NOT EXISTS text_content TEXT,
+            ADD COLUMN IF NOT EXISTS metadata_status VARCHAR DEFAULT 'pending',
+            ADD COLUMN IF NOT EXISTS metadata_extracted_at TIMESTAMP WITH TIME ZONE
+        """))
+        print("✅ Added document metadata columns")
+        
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_metadata_status
+            ON documents (metadata_status)
+        """))
+        print("✅ Created ix_documents_metadata_status")
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Remove metadata columns from documents table"""
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_documents_metadata_status"))
+        conn.execute(text("""
+            ALTER TABLE documents
+            DROP COLUMN IF EXISTS metadata_extracted_at,
+            DROP COLUMN IF EXISTS metadata_status,
+            DROP COLUMN IF EXISTS text_content,
+            DROP COLUMN IF EXISTS text_length,
+            DROP COLUMN IF EXISTS page_height,
+            DROP COLUMN IF EXISTS page_width
+        """))
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,51 @@
+"""
+Add documents.renditions (JSON metadata of photo renditions) and queue
+rendition generation for existing image documents on the cpu workers.
+"""
+from sqlalchemy import text
+from app.database import engine, SessionLocal
+from app.models import Document
+from app.tasks.documents import generate_image_renditions
+
+BATCH_SIZE = 500
+
+def upgrade():
+    """Add renditions column and queue renditions for existing photos"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS renditions JSON"))
+        print("✅ Added documents.renditions")
+    
+    db = SessionLocal()
+    try:
+        last_id = 0
+        queued = 0
+        while True:
+            ids = [
+                row.id for row in db.query(Document.id)
+                .filter(
+                    Document.id > last_id,
+                    Document.renditions.is_(None),
+                    Document.mime_type.like("image/%")
+                )
+                .order_by(Document.id)
+                .limit(BATCH_SIZE)
+                .all()
+            ]
+            if not ids:
+                break
+            for document_id in ids:
+                generate_image_renditions.delay(document_id)
+            queued += len(ids)
+            last_id = ids[-1]
+            print(f"✅ Queued renditions for {queued} documents")
+    finally:
+        db.close()
+    print("✅ Migration completed successfully")
+
+def downgrade():
+    """Remove renditions column (rendition files are left in storage)"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents DROP COLUMN IF EXISTS renditions"))
+
+if __name__ == "__main__":
+    upgrade()
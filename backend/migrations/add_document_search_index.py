@@ -0,0 +1,56 @@
+"""
+Add full-text search to documents:
+- documents.search_vector (tsvector of filename, description and extracted text)
+- GIN index ix_documents_search_vector
+Existing rows are indexed in id batches so the table is never locked for long.
+"""
+from sqlalchemy import text
+from app.database import engine, SessionLocal
+from app.models import Document
+from app.services.document_search import reindex_documents
+
+BATCH_SIZE = 500
+
+def upgrade():
+    """Add the search column, fill it and build the GIN index"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector TSVECTOR"))
+        print("✅ Added documents.search_vector")
+    
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            ids = [
+                row.id for row in db.query(Document.id)
+                .filter(Document.id > last_id)
+                .order_by(Document.id)
+                .limit(BATCH_SIZE)
+                .all()
+            ]
+            if not ids:
+                break
+            reindex_documents(db, ids)
+            db.commit()
+            last_id = ids[-1]
+            print(f"✅ Indexed documents up to id {last_id}")
+    finally:
+        db.close()
+    
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_search_vector
+            ON documents USING gin (search_vector)
+        """))
+        print("✅ Created ix_documents_search_vector")
+        conn.execute(text("ANALYZE documents"))
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop document search column and index"""
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_documents_search_vector"))
+        conn.execute(text("ALTER TABLE documents DROP COLUMN IF EXISTS search_vector"))
+
+if __name__ == "__main__":
+    upgrade()
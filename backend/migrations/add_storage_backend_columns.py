@@ -0,0 +1,37 @@
+"""
+Track which storage backend holds each file:
+- documents.storage_backend (existing rows are local)
+- companies.logo_key, companies.logo_storage_backend
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """Add storage columns"""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            ALTER TABLE documents
+            ADD COLUMN IF NOT EXISTS storage_backend VARCHAR DEFAULT 'local'
+        """))
+        print("✅ Added documents.storage_backend")
+        
+        conn.execute(text("""
+            ALTER TABLE companies
+            ADD COLUMN IF NOT EXISTS logo_key VARCHAR,
+            ADD COLUMN IF NOT EXISTS logo_storage_backend VARCHAR
+        """))
+        print("✅ Added companies.logo_key and companies.logo_storage_backend")
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Remove storage columns"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE documents DROP COLUMN IF EXISTS storage_backend"))
+        conn.execute(text("""
+            ALTER TABLE companies
+            DROP COLUMN IF EXISTS logo_storage_backend,
+            DROP COLUMN IF EXISTS logo_key
+        """))
+
+if __name__ == "__main__":
+    upgrade()
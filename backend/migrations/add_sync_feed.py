@@ -0,0 +1,43 @@
+"""
+Add what the mobile delta sync feed (/api/v1/sync) reads:
+- sync_tombstones: ids deleted per user, so deletions reach clients that synced before
+- indexes on each synced table over (visibility key, coalesce(updated_at, created_at)),
+  matching app.models.row_changed_at, so "changed since" is an index range scan.
+  The activities/documents ones also serve plain lookups by contact_id.
+"""
+from sqlalchemy import text
+from app.database import engine
+from app.models import SyncTombstone
+
+SYNC_INDEXES = {
+    "ix_contacts_sync": "contacts (created_by_id, coalesce(updated_at, created_at), id)",
+    "ix_tasks_sync_creator": "tasks (created_by_id, coalesce(updated_at, created_at), id)",
+    "ix_tasks_sync_assignee": "tasks (assigned_to_id, coalesce(updated_at, created_at), id)",
+    "ix_activities_sync": "activities (contact_id, coalesce(updated_at, created_at))",
+    "ix_documents_sync": "documents (contact_id, coalesce(updated_at, created_at))",
+    "ix_board_cards_sync": "board_cards (board_column_id, coalesce(updated_at, created_at))",
+}
+
+def upgrade():
+    """Create sync_tombstones and the change-feed indexes without blocking writes"""
+    SyncTombstone.__table__.create(engine, checkfirst=True)
+    print("✅ Created sync_tombstones")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, definition in SYNC_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
+            print(f"✅ Created {name}")
+
+        for table in ("contacts", "tasks", "activities", "documents", "board_cards"):
+            conn.execute(text(f"ANALYZE {table}"))
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop the change-feed indexes and sync_tombstones"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name in SYNC_INDEXES:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    SyncTombstone.__table__.drop(engine, checkfirst=True)
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,42 @@
+"""
+Add indexes used by the task calendar range query:
+- GiST index over the tstzrange of each task's calendar span
+- btree index on tasks.assigned_to_id
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """Create calendar indexes without blocking writes"""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_calendar_span
+            ON tasks USING gist (
+                tstzrange(
+                    coalesce(due_time_start, due_date),
+                    greatest(coalesce(due_time_end, due_time_start, due_date), coalesce(due_time_start, due_date)),
+                    '[]'
+                )
+            )
+            WHERE coalesce(due_time_start, due_date) IS NOT NULL
+        """))
+        print("✅ Created ix_tasks_calendar_span")
+        
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_assigned_to_id
+            ON tasks (assigned_to_id)
+        """))
+        print("✅ Created ix_tasks_assigned_to_id")
+        
+        conn.execute(text("ANALYZE tasks"))
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop calendar indexes"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_calendar_span"))
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_assigned_to_id"))
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,38 @@
+"""
+Add indexes matching the task list ordering so cursor pagination is an index walk:
+- (created_by_id, due_date nulls last, created_at desc, id desc)
+- (assigned_to_id, due_date nulls last, created_at desc, id desc)
+The assignee index supersedes the plain ix_tasks_assigned_to_id index.
+"""
+from sqlalchemy import text
+from app.database import engine
+
+def upgrade():
+    """Create list-order indexes without blocking writes"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_creator_list_order
+            ON tasks (created_by_id, due_date ASC NULLS LAST, created_at DESC, id DESC)
+        """))
+        print("✅ Created ix_tasks_creator_list_order")
+        
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_assignee_list_order
+            ON tasks (assigned_to_id, due_date ASC NULLS LAST, created_at DESC, id DESC)
+        """))
+        print("✅ Created ix_tasks_assignee_list_order")
+        
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_assigned_to_id"))
+        print("✅ Dropped superseded ix_tasks_assigned_to_id")
+        
+        conn.execute(text("ANALYZE tasks"))
+        print("✅ Migration completed successfully")
+
+def downgrade():
+    """Drop list-order indexes"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_creator_list_order"))
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_assignee_list_order"))
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,60 @@
+"""
+Backfill the contact edge tables from the JSON id arrays.
+
+Works through contacts and activities in id ranges, expanding the arrays with
+json_array_elements_text in one INSERT ... SELECT per table and range, so no rows
+are pulled into Python. Entries that aren't integers or don't reference an
+existing user/contact are skipped, and ON CONFLICT DO NOTHING makes re-runs safe.
+
+Usage (from the backend directory):
+    python -m migrations.backfill_contact_edges [batch_size]
+"""
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+
+# (source table, JSON column, edge table, edge owner column, edge target column, target table, exclude self)
+EDGE_SOURCES = (
+    ("contacts", "assigned_to_ids", "contact_assignees", "contact_id", "user_id", "users", False),
+    ("contacts", "subcontractor_ids", "contact_subcontractors", "contact_id", "subcontractor_id", "contacts", True),
+    ("contacts", "related_contact_ids", "contact_relations", "contact_id", "related_contact_id", "contacts", True),
+    ("activities", "related_contact_ids", "activity_mentions", "activity_id", "contact_id", "contacts", False),
+)
+
+def _insert_sql(source, column, edges, owner, target, target_table, exclude_self):
+    self_filter = "AND target.id <> s.id" if exclude_self else ""
+    return text(f"""
+        INSERT INTO {edges} ({owner}, {target})
+        SELECT DISTINCT s.id, target.id
+        FROM {source} s
+        CROSS JOIN LATERAL json_array_elements_text(s.{column}) AS e(value)
+        JOIN {target_table} target ON target.id = e.value::integer
+        WHERE s.id > :lo AND s.id <= :hi
+          AND json_typeof(s.{column}) = 'array'
+          AND e.value ~ '^[0-9]+$'
+          {self_filter}
+        ON CONFLICT DO NOTHING
+    """)
+
+def backfill(batch_size: int = 5000) -> None:
+    for source, column, edges, owner, target, target_table, exclude_self in EDGE_SOURCES:
+        insert = _insert_sql(source, column, edges, owner, target, target_table, exclude_self)
+        with engine.connect() as conn:
+            max_id = conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {source}")).scalar()
+        
+        inserted = 0
+        for lo in range(0, max_id, batch_size):
+            # One short transaction per range keeps locks and WAL bursts small
+            with engine.begin() as conn:
+                inserted += conn.execute(insert, {"lo": lo, "hi": lo + batch_size}).rowcount
+        
+        with engine.begin() as conn:
+            conn.execute(text(f"ANALYZE {edges}"))
+        print(f"✅ {edges}: {inserted} edges from {source}.{column}")
+    
+    print("✅ Contact edge backfill completed")
+
+if __name__ == "__main__":
+    backfill(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,116 @@
+"""
+Backfill PDF metadata (pages, page size, text layer) for documents uploaded
+before extraction ran on upload.
+
+Documents are processed in id-ordered batches; PDF parsing is spread across a
+process pool and each batch is written back with one bulk update. A document
+that can't be read is marked failed; documents whose worker process died are
+left pending for the next run, and the pool is replaced. Files in
+object storage are downloaded to temporary files for the batch.
+
+Usage (from the backend directory):
+    python -m migrations.backfill_document_metadata [batch_size] [workers]
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from sqlalchemy import or_
+
+from app.database import SessionLocal
+from app.models import Document
+from app.services import document_processing, document_search
+
+def _extract(file_path: str) -> dict:
+    return document_processing.extract_pdf_metadata(file_path)
+
+def backfill(batch_size: int = 100, workers: int = None) -> None:
+    """Extract metadata for every pending document"""
+    last_id = 0
+    totals = {"complete": 0, "unsupported": 0, "failed": 0}
+    
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(Document.id, Document.filename, Document.file_path, Document.mime_type, Document.storage_backend)
+                    .filter(
+                        Document.id > last_id,
+                        or_(
+                            Document.metadata_status.is_(None),
+                            Document.metadata_status == document_processing.METADATA_PENDING
+                        )
+                    )
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                
+                now = datetime.now(timezone.utc)
+                updates = []
+                futures = {}
+                broken = []
+                # Local copies of files in object storage live until the batch is done
+                with ExitStack() as local_files:
+                    for row in rows:
+                        if not document_processing.is_pdf(row.mime_type, row.filename):
+                            updates.append({"id": row.id, "metadata_status": document_processing.METADATA_UNSUPPORTED, "metadata_extracted_at": now})
+                            continue
+                        file_path = local_files.enter_context(document_processing.document_local_file(row))
+                        if file_path:
+                            try:
+                                futures[row.id] = pool.submit(_extract, str(file_path))
+                            except BrokenProcessPool:
+                                broken.append(row.id)
+                        else:
+                            updates.append({"id": row.id, "metadata_status": document_processing.METADATA_FAILED, "metadata_extracted_at": now})
+                    
+                    for document_id, future in futures.items():
+                        try:
+                            metadata = future.result()
+                            updates.append({
+                                "id": document_id,
+                                **metadata,
+                                "metadata_status": document_processing.METADATA_COMPLETE,
+                                "metadata_extracted_at": now,
+                            })
+                        except BrokenProcessPool:
+                            broken.append(document_id)
+                        except Exception as e:
+                            print(f"⚠️  Document {document_id}: {e}")
+                            updates.append({
+                                "id": document_id,
+                                "metadata_status": document_processing.METADATA_FAILED,
+                                "metadata_extracted_at": now,
+                            })
+                
+                db.bulk_update_mappings(Document, updates)
+                document_search.reindex_documents(db, [row.id for row in rows])
+                db.commit()
+                for update in updates:
+                    totals[update["metadata_status"]] += 1
+                print(f"✅ Processed documents up to id {last_id}: {totals}")
+                
+                if broken:
+                    # Which document crashed the worker is unknown, so none of them is marked failed
+                    print(f"⚠️  Worker process died; left pending: {broken}")
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+            finally:
+                db.close()
+    finally:
+        pool.shutdown()
+    
+    print(f"✅ Backfill completed: {totals}")
+
+if __name__ == "__main__":
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    backfill(batch_size, workers)
@@ -0,0 +1,163 @@
+"""
+Move document files (and the company logo) from one storage backend to another.
+
+Files are copied in parallel by a thread pool (the work is network/disk bound),
+verified by size, and each batch of documents is switched to the new backend in
+one UPDATE. A document's image renditions are copied with it, and it is only
+switched once its file and every rendition it lists were copied. Re-running is
+safe: only rows still on the source backend are copied.
+
+Usage (from the backend directory):
+    python -m migrations.migrate_storage local s3 [--workers 16] [--batch-size 200] [--delete-source]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from sqlalchemy import or_
+
+from app.core.storage import LOCAL, StorageBackend, get_storage
+from app.database import SessionLocal
+from app.models import Company, Document
+from app.services import document_processing, image_renditions
+
+def _copy(source: StorageBackend, destination: StorageBackend, key: str, content_type: Optional[str], legacy_path: Optional[str] = None) -> int:
+    """Copy one object and return its size"""
+    if source.name == LOCAL and legacy_path:
+        # Older rows may store an absolute path outside UPLOAD_DIR
+        local_path = document_processing.resolve_document_path(legacy_path)
+        if not local_path:
+            raise FileNotFoundError(legacy_path)
+        with open(local_path, "rb") as stream:
+            destination.save_stream(key, stream, content_type)
+        expected = local_path.stat().st_size
+    else:
+        with source.open(key) as stream:
+            destination.save_stream(key, stream, content_type)
+        expected = source.size(key)
+
+    copied = destination.size(key)
+    if copied != expected:
+        raise IOError(f"Size mismatch for {key}: {copied} != {expected}")
+    return copied
+
+def _rendition_keys(row) -> List[str]:
+    """Storage keys of the renditions a document row lists"""
+    return [
+        image_renditions.rendition_key(row.id, name)
+        for name in (row.renditions or {})
+        if name in image_renditions.RENDITION_SIZES
+    ]
+
+def _copy_document(source: StorageBackend, destination: StorageBackend, row) -> int:
+    """Copy a document's file and its renditions; returns the total size"""
+    copied = _copy(source, destination, row.filename, row.mime_type, row.file_path)
+    for key in _rendition_keys(row):
+        copied += _copy(source, destination, key, "image/jpeg")
+    return copied
+
+def migrate_documents(source_name: str, destination_name: str, workers: int, batch_size: int, delete_source: bool) -> None:
+    source = get_storage(source_name)
+    destination = get_storage(destination_name)
+    last_id = 0
+    moved = failed = 0
+
+    source_filter = Document.storage_backend == source_name
+    if source_name == LOCAL:
+        source_filter = or_(source_filter, Document.storage_backend.is_(None))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(Document.id, Document.filename, Document.file_path, Document.mime_type, Document.renditions)
+                    .filter(Document.id > last_id, source_filter)
+                    .order_by(Document.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                futures = {
+                    row.id: (row, pool.submit(_copy_document, source, destination, row))
+                    for row in rows
+                }
+
+                updates = []
+                for document_id, (row, future) in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed += 1
+                        print(f"⚠️  Document {document_id} ({row.filename}): {e}")
+                        continue
+                    local_path = destination.local_path(row.filename)
+                    updates.append({
+                        "id": document_id,
+                        "storage_backend": destination.name,
+                        "file_path": str(local_path) if local_path else row.filename,
+                    })
+
+                db.bulk_update_mappings(Document, updates)
+                db.commit()
+                moved += len(updates)
+
+                if delete_source:
+                    copied = {update["id"] for update in updates}
+                    for row in rows:
+                        if row.id in copied:
+                            _delete_quietly(source, row.filename)
+                            _delete_quietly(source, document_processing.thumbnail_key(row.id))
+                            for key in _rendition_keys(row):
+                                _delete_quietly(source, key)
+
+                print(f"✅ Migrated documents up to id {last_id} ({moved} moved, {failed} failed)")
+            finally:
+                db.close()
+
+    print(f"✅ Documents: {moved} moved, {failed} failed")
+
+def migrate_logo(source_name: str, destination_name: str, delete_source: bool) -> None:
+    db = SessionLocal()
+    try:
+        company = db.query(Company).filter(
+            Company.logo_key.isnot(None),
+            Company.logo_storage_backend == source_name
+        ).first()
+        if not company:
+            return
+        source = get_storage(source_name)
+        _copy(source, get_storage(destination_name), company.logo_key, None)
+        company.logo_storage_backend = destination_name
+        db.commit()
+        if delete_source:
+            _delete_quietly(source, company.logo_key)
+        print("✅ Migrated company logo")
+    finally:
+        db.close()
+
+def _delete_quietly(storage: StorageBackend, key: str) -> None:
+    try:
+        storage.delete(key)
+    except Exception as e:
+        print(f"⚠️  Could not delete {key} from {storage.name}: {e}")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Move stored files between storage backends")
+    parser.add_argument("source", help="Source backend (local or s3)")
+    parser.add_argument("destination", help="Destination backend (local or s3)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--delete-source", action="store_true", help="Delete files from the source after copying")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.source == args.destination:
+        raise SystemExit("Source and destination must differ")
+    migrate_documents(args.source, args.destination, args.workers, args.batch_size, args.delete_source)
+    migrate_logo(args.source, args.destination, args.delete_source)
+    print("✅ Storage migration completed")